@@ -0,0 +1,6 @@
+"""Performance benchmarks for Solarseed TOU.
+
+Not part of the test suite: run with ``python -m benchmarks.run`` from the
+repository root (see run.py).  Cases import the integration under the same
+Home Assistant stubs as the tests (_ha.py, from tests/_ha_stubs.py).
+"""
@@ -0,0 +1,69 @@
+"""Home Assistant stand-ins for running the integration outside Home Assistant.
+
+Importing this module installs the test suite's Home Assistant stubs
+(tests/_ha_stubs.py) so the benchmarks can import the integration.  It
+also has fakes for the few runtime objects the sensors touch: the source
+entity's state, ``hass.states``, state-change events and an injectable clock.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from tests._ha_stubs import install_stubs
+
+install_stubs()
+
+SOURCE_ENTITY = "sensor.replay_source"
+
+
+# ── Fakes for the few Home Assistant objects the sensors touch ──
+
+
+class SourceState:
+    """The source entity's State as seen by the sensors."""
+
+    __slots__ = ("state", "attributes")
+
+    def __init__(self, unit: str) -> None:
+        self.state = "unknown"
+        self.attributes = {"unit_of_measurement": unit}
+
+
+class States:
+    """``hass.states`` with the single source entity."""
+
+    def __init__(self, source: SourceState) -> None:
+        self._source = source
+
+    def get(self, entity_id: str) -> SourceState | None:
+        return self._source if entity_id == SOURCE_ENTITY else None
+
+
+class Hass:
+    """Just enough of ``hass`` for the accumulators."""
+
+    def __init__(self, source: SourceState) -> None:
+        self.states = States(source)
+        self.data: dict[str, Any] = {}
+
+
+class Event:
+    """A state-change event."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, new_state: Any) -> None:
+        self.data = {"new_state": new_state}
+
+
+class Clock:
+    """The replayed time, injected into every sensor."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
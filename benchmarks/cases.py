@@ -0,0 +1,234 @@
+"""Benchmark cases for Solarseed TOU hot paths.
+
+Each case prepares its inputs and returns ``(ops, run)``: ``run()`` does
+``ops`` operations and is what gets timed, so results are reported per
+operation and stay comparable when ``scale`` shrinks the macro cases.
+
+    micro   single lookups on the per-sample path
+    macro   a simulated year at 1 Hz through an accumulator sensor, and
+            batch pricing of 10M interval rows
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from . import _ha  # noqa: F401 — installs the Home Assistant stubs
+
+from custom_components.solarseed_tou.compare import IntervalData, price_plan
+from custom_components.solarseed_tou.compiled import SLOTS_PER_DAY
+from custom_components.solarseed_tou.const import STANDARD_HOLIDAYS
+from custom_components.solarseed_tou.history import RateHistory
+from custom_components.solarseed_tou.holiday import HolidayCalendar, resolve_holidays_for_year
+from custom_components.solarseed_tou.quote import QuoteInterval, quote_costs
+from custom_components.solarseed_tou.schedule import TOUSchedule
+
+from .replay import StateSample, replay
+
+# Full-size macro workloads (scaled down by --quick)
+SECONDS_PER_YEAR = 365 * 86400
+PRICING_ROWS = 10_000_000
+PRICING_CHUNK = 1_000_000  # rows decomposed at a time, to bound memory
+
+# Lookups per micro case
+MICRO_OPS = 20_000
+
+Case = Callable[[float], tuple[int, Callable[[], None]]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A named case and its kind (``micro`` or ``macro``)."""
+    name: str
+    kind: str
+    case: Case
+
+
+def reference_schedule() -> TOUSchedule:
+    """A PGE Schedule 7-like plan: two seasons, weekday peaks, standard holidays."""
+    weekday = ["off-peak"] * 7 + ["mid-peak"] * 8 + ["on-peak"] * 5 + ["mid-peak"] * 2 + [
+        "off-peak"
+    ] * 2
+    weekend = ["off-peak"] * SLOTS_PER_DAY
+    days = {d: weekday for d in ("mon", "tue", "wed", "thu", "fri")}
+    days.update(sat=weekend, sun=weekend)
+    return TOUSchedule.from_dict({
+        "energy_sensor": "sensor.energy",
+        "tiers": {
+            "off-peak": {"name": "Off-Peak", "rate": 0.08339},
+            "mid-peak": {"name": "Mid-Peak", "rate": 0.09664},
+            "on-peak": {"name": "On-Peak", "rate": 0.15728},
+        },
+        "seasons": {
+            "summer": {"name": "Summer", "months": [5, 6, 7, 8, 9, 10], "grid": days},
+            "winter": {"name": "Winter", "months": [11, 12, 1, 2, 3, 4], "grid": days},
+        },
+        "holidays": {"rate_tier": "off-peak", "standard": list(STANDARD_HOLIDAYS)},
+        "regulatory_per_kwh": 0.00491,
+        "tax_rate_pct": 1.8,
+        "fixed_monthly": 11.55,
+    })
+
+
+def _timestamps(count: int, seed: int = 7) -> list[datetime]:
+    """Random whole-minute timestamps across 2026."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    return [start + timedelta(minutes=rng.randrange(365 * 1440)) for _ in range(count)]
+
+
+# ── Micro ──────────────────────────────────────────────────
+
+
+def get_tier_id(scale: float) -> tuple[int, Callable[[], None]]:
+    """Reference holiday → season → grid walk."""
+    schedule, stamps = reference_schedule(), _timestamps(MICRO_OPS)
+    schedule.get_tier_id(stamps[0])  # resolve the year's holidays
+
+    def run() -> None:
+        for ts in stamps:
+            schedule.get_tier_id(ts)
+
+    return len(stamps), run
+
+
+def compiled_rate(scale: float) -> tuple[int, Callable[[], None]]:
+    """Compiled table lookup of the effective rate."""
+    compiled, stamps = reference_schedule().compiled, _timestamps(MICRO_OPS)
+    compiled.rate(stamps[0])  # build the year table
+
+    def run() -> None:
+        for ts in stamps:
+            compiled.rate(ts)
+
+    return len(stamps), run
+
+
+def get_next_rate_change(scale: float) -> tuple[int, Callable[[], None]]:
+    """Reference next-change scan."""
+    schedule, stamps = reference_schedule(), _timestamps(MICRO_OPS // 10)
+    schedule.get_next_rate_change(stamps[0])
+
+    def run() -> None:
+        for ts in stamps:
+            schedule.get_next_rate_change(ts)
+
+    return len(stamps), run
+
+
+def next_transition(scale: float) -> tuple[int, Callable[[], None]]:
+    """Compiled next-change lookup (transition index + bisect)."""
+    compiled, stamps = reference_schedule().compiled, _timestamps(MICRO_OPS)
+    compiled.next_transition(stamps[0])
+
+    def run() -> None:
+        for ts in stamps:
+            compiled.next_transition(ts)
+
+    return len(stamps), run
+
+
+def holidays_for_year(scale: float) -> tuple[int, Callable[[], None]]:
+    """Resolving the standard holiday set for a year."""
+    standard = list(STANDARD_HOLIDAYS)
+    years = range(2000, 2100)
+
+    def run() -> None:
+        for year in years:
+            resolve_holidays_for_year(standard, [], year)
+
+    return len(years), run
+
+
+def holiday_calendar(scale: float) -> tuple[int, Callable[[], None]]:
+    """Resolving the standard holiday set over a century in one calendar (per year)."""
+    standard = list(STANDARD_HOLIDAYS)
+    first, last = 2000, 2099
+
+    def run() -> None:
+        HolidayCalendar(standard, [], first, last)
+
+    return last - first + 1, run
+
+
+# ── Macro ──────────────────────────────────────────────────
+
+
+def accumulator_year_1hz(scale: float) -> tuple[int, Callable[[], None]]:
+    """One year of 1 Hz power readings through a Cost Today sensor (see replay.py)."""
+    count = max(1, int(SECONDS_PER_YEAR * scale))
+    schedule = reference_schedule()
+    # Readings repeat with a one-hour period
+    readings = [str(200 + (i * 37) % 3000) for i in range(3600)]
+    start = datetime(2026, 1, 1)
+    second = timedelta(seconds=1)
+
+    def samples():
+        for i in range(count):
+            yield StateSample(start + i * second, readings[i % 3600])
+
+    def run() -> None:
+        replay(schedule, samples(), ["today"])
+
+    return count, run
+
+
+def _interval_chunk(rows: int, offset: int) -> IntervalData:
+    """Hourly rows from 2026 on, decomposed without going through datetimes."""
+    data = IntervalData(month_keys=["2026-01"])
+    year_slots = 365 * SLOTS_PER_DAY
+    data.years = [2026 + (offset + i) // year_slots % 4 for i in range(rows)]
+    data.slots = [(offset + i) % year_slots for i in range(rows)]
+    data.months = [0] * rows
+    data.kwh = [0.25 + (i % 17) * 0.1 for i in range(rows)]
+    return data
+
+
+def price_10m_rows(scale: float) -> tuple[int, Callable[[], None]]:
+    """Pricing 10M hourly rows under one plan (``compare.price_plan``).
+
+    The rows are priced in chunks of PRICING_CHUNK so the decomposed arrays
+    fit in memory; every full chunk reuses the same arrays.
+    """
+    rows = max(1, int(PRICING_ROWS * scale))
+    history = RateHistory.single(reference_schedule())
+    chunk = _interval_chunk(min(rows, PRICING_CHUNK), 0)
+    full, tail = divmod(rows, len(chunk))
+    last = _interval_chunk(tail, full * len(chunk)) if tail else None
+
+    def run() -> None:
+        for _ in range(full):
+            price_plan("bench", history, chunk)
+        if last is not None:
+            price_plan("bench", history, last)
+
+    return rows, run
+
+
+def quote_batch(scale: float) -> tuple[int, Callable[[], None]]:
+    """A 10,000-block ``solarseed_tou/quote`` batch of 15-minute blocks."""
+    history = RateHistory.single(reference_schedule())
+    start = datetime(2026, 1, 1)
+    step = timedelta(minutes=15)
+    intervals = [QuoteInterval(start + i * step, start + (i + 1) * step, 0.3)
+                 for i in range(10_000)]
+
+    def run() -> None:
+        quote_costs(history, intervals)
+
+    return len(intervals), run
+
+
+BENCHMARKS = (
+    Benchmark("get_tier_id", "micro", get_tier_id),
+    Benchmark("compiled_rate", "micro", compiled_rate),
+    Benchmark("get_next_rate_change", "micro", get_next_rate_change),
+    Benchmark("next_transition", "micro", next_transition),
+    Benchmark("resolve_holidays_for_year", "micro", holidays_for_year),
+    Benchmark("holiday_calendar", "micro", holiday_calendar),
+    Benchmark("accumulator_year_1hz", "macro", accumulator_year_1hz),
+    Benchmark("price_10m_rows", "macro", price_10m_rows),
+    Benchmark("quote_batch", "macro", quote_batch),
+)
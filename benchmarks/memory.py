@@ -0,0 +1,245 @@
+"""Memory footprint of many entries (meters / circuits), per component.
+
+    python -m benchmarks.memory                      # 1, 10, 100 and 1000 entries
+    python -m benchmarks.memory --counts 1,10 --budget 400000
+
+Builds ``count`` entries against the stubbed Home Assistant, the way
+``async_setup_entry`` and the sensor platform do, and measures what each
+stage allocates with tracemalloc:
+
+    schedule      the stored config and its parsed RateHistory
+    compiled      the current year's tier table, transition index and holidays
+    accumulators  the entry's sensors and statistics
+    attributes    state and attribute dicts after a first source reading
+    states        the State copies Home Assistant keeps of each sensor
+                  (state machine and RestoreEntity), approximated as the
+                  state string plus a copy of the attributes
+
+Every entry parses its own copy of one PGE-like plan, as separate entries
+do after loading their storage.  The run fails (exit status 1) when the
+bytes per entry at any count exceed ``--budget``.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from ._ha import SOURCE_ENTITY, Clock, Event, Hass, SourceState  # installs the HA stubs
+
+from custom_components.solarseed_tou import sensor
+from custom_components.solarseed_tou.history import RateHistory
+from custom_components.solarseed_tou.stats import EntryStats
+
+from .cases import reference_schedule
+from .replay import bind
+
+DEFAULT_COUNTS = (1, 10, 100, 1000)
+COMPONENTS = ("schedule", "compiled", "accumulators", "attributes", "states")
+
+# Bytes per entry, all components; about 1.5x the ~58 kB 64-bit CPython 3.11 measures
+PER_ENTRY_BUDGET = 90_000
+
+# The sensors async_setup_entry creates for an entry
+_SIMPLE_SENSORS = (
+    sensor.TOUCurrentRateSensor,
+    sensor.TOUCurrentTierSensor,
+    sensor.TOUFixedMonthlySensor,
+)
+_SOURCE_SENSORS = (
+    sensor.TOUCostHourlySensor,
+    sensor.TOUCostTodaySensor,
+    sensor.TOUCostWeekSensor,
+    sensor.TOUCostMonthSensor,
+    sensor.TOUCostBillingCycleSensor,
+    sensor.TOUProjectedCostTodaySensor,
+    sensor.TOUProjectedBillSensor,
+)
+_DIAGNOSTIC_SENSORS = (sensor.TOUSourceSamplesSensor, sensor.TOUIngestLatencySensor)
+
+NOW = datetime(2026, 6, 15, 12, 30)
+
+
+class _Entry:
+    """The parts of a ConfigEntry the sensors read."""
+
+    __slots__ = ("entry_id", "data")
+
+    def __init__(self, entry_id: str) -> None:
+        self.entry_id = entry_id
+        self.data = {"energy_sensor": SOURCE_ENTITY}
+
+
+@dataclass
+class _EntryObjects:
+    """Everything one entry keeps alive."""
+    entry: _Entry
+    config: dict[str, Any] | None = None
+    history: RateHistory | None = None
+    compiled: Any = None
+    stats: EntryStats | None = None
+    entities: list[sensor.TOUBaseSensor] = field(default_factory=list)
+    states: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+
+
+@dataclass
+class MemoryResult:
+    """Bytes allocated per component for ``count`` entries."""
+    count: int
+    components: dict[str, int]
+
+    @property
+    def total(self) -> int:
+        """All components."""
+        return sum(self.components.values())
+
+    @property
+    def per_entry(self) -> float:
+        """Total bytes divided by the entry count."""
+        return self.total / self.count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for the report."""
+        return {
+            "entries": self.count,
+            "bytes": self.components,
+            "total": self.total,
+            "per_entry": round(self.per_entry),
+            "per_entry_by_component": {
+                name: round(size / self.count) for name, size in self.components.items()
+            },
+        }
+
+
+# ── Stages ─────────────────────────────────────────────────
+
+
+def _build_schedule(obj: _EntryObjects, config: dict[str, Any]) -> None:
+    obj.config = copy.deepcopy(config)
+    obj.history = RateHistory.from_config(obj.config)
+
+
+def _build_compiled(obj: _EntryObjects) -> None:
+    obj.compiled = obj.history.schedule_at(NOW).compiled
+    obj.compiled.export_year(NOW.year)
+
+
+def _build_accumulators(obj: _EntryObjects, hass: Hass, clock: Clock) -> None:
+    schedule = obj.history.schedule_at(NOW)
+    obj.stats = EntryStats()
+    obj.entities = [
+        *(cls(obj.entry, schedule) for cls in _SIMPLE_SENSORS),
+        *(cls(obj.entry, schedule, SOURCE_ENTITY) for cls in _SOURCE_SENSORS),
+        *(cls(obj.entry, schedule) for cls in _DIAGNOSTIC_SENSORS),
+    ]
+    for entity in obj.entities:
+        bind(entity, hass, clock, obj.stats, entity._attr_unique_id)
+
+
+def _build_attributes(obj: _EntryObjects, event: Event) -> None:
+    for entity in obj.entities:
+        if isinstance(entity, sensor.TOUCostHourlySensor):
+            entity._handle_source_change(event)
+        elif isinstance(entity, sensor.TOUCostAccumulatorSensor):
+            entity._handle_sensor_change(event)
+            entity._update_state()
+        else:
+            entity.update()
+
+
+def _build_states(obj: _EntryObjects) -> None:
+    obj.states = [
+        (str(entity._attr_native_value),
+         dict(getattr(entity, "_attr_extra_state_attributes", None) or {}))
+        for entity in obj.entities
+    ]
+
+
+def measure(count: int) -> MemoryResult:
+    """Build ``count`` entries and return the bytes each stage allocated."""
+    config = reference_schedule().to_dict()
+    source = SourceState("W")
+    source.state = "1500"
+    hass, clock, event = Hass(source), Clock(NOW), Event(source)
+
+    stages: list[tuple[str, Callable[[_EntryObjects], None]]] = [
+        ("schedule", lambda o: _build_schedule(o, config)),
+        ("compiled", _build_compiled),
+        ("accumulators", lambda o: _build_accumulators(o, hass, clock)),
+        ("attributes", lambda o: _build_attributes(o, event)),
+        ("states", _build_states),
+    ]
+    # One throwaway entry first, so lazy imports and module-level caches
+    # are not charged to the measured entries
+    warm_up = _EntryObjects(_Entry("warm_up"))
+    for _, build in stages:
+        build(warm_up)
+
+    objects = [_EntryObjects(_Entry(f"entry_{i:04d}")) for i in range(count)]
+    components = {}
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for name, build in stages:
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            for obj in objects:
+                build(obj)
+            gc.collect()
+            components[name] = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return MemoryResult(count, components)
+
+
+def over_budget(results: list[MemoryResult], budget: float) -> list[str]:
+    """Describe every result whose bytes per entry exceed ``budget``."""
+    return [
+        f"{r.count} entries: {r.per_entry:,.0f} bytes/entry > {budget:,.0f} budget"
+        for r in results
+        if r.per_entry > budget
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Solarseed TOU memory footprint.")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)),
+                        help="comma-separated entry counts (default 1,10,100,1000)")
+    parser.add_argument("--budget", type=float, default=PER_ENTRY_BUDGET,
+                        help=f"bytes per entry (default {PER_ENTRY_BUDGET:,})")
+    args = parser.parse_args(argv)
+    try:
+        counts = [int(c) for c in args.counts.split(",") if c.strip()]
+    except ValueError:
+        parser.error("--counts must be comma-separated integers")
+    if not counts or min(counts) < 1:
+        parser.error("--counts must be positive")
+
+    results = []
+    for count in counts:
+        result = measure(count)
+        results.append(result)
+        parts = "  ".join(
+            f"{name} {size / count:>9,.0f}" for name, size in result.components.items()
+        )
+        print(f"{count:>5} entries  {result.per_entry:>10,.0f} B/entry  {parts}",
+              file=sys.stderr)
+    print(json.dumps({"budget": args.budget, "results": [r.as_dict() for r in results]},
+                     indent=2))
+
+    problems = over_budget(results, args.budget)
+    for line in problems:
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Replay a recorded source-sensor stream through the cost accumulators.
+
+Reproduces field reports ("wrong cost after the DST night", "cost jumped
+after an outage") by feeding recorded states through the real accumulator
+sensor classes with their clock pinned to each state's timestamp:
+
+    python -m benchmarks.replay --states states.csv --plan plan.yaml
+    python -m benchmarks.replay --states history.jsonl --plan plan.yaml --tz America/Los_Angeles
+
+States are CSV ``timestamp,state[,unit]`` rows (header optional) or JSONL
+objects with ``timestamp`` (or ``last_changed``), ``state`` and an optional
+``unit`` (or ``attributes.unit_of_measurement``) — the shape of a Home
+Assistant history export.  Aware timestamps are converted to ``--tz``;
+naive ones are taken as local wall-clock time.  The unit of the first
+state (default ``W``) decides power or energy mode, as in Home Assistant.
+
+Billing-cycle rollovers, which are timer callbacks in Home Assistant, fire
+when the replayed clock reaches the cycle's end.  The report lists every
+sensor's final state, its sample counters (see stats.py) and the replay
+rate in events per second.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, tzinfo
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+from ._ha import SOURCE_ENTITY, Clock, Event, Hass, SourceState  # installs the HA stubs
+
+from custom_components.solarseed_tou import sensor
+from custom_components.solarseed_tou.schedule import TOUSchedule
+from custom_components.solarseed_tou.stats import EntryStats
+
+DEFAULT_UNIT = "W"
+
+# Accumulators a replay can drive, by report name
+SENSORS: dict[str, type[sensor.TOUCostAccumulatorSensor]] = {
+    "today": sensor.TOUCostTodaySensor,
+    "week": sensor.TOUCostWeekSensor,
+    "month": sensor.TOUCostMonthSensor,
+    "billing_cycle": sensor.TOUCostBillingCycleSensor,
+    "projected_today": sensor.TOUProjectedCostTodaySensor,
+    "projected_bill": sensor.TOUProjectedBillSensor,
+}
+DEFAULT_SENSORS = ("today", "week", "month", "billing_cycle")
+
+
+@dataclass(frozen=True, slots=True)
+class StateSample:
+    """One recorded source state."""
+    when: datetime
+    state: str
+    unit: str | None = None
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay."""
+    samples: int
+    elapsed: float  # seconds
+    first: datetime | None
+    last: datetime | None
+    states: dict[str, Any] = field(default_factory=dict)      # name -> native value
+    costs: dict[str, float] = field(default_factory=dict)     # name -> energy cost
+    stats: EntryStats = field(default_factory=EntryStats)     # counters by sensor name
+
+    @property
+    def events_per_second(self) -> float:
+        """Replayed samples per wall-clock second."""
+        return self.samples / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for the command-line report."""
+        return {
+            "samples": self.samples,
+            "first": self.first.isoformat() if self.first else None,
+            "last": self.last.isoformat() if self.last else None,
+            "elapsed_s": round(self.elapsed, 3),
+            "events_per_second": round(self.events_per_second),
+            "states": self.states,
+            "costs": {name: round(cost, 6) for name, cost in self.costs.items()},
+            "stats": self.stats.as_dict(),
+        }
+
+
+# ── Input ──────────────────────────────────────────────────
+
+
+def _parse_time(value: str, tz: tzinfo | None) -> datetime:
+    """ISO timestamp → local time; aware values are converted to ``tz``."""
+    when = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if when.tzinfo is not None and tz is not None:
+        when = when.astimezone(tz)
+    return when
+
+
+def read_csv(lines: Iterable[str], tz: tzinfo | None = None) -> Iterator[StateSample]:
+    """``timestamp,state[,unit]`` rows; blank, comment and header rows are skipped."""
+    for row in csv.reader(lines):
+        if len(row) < 2 or not row[0].strip() or row[0].lstrip().startswith("#"):
+            continue
+        try:
+            when = _parse_time(row[0], tz)
+        except ValueError:
+            continue  # header
+        unit = row[2].strip() if len(row) > 2 and row[2].strip() else None
+        yield StateSample(when, row[1].strip(), unit)
+
+
+def read_jsonl(lines: Iterable[str], tz: tzinfo | None = None) -> Iterator[StateSample]:
+    """One JSON state object per line (Home Assistant history shape)."""
+    for n, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+            stamp = obj.get("timestamp") or obj["last_changed"]
+            unit = obj.get("unit") or (obj.get("attributes") or {}).get("unit_of_measurement")
+            yield StateSample(_parse_time(stamp, tz), str(obj["state"]), unit)
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"line {n}: {err}") from err
+
+
+def load_states(path: str | Path, tz: tzinfo | None = None) -> Iterator[StateSample]:
+    """Read a state recording; ``.jsonl`` / ``.ndjson`` files are JSONL, anything else CSV."""
+    path = Path(path)
+    reader = read_jsonl if path.suffix in (".jsonl", ".ndjson") else read_csv
+    with open(path, encoding="utf-8", newline="") as fh:
+        yield from reader(fh, tz)
+
+
+# ── Replay ─────────────────────────────────────────────────
+
+
+def bind(
+    entity: sensor.TOUBaseSensor, hass: Hass, clock: Clock, stats: EntryStats, key: str
+) -> None:
+    """What ``async_added_to_hass`` does, minus listeners and restored state."""
+    entity.hass = hass
+    entity._clock = clock
+    entity._entry_stats = stats
+    stats.add(key, entity._stats)
+    if isinstance(entity, sensor.TOUCostAccumulatorSensor):
+        entity._sensor_mode, entity._unit_multiplier = sensor._detect_sensor_mode(
+            hass, SOURCE_ENTITY
+        )
+        entity._check_reset()
+    if isinstance(entity, sensor.TOUCostBillingCycleSensor):
+        entity._start_cycle()
+
+
+def replay(
+    schedule: TOUSchedule,
+    samples: Iterable[StateSample],
+    sensors: Iterable[str] = DEFAULT_SENSORS,
+    unit: str = DEFAULT_UNIT,
+) -> ReplayResult:
+    """Feed samples (in time order) through fresh accumulators; returns their totals."""
+    samples = iter(samples)
+    first = next(samples, None)
+    if first is None:
+        return ReplayResult(0, 0.0, None, None)
+
+    source = SourceState(first.unit or unit)
+    hass = Hass(source)
+    clock = Clock(first.when)
+    entry = MagicMock(entry_id="replay")
+    stats = EntryStats()
+    accumulators = {}
+    for name in sensors:
+        acc = SENSORS[name](entry, schedule, SOURCE_ENTITY)
+        bind(acc, hass, clock, stats, name)
+        accumulators[name] = acc
+    cycles = [a for a in accumulators.values() if isinstance(a, sensor.TOUCostBillingCycleSensor)]
+    handlers = [acc._handle_sensor_change for acc in accumulators.values()]
+
+    count = 0
+    last = first.when
+    started = time.perf_counter()
+    for sample in _chain(first, samples):
+        clock.now = last = sample.when
+        for acc in cycles:
+            if sample.when.date() >= acc._cycle_end:
+                acc._handle_cycle_rollover(sample.when)
+        if sample.unit is not None:
+            source.attributes["unit_of_measurement"] = sample.unit
+        source.state = sample.state
+        event = Event(source)
+        for handle in handlers:
+            handle(event)
+        count += 1
+    elapsed = time.perf_counter() - started
+
+    for acc in accumulators.values():
+        acc._update_state()
+    return ReplayResult(
+        samples=count,
+        elapsed=elapsed,
+        first=first.when,
+        last=last,
+        states={name: acc._attr_native_value for name, acc in accumulators.items()},
+        costs={name: acc._cost for name, acc in accumulators.items()},
+        stats=stats,
+    )
+
+
+def _chain(first: StateSample, rest: Iterator[StateSample]) -> Iterator[StateSample]:
+    yield first
+    yield from rest
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Replay recorded states through the accumulators.")
+    parser.add_argument("--states", required=True, help="CSV or JSONL state recording")
+    parser.add_argument("--plan", required=True, help="rate config (calculator YAML export)")
+    parser.add_argument("--tz", help="time zone for aware timestamps (e.g. America/Denver)")
+    parser.add_argument("--unit", default=DEFAULT_UNIT,
+                        help="source unit when the recording has none (default W)")
+    parser.add_argument("--sensors", default=",".join(DEFAULT_SENSORS),
+                        help=f"comma-separated, from: {', '.join(SENSORS)}")
+    args = parser.parse_args(argv)
+
+    from custom_components.solarseed_tou.simulator import load_plan_yaml
+
+    names = [n.strip() for n in args.sensors.split(",") if n.strip()]
+    unknown = set(names) - set(SENSORS)
+    if unknown:
+        parser.error(f"unknown sensors: {', '.join(sorted(unknown))}")
+    try:
+        schedule = TOUSchedule.from_dict(load_plan_yaml(args.plan))
+        tz = ZoneInfo(args.tz) if args.tz else None
+        result = replay(schedule, load_states(args.states, tz), names, args.unit)
+    except (OSError, ValueError) as err:
+        print(f"error: {err}", file=sys.stderr)
+        return 1
+    print(json.dumps(result.as_dict(), indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Run the Solarseed TOU benchmarks and compare them against a baseline.
+
+    python -m benchmarks.run                         # print results
+    python -m benchmarks.run --quick                 # macro cases at 1/100 size
+    python -m benchmarks.run --save my-machine.json  # record a baseline
+    python -m benchmarks.run --compare my-machine.json --threshold 0.25
+
+Results are nanoseconds per operation, best of ``--repeat`` runs.  With
+``--compare`` every case slower than its baseline by more than
+``--threshold`` (a fraction) is reported as a regression and the exit
+status is 1.  Baselines are only meaningful on the machine that recorded
+them; benchmarks/baseline.json was recorded with ``--quick`` on a
+development machine.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from .cases import BENCHMARKS, Benchmark
+
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+QUICK_SCALE = 0.01
+
+
+def measure(bench: Benchmark, scale: float, repeat: int) -> float:
+    """Best-of-``repeat`` time of a case, in nanoseconds per operation."""
+    ops, run = bench.case(scale)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter_ns()
+        run()
+        best = min(best, time.perf_counter_ns() - started)
+    return best / ops
+
+
+def run_all(
+    names: list[str] | None = None, scale: float = 1.0, repeat: int = DEFAULT_REPEAT
+) -> dict[str, float]:
+    """Measure the selected cases (all by default); returns name → ns/op."""
+    results = {}
+    for bench in BENCHMARKS:
+        if names and bench.name not in names:
+            continue
+        results[bench.name] = measure(bench, scale, repeat)
+        print(f"{bench.kind:<6} {bench.name:<28} {results[bench.name]:>14,.1f} ns/op",
+              file=sys.stderr)
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Describe every case slower than its baseline by more than ``threshold``."""
+    regressions = []
+    for name, ns in results.items():
+        base = baseline.get(name)
+        if base and ns > base * (1 + threshold):
+            regressions.append(
+                f"{name}: {ns:,.1f} ns/op vs {base:,.1f} baseline (+{ns / base - 1:.0%})"
+            )
+    return regressions
+
+
+def _document(results: dict[str, float], scale: float) -> dict[str, Any]:
+    """Baseline file contents."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "results": {name: round(ns, 1) for name, ns in results.items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Solarseed TOU benchmarks.")
+    parser.add_argument("names", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="shrink the macro cases")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="JSON", help="flag regressions vs a baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - {b.name for b in BENCHMARKS}
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    scale = QUICK_SCALE if args.quick else 1.0
+    results = run_all(args.names, scale, args.repeat)
+    print(json.dumps(_document(results, scale), indent=2))
+
+    if args.save:
+        Path(args.save).write_text(
+            json.dumps(_document(results, scale), indent=2) + "\n", encoding="utf-8"
+        )
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
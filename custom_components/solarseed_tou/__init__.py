@@ -4,27 +4,50 @@ Rate configuration is managed via YAML exported from the Johnny Solarseed
 Rate Calculator (johnnysolarseed.org/tou-calculator) and pasted into the
 integration's Options flow.  No frontend panel is shipped — the website
 handles all rate decomposition and schedule painting.
+
+Only what entry setup needs is imported with the package.  The WebSocket
+commands (websocket.py) and services (services.py) are imported in the
+executor on first setup, and the dispatcher only when a config changes.
 """
 from __future__ import annotations
 
+import importlib
 import logging
+from datetime import timedelta
 from typing import Any
 
-import voluptuous as vol
-
-from homeassistant.components import websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-
-from .const import DOMAIN, CONF_ENERGY_SENSOR
-from .schedule import TOUSchedule
-from .storage import TOUStorage
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .checkpoint import AccumulatorCheckpoint
+from .compiled_cache import CompiledCache
+from .const import (
+    DOMAIN,
+    CONF_CHECKPOINT_INTERVAL,
+    CONF_ENERGY_SENSOR,
+    DEFAULT_CHECKPOINT_INTERVAL,
+    SIGNAL_CONFIG_UPDATED,
+)
+from .history import RateHistory
+from .stats import EntryStats
+from .storage import (
+    TOUStorage,
+    _config_digest,
+    async_migrate_shared_store,
+    async_remove_shared_store,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["sensor"]
 
+# hass.data[DOMAIN] key holding the IDs of set-up entries (entry data itself
+# lives at hass.data[DOMAIN][entry_id])
+_ENTRY_IDS = "_entry_ids"
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Solarseed TOU component."""
@@ -32,12 +55,25 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry.
+
+    v1 → v2: the config moves from the shared store into the entry's own.
+    """
+    if entry.version == 1:
+        await async_migrate_shared_store(hass, entry.entry_id)
+        hass.config_entries.async_update_entry(entry, version=2)
+        if all(e.version >= 2 for e in hass.config_entries.async_entries(DOMAIN)):
+            await async_remove_shared_store(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Solarseed TOU from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
     # Initialize storage
-    storage = TOUStorage(hass)
+    storage = TOUStorage(hass, entry.entry_id)
     stored_config = await storage.async_load()
 
     # Ensure energy sensor is set from config entry
@@ -46,101 +82,167 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         stored_config["energy_sensor"] = energy_sensor
         await storage.async_save(stored_config)
 
-    # Parse schedule
-    schedule = TOUSchedule.from_dict(stored_config)
+    # Parse the dated rate versions; the compiled tables of the one in
+    # effect now come from the side cache when it matches
+    history = RateHistory.from_config(stored_config)
+    now = dt_util.now()
+    schedule = history.schedule_at(now)
+    compiled_cache = CompiledCache(hass, entry.entry_id)
+    await compiled_cache.async_prime(
+        schedule.compiled, _config_digest(history.config_at(now))
+    )
+
+    # Accumulator checkpoint, read once here for all sensors
+    checkpoint = AccumulatorCheckpoint(hass, entry.entry_id)
+    await checkpoint.async_load()
 
     # Store references
-    hass.data[DOMAIN][entry.entry_id] = {
+    entry_data = hass.data[DOMAIN][entry.entry_id] = {
         "storage": storage,
+        "history": history,
         "schedule": schedule,
+        "compiled_cache": compiled_cache,
+        "checkpoint": checkpoint,
+        "stats": EntryStats(),
         "entry": entry,
     }
+    hass.data[DOMAIN].setdefault(_ENTRY_IDS, set()).add(entry.entry_id)
 
     # Register WebSocket API (useful for debugging / external tooling)
-    _async_register_websocket(hass)
+    # and services; their modules are imported off the event loop
+    if not hass.data[DOMAIN].get("_ws_registered"):
+        websocket, services = await hass.async_add_executor_job(_import_api_modules)
+        websocket.async_register_websocket(hass)
+        services.async_register_services(hass)
 
     # Set up sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    checkpoint.async_start(
+        _checkpoint_interval(entry), lambda: entry_data["schedule"].compiled
+    )
+    _async_track_next_version(hass, entry_data)
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
     return True
 
 
+def _checkpoint_interval(entry: ConfigEntry) -> timedelta:
+    """Checkpoint cadence from the entry options."""
+    return timedelta(
+        seconds=entry.options.get(CONF_CHECKPOINT_INTERVAL, DEFAULT_CHECKPOINT_INTERVAL)
+    )
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply a changed checkpoint cadence without reloading the entry."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data:
+        entry_data["checkpoint"].async_set_interval(_checkpoint_interval(entry))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data:
+        if unsub := entry_data.pop("unsub_version", None):
+            unsub()
+        if hub := entry_data.pop("hub", None):
+            hub.async_stop()
+        checkpoint: AccumulatorCheckpoint = entry_data["checkpoint"]
+        checkpoint.async_stop()
+        await checkpoint.async_save()
+        # A reload must read what was saved, and no write may land later
+        await entry_data["storage"].async_flush()
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
+        hass.data[DOMAIN].get(_ENTRY_IDS, set()).discard(entry.entry_id)
     return unload_ok
 
 
-@callback
-def _async_register_websocket(hass: HomeAssistant) -> None:
-    """Register WebSocket commands for config read/write."""
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete an entry's stored config, compiled cache and checkpoint on removal."""
+    # The live storage, if any, so its pending delayed save is cancelled
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    storage = entry_data["storage"] if entry_data else TOUStorage(hass, entry.entry_id)
+    await storage.async_remove()
+    await CompiledCache(hass, entry.entry_id).async_remove()
+    await AccumulatorCheckpoint(hass, entry.entry_id).async_remove()
 
-    @websocket_api.websocket_command(
-        {vol.Required("type"): "solarseed_tou/get_config"}
-    )
-    @websocket_api.async_response
-    async def ws_get_config(
-        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
-    ) -> None:
-        """Return current TOU configuration."""
-        entry_data = _get_entry_data(hass)
-        if entry_data is None:
-            connection.send_error(msg["id"], "not_configured", "No TOU entry found")
-            return
-
-        storage: TOUStorage = entry_data["storage"]
-        config = await storage.async_get_config()
-        connection.send_result(msg["id"], config)
-
-    @websocket_api.websocket_command(
-        {
-            vol.Required("type"): "solarseed_tou/set_config",
-            vol.Required("config"): dict,
-        }
+
+def _import_api_modules() -> tuple[Any, Any]:
+    """Import the WebSocket and service modules (executor)."""
+    return (
+        importlib.import_module(f"{__name__}.websocket"),
+        importlib.import_module(f"{__name__}.services"),
     )
-    @websocket_api.async_response
-    async def ws_set_config(
-        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
-    ) -> None:
-        """Update TOU configuration (used by external tooling / automations)."""
-        entry_data = _get_entry_data(hass)
-        if entry_data is None:
-            connection.send_error(msg["id"], "not_configured", "No TOU entry found")
-            return
 
-        storage: TOUStorage = entry_data["storage"]
-        new_config = msg["config"]
 
-        # Validate and save
-        try:
-            schedule = TOUSchedule.from_dict(new_config)
-        except Exception as err:
-            connection.send_error(msg["id"], "invalid_config", str(err))
-            return
+@callback
+def async_apply_rate_history(
+    hass: HomeAssistant, entry_data: dict[str, Any], history: RateHistory
+) -> None:
+    """Make a saved rate history live and notify the entry's sensors."""
+    entry_data["history"] = history
+    _async_activate_version(hass, entry_data)
 
-        await storage.async_save(new_config)
 
-        # Update the live schedule
-        entry_data["schedule"] = schedule
+@callback
+def _async_activate_version(hass: HomeAssistant, entry_data: dict[str, Any]) -> None:
+    """Switch the entry to the rate version in effect now."""
+    from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+    history: RateHistory = entry_data["history"]
+    now = dt_util.now()
+    schedule = history.schedule_at(now)
+    entry_data["schedule"] = schedule
+    entry_data["compiled_cache"].async_schedule_rebuild(
+        schedule.compiled, _config_digest(history.config_at(now))
+    )
+    entry_data["checkpoint"].async_reschedule_transition()
 
-        # Notify sensors to pick up new schedule immediately
-        async_dispatcher_send(hass, f"{DOMAIN}_config_updated", schedule)
+    # Notify sensors to pick up new schedule immediately
+    async_dispatcher_send(
+        hass, SIGNAL_CONFIG_UPDATED.format(entry_data["entry"].entry_id), schedule
+    )
+    _async_track_next_version(hass, entry_data)
 
-        connection.send_result(msg["id"], {"success": True})
 
-    # Only register once
-    if not hass.data[DOMAIN].get("_ws_registered"):
-        websocket_api.async_register_command(hass, ws_get_config)
-        websocket_api.async_register_command(hass, ws_set_config)
-        hass.data[DOMAIN]["_ws_registered"] = True
+@callback
+def _async_track_next_version(hass: HomeAssistant, entry_data: dict[str, Any]) -> None:
+    """(Re)arm the switch to the next dated rate version, if any."""
+    if unsub := entry_data.pop("unsub_version", None):
+        unsub()
+    nxt = entry_data["history"].next_change(dt_util.now())
+    if nxt is None:
+        return
+
+    @callback
+    def _switch(_now: Any) -> None:
+        entry_data.pop("unsub_version", None)
+        _async_activate_version(hass, entry_data)
+
+    entry_data["unsub_version"] = async_track_point_in_time(hass, _switch, nxt)
+
 
+def get_entry_data(hass: HomeAssistant, entry_id: str | None = None) -> dict[str, Any]:
+    """Resolve an entry's data dict by entry_id (direct dict lookup).
 
-def _get_entry_data(hass: HomeAssistant) -> dict[str, Any] | None:
-    """Get the first entry's data dict."""
+    Without an entry_id the only set-up entry is used; with several entries
+    the caller has to say which one.  Raises HomeAssistantError otherwise.
+    """
     domain_data = hass.data.get(DOMAIN, {})
-    for entry_data in domain_data.values():
-        if isinstance(entry_data, dict) and "storage" in entry_data:
-            return entry_data
-    return None
+    if entry_id is None:
+        entry_ids = domain_data.get(_ENTRY_IDS) or ()
+        if not entry_ids:
+            raise HomeAssistantError("No TOU entry found")
+        if len(entry_ids) > 1:
+            raise HomeAssistantError(
+                "Several TOU entries are configured; pass entry_id to pick one"
+            )
+        entry_id = next(iter(entry_ids))
+    entry_data = domain_data.get(entry_id)
+    if not isinstance(entry_data, dict) or "storage" not in entry_data:
+        raise HomeAssistantError(f"Unknown TOU entry: {entry_id}")
+    return entry_data
@@ -0,0 +1,105 @@
+"""Billing-cycle boundaries for Solarseed TOU.
+
+Utility meter reads land on arbitrary days, so a "monthly" total that resets
+on the 1st never matches the bill.  A billing cycle runs from one read date
+(inclusive) to the next (exclusive).  Read dates come from either a fixed
+``read_day`` of the month (clamped to short months) or an explicit list of
+``read_dates``; dates beyond the explicit list continue on the read day.
+
+Boundaries are precomputed about a year ahead into a sorted list, so finding
+the current cycle is a bisect and the accumulator reset can be scheduled for
+an exact point in time instead of comparing dates on every sample.
+"""
+from __future__ import annotations
+
+import bisect
+import calendar
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .schedule import BillingCycleConfig
+
+# How far ahead boundaries are precomputed
+CYCLE_HORIZON_DAYS = 366
+
+# Average month length — fixed_monthly is prorated against this, so twelve
+# cycles of any length add up to twelve monthly charges over a year.
+AVERAGE_CYCLE_DAYS = 365.25 / 12
+
+
+def read_date(year: int, month: int, read_day: int) -> date:
+    """Return the read date in a month, clamping e.g. day 31 to Feb 28/29."""
+    return date(year, month, min(read_day, calendar.monthrange(year, month)[1]))
+
+
+def _add_months(year: int, month: int, n: int) -> tuple[int, int]:
+    """Shift (year, month) by n months."""
+    index = year * 12 + (month - 1) + n
+    return index // 12, index % 12 + 1
+
+
+def cycle_boundaries(
+    config: BillingCycleConfig,
+    start: date,
+    horizon_days: int = CYCLE_HORIZON_DAYS,
+) -> list[date]:
+    """Return sorted read dates covering ``start`` through ``start + horizon_days``.
+
+    The first element is the last read on or before ``start``; the last is
+    the first read after the horizon, so every day in range has a cycle end.
+    """
+    end = start + timedelta(days=horizon_days)
+    explicit = sorted(set(config.read_dates))
+
+    # Read-day rule: one boundary per month from the month before start
+    monthly: list[date] = []
+    y, m = _add_months(start.year, start.month, -1)
+    while True:
+        d = read_date(y, m, config.read_day)
+        monthly.append(d)
+        if d > end:
+            break
+        y, m = _add_months(y, m, 1)
+
+    if explicit:
+        # Explicit reads win inside their span; the rule fills in around it
+        first, last = explicit[0], explicit[-1]
+        merged = [d for d in monthly if d < first or d > last]
+        merged.extend(explicit)
+        dates = sorted(merged)
+    else:
+        dates = monthly
+
+    lo = bisect.bisect_right(dates, start) - 1
+    hi = bisect.bisect_right(dates, end)
+    return dates[max(lo, 0):hi + 1]
+
+
+def prorated_fixed(fixed_monthly: float, cycle_start: date, cycle_end: date) -> float:
+    """Prorate the fixed monthly charge by billing-cycle length."""
+    return fixed_monthly * (cycle_end - cycle_start).days / AVERAGE_CYCLE_DAYS
+
+
+class BillingCalendar:
+    """Precomputed billing-cycle boundaries with O(log n) cycle lookup."""
+
+    def __init__(self, config: BillingCycleConfig, today: date) -> None:
+        """Precompute boundaries for roughly a year from ``today``."""
+        self._config = config
+        self._boundaries = cycle_boundaries(config, today)
+
+    @property
+    def boundaries(self) -> list[date]:
+        """The precomputed read dates."""
+        return self._boundaries
+
+    def cycle_for(self, d: date) -> tuple[date, date]:
+        """Return (cycle_start, cycle_end) containing ``d`` (end exclusive)."""
+        bounds = self._boundaries
+        i = bisect.bisect_right(bounds, d) - 1
+        if i < 0 or i + 1 >= len(bounds):
+            # Outside the precomputed horizon — roll it forward from d
+            self._boundaries = bounds = cycle_boundaries(self._config, d)
+            i = bisect.bisect_right(bounds, d) - 1
+        return bounds[i], bounds[i + 1]
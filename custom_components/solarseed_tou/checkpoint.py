@@ -0,0 +1,200 @@
+"""Crash-safe accumulator checkpoints for Solarseed TOU.
+
+RestoreEntity only persists every 15 minutes and on a clean shutdown, so a
+power cut can lose a quarter hour of accounting.  Each entry keeps one
+compact checkpoint of all its accumulators instead:
+
+    {"saved_at": iso, "sensors": {unique_id: {...accumulator state...}}}
+
+It is written atomically (temp file + rename) on a configurable cadence,
+at every tier transition and at shutdown, and read once at setup for all
+sensors.  Writes are skipped when no accumulator changed.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .compiled import CompiledSchedule
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = f"{DOMAIN}_checkpoint"  # per entry: f"{CHECKPOINT_KEY}.{entry_id}"
+CHECKPOINT_VERSION = 1
+
+# A restored meter reading older than this is dropped: pricing the catch-up
+# delta at the rate in effect at restart would bill it at the wrong tier.
+# Matches the 1 h gap limit of power-mode integration.
+MAX_READING_AGE = timedelta(hours=1)
+
+SnapshotProvider = Callable[[], dict[str, Any]]
+
+
+def reading_is_fresh(taken_at: datetime | str | None, now: datetime) -> bool:
+    """Return True if a reading timestamp is recent enough to resume from."""
+    if not taken_at:
+        return False
+    if isinstance(taken_at, datetime):
+        when = taken_at
+    else:
+        try:
+            when = datetime.fromisoformat(taken_at)
+        except (TypeError, ValueError):
+            return False
+    if when.tzinfo is None and now.tzinfo is not None:
+        when = when.replace(tzinfo=now.tzinfo)
+    return timedelta(0) <= now - when <= MAX_READING_AGE
+
+
+class AccumulatorCheckpoint:
+    """One entry's checkpoint of every accumulator's state."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the checkpoint store for a config entry."""
+        self._hass = hass
+        self._store = Store(
+            hass, CHECKPOINT_VERSION, f"{CHECKPOINT_KEY}.{entry_id}", atomic_writes=True
+        )
+        self._restored: dict[str, dict[str, Any]] = {}
+        self._providers: dict[str, SnapshotProvider] = {}
+        self._costs: dict[str, Callable[[], float]] = {}
+        self._last_saved: dict[str, dict[str, Any]] | None = None
+        self._compiled: Callable[[], CompiledSchedule] | None = None
+        self._unsub_interval: Callable[[], None] | None = None
+        self._unsub_stop: Callable[[], None] | None = None
+        self._unsub_transition: Callable[[], None] | None = None
+
+    async def async_load(self) -> None:
+        """Read the checkpoint once for all sensors of the entry."""
+        data = await self._store.async_load()
+        if isinstance(data, dict) and isinstance(data.get("sensors"), dict):
+            self._restored = dict(data["sensors"])
+            self._last_saved = data["sensors"]
+
+    def restore(self, unique_id: str) -> dict[str, Any] | None:
+        """Return (and forget) the checkpointed state of one accumulator."""
+        return self._restored.pop(unique_id, None)
+
+    @callback
+    def register(
+        self,
+        unique_id: str,
+        provider: SnapshotProvider,
+        cost: Callable[[], float] | None = None,
+    ) -> Callable[[], None]:
+        """Include an accumulator in future checkpoints; returns an unregister callback.
+
+        ``cost`` reads the accumulator's running cost without building a
+        whole snapshot (see ``costs``).
+        """
+        self._providers[unique_id] = provider
+        if cost is not None:
+            self._costs[unique_id] = cost
+
+        @callback
+        def _unregister() -> None:
+            self._providers.pop(unique_id, None)
+            self._costs.pop(unique_id, None)
+
+        return _unregister
+
+    # ── Cadence ────────────────────────────────────────────
+
+    @callback
+    def async_start(
+        self, interval: timedelta, compiled: Callable[[], CompiledSchedule]
+    ) -> None:
+        """Checkpoint every ``interval``, at each tier transition and at shutdown."""
+        self._compiled = compiled
+        self.async_set_interval(interval)
+        self._unsub_stop = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._handle_stop
+        )
+        self.async_reschedule_transition()
+
+    @callback
+    def async_set_interval(self, interval: timedelta) -> None:
+        """Change the periodic cadence."""
+        if self._unsub_interval:
+            self._unsub_interval()
+        self._unsub_interval = async_track_time_interval(
+            self._hass, self._handle_tick, interval
+        )
+
+    @callback
+    def async_reschedule_transition(self) -> None:
+        """(Re)arm the checkpoint at the next tier transition (call on config change)."""
+        if self._unsub_transition:
+            self._unsub_transition()
+            self._unsub_transition = None
+        if self._compiled is None:
+            return
+        nxt = self._compiled().next_transition(dt_util.now())
+        if nxt is not None:
+            self._unsub_transition = async_track_point_in_time(
+                self._hass, self._handle_transition, nxt[0]
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel all scheduled checkpoints."""
+        for unsub in (self._unsub_interval, self._unsub_stop, self._unsub_transition):
+            if unsub:
+                unsub()
+        self._unsub_interval = self._unsub_stop = self._unsub_transition = None
+
+    async def _handle_tick(self, _now: datetime) -> None:
+        """Periodic checkpoint."""
+        await self.async_save()
+
+    async def _handle_transition(self, _now: datetime) -> None:
+        """Tier changed — checkpoint what was accrued at the old rate."""
+        self._unsub_transition = None
+        await self.async_save()
+        self.async_reschedule_transition()
+
+    async def _handle_stop(self, _event: Any) -> None:
+        """Final checkpoint on shutdown."""
+        self._unsub_stop = None  # listen_once has already removed itself
+        await self.async_save()
+
+    async def async_remove(self) -> None:
+        """Delete the checkpoint (entry removed)."""
+        self.async_stop()
+        await self._store.async_remove()
+
+    # ── Writing ────────────────────────────────────────────
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Collect the current state of every registered accumulator."""
+        sensors = {uid: provider() for uid, provider in self._providers.items()}
+        # Sensors that have not come back yet keep their last checkpoint
+        for uid, state in self._restored.items():
+            sensors.setdefault(uid, state)
+        return sensors
+
+    def costs(self) -> dict[str, float]:
+        """Running cost of every registered accumulator, by unique ID."""
+        return {uid: cost() for uid, cost in self._costs.items()}
+
+    async def async_save(self) -> None:
+        """Write a checkpoint atomically, unless nothing changed."""
+        sensors = self.snapshot()
+        if sensors == self._last_saved:
+            return
+        await self._store.async_save(
+            {"saved_at": dt_util.now().isoformat(), "sensors": sensors}
+        )
+        self._last_saved = sensors
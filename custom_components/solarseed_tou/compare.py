@@ -0,0 +1,175 @@
+"""Multi-plan cost comparison for Solarseed TOU.
+
+Answers "would plan A beat plan B for my house?" by pricing one interval
+dataset under N rate plans.  The timestamp decomposition (year, hourly slot,
+billing month) is done once and shared by every plan; each plan then only
+does a table lookup per interval against its compiled tier table, which
+already folds in its own holidays and seasons.
+
+Plans with a dated ``rate_history`` price each interval under the version
+in effect at its start (see history.py).  Pricing runs in the calling
+thread; the offline simulator fans large comparisons out to a process pool.
+"""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .compiled import slot_of
+from .history import RateHistory
+from .schedule import TOUSchedule
+
+# Largest comparison a single WebSocket request may ask for
+MAX_COMPARE_PLANS = 20
+MAX_COMPARE_INTERVALS = 200_000  # a year of 5-minute readings is ~105k
+
+
+@dataclass
+class IntervalData:
+    """An interval dataset decomposed once for pricing under many plans.
+
+    Parallel arrays, one entry per interval: calendar year, hourly slot
+    within that year, index into ``month_keys``, and consumed kWh.
+    """
+    years: list[int] = field(default_factory=list)
+    slots: list[int] = field(default_factory=list)
+    months: list[int] = field(default_factory=list)
+    kwh: list[float] = field(default_factory=list)
+    month_keys: list[str] = field(default_factory=list)  # "YYYY-MM"
+
+    def __len__(self) -> int:
+        """Number of intervals."""
+        return len(self.kwh)
+
+
+@dataclass
+class PlanCost:
+    """Cost of one plan over an interval dataset."""
+    name: str
+    energy_kwh: float
+    energy_cost: float
+    fixed_cost: float
+    monthly: dict[str, float]  # "YYYY-MM" -> energy + fixed
+    annual: dict[int, float]   # year -> energy + fixed
+
+    @property
+    def total(self) -> float:
+        """Energy plus fixed charges over the whole dataset."""
+        return self.energy_cost + self.fixed_cost
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for the WebSocket API / simulator output."""
+        return {
+            "name": self.name,
+            "energy_kwh": round(self.energy_kwh, 4),
+            "energy_cost": round(self.energy_cost, 4),
+            "fixed_cost": round(self.fixed_cost, 4),
+            "total": round(self.total, 4),
+            "monthly": {k: round(v, 4) for k, v in self.monthly.items()},
+            "annual": {str(k): round(v, 4) for k, v in self.annual.items()},
+        }
+
+
+def decompose(samples: Iterable[tuple[datetime, float]]) -> IntervalData:
+    """Decompose (timestamp, kWh) samples into shared pricing keys.
+
+    Timestamps are interpreted as local wall-clock time, exactly like
+    ``TOUSchedule.get_tier_id``; each interval is priced at its start slot.
+    """
+    data = IntervalData()
+    month_index: dict[tuple[int, int], int] = {}
+    for ts, kwh in samples:
+        year, slot = slot_of(ts)
+        key = (year, ts.month)
+        mi = month_index.get(key)
+        if mi is None:
+            mi = month_index[key] = len(data.month_keys)
+            data.month_keys.append(f"{year:04d}-{ts.month:02d}")
+        data.years.append(year)
+        data.slots.append(slot)
+        data.months.append(mi)
+        data.kwh.append(float(kwh))
+    return data
+
+
+def parse_samples(rows: Iterable[Iterable[Any]]) -> list[tuple[datetime, float]]:
+    """Parse ``[iso_timestamp, kwh]`` rows (WebSocket / CSV shape) into samples."""
+    samples = []
+    for row in rows:
+        ts, kwh = tuple(row)[:2]
+        if not isinstance(ts, datetime):
+            ts = datetime.fromisoformat(str(ts))
+        samples.append((ts, float(kwh)))
+    return samples
+
+
+Plan = TOUSchedule | RateHistory | Mapping[str, Any]
+
+
+def _as_history(plan: Plan) -> RateHistory:
+    """Normalize a plan to a RateHistory (config dicts may carry rate_history)."""
+    if isinstance(plan, RateHistory):
+        return plan
+    if isinstance(plan, TOUSchedule):
+        return RateHistory.single(plan)
+    return RateHistory.from_config(dict(plan))
+
+
+def price_plan(name: str, plan: Plan, data: IntervalData) -> PlanCost:
+    """Price a decomposed dataset under a single plan.
+
+    Each month's fixed charge is that of the version in effect at the
+    month's first interval.
+    """
+    history = _as_history(plan)
+    compiled = [schedule.compiled for schedule in history.schedules]
+    bounds = [slot_of(start) for start in history.starts]  # starts are whole hours
+
+    monthly_energy = [0.0] * len(data.month_keys)
+    monthly_fixed: list[float | None] = [None] * len(data.month_keys)
+    rates = compiled[0].rates
+    table = b""
+    table_key = None
+    version = 0
+    for year, slot, mi, kwh in zip(data.years, data.slots, data.months, data.kwh):
+        if bounds:
+            version = bisect.bisect_right(bounds, (year, slot))
+        if (year, version) != table_key:
+            table = compiled[version].year_table(year)
+            rates = compiled[version].rates
+            table_key = (year, version)
+        monthly_energy[mi] += kwh * rates[table[slot]]
+        if monthly_fixed[mi] is None:
+            monthly_fixed[mi] = history.schedules[version].fixed_monthly
+
+    monthly: dict[str, float] = {}
+    annual: dict[int, float] = {}
+    fixed_cost = 0.0
+    for key, energy, fixed in zip(data.month_keys, monthly_energy, monthly_fixed):
+        month_total = energy + (fixed or 0.0)
+        fixed_cost += fixed or 0.0
+        monthly[key] = month_total
+        year = int(key[:4])
+        annual[year] = annual.get(year, 0.0) + month_total
+
+    return PlanCost(
+        name=name,
+        energy_kwh=sum(data.kwh),
+        energy_cost=sum(monthly_energy),
+        fixed_cost=fixed_cost,
+        monthly=monthly,
+        annual=annual,
+    )
+
+
+def compare_plans(plans: Mapping[str, Plan], data: IntervalData) -> list[PlanCost]:
+    """Price one dataset under every plan; returns results cheapest first.
+
+    Plans may be TOUSchedule or RateHistory objects, or raw config dicts
+    (parsed with ``RateHistory.from_config``).
+    """
+    results = [price_plan(name, plan, data) for name, plan in plans.items()]
+    return sorted(results, key=lambda r: r.total)
@@ -0,0 +1,342 @@
+"""Compiled rate tables for Solarseed TOU.
+
+Flattens a TOUSchedule into one byte per hourly slot per calendar year, so
+that resolving a tier becomes a single index into a table instead of the
+holiday → season → grid walk done by ``TOUSchedule.get_tier_id``:
+
+    slot  = (day_of_year × 24) + hour
+    tier  = tier_ids[table[slot]]
+    rate  = rates[table[slot]]
+
+Tables are built lazily per year and cached on the CompiledSchedule, which
+itself is cached on the TOUSchedule it was built from.  A config change
+produces a new TOUSchedule and therefore a fresh set of tables.  Built
+years can also be primed from a persisted copy (see compiled_cache.py).
+"""
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING, Any
+
+from .holiday import HolidayCalendar
+
+if TYPE_CHECKING:
+    from .schedule import TOUSchedule
+
+SLOTS_PER_DAY = 24
+
+# Tier indices are stored as single bytes
+MAX_TIERS = 256
+
+# How many calendar years ahead next_transition will search
+TRANSITION_SEARCH_YEARS = 2
+
+# Years external requests (rate tables, quotes) may build tables for
+MIN_TABLE_YEAR = 2000
+MAX_TABLE_YEAR = 2100
+
+
+def slot_of(now: datetime) -> tuple[int, int]:
+    """Decompose a datetime into (year, slot-within-year)."""
+    year = now.year
+    day = now.toordinal() - date(year, 1, 1).toordinal()
+    return year, day * SLOTS_PER_DAY + now.hour
+
+
+def slot_start(year: int, slot: int, tzinfo=None) -> datetime:
+    """Inverse of slot_of — wall-clock start of a slot (may roll into next year)."""
+    day, hour = divmod(slot, SLOTS_PER_DAY)
+    d = date.fromordinal(date(year, 1, 1).toordinal() + day)
+    return datetime.combine(d, time(hour), tzinfo=tzinfo)
+
+
+def _first_tier(schedule: TOUSchedule) -> str:
+    """The tier ``get_tier_id`` falls back to when there are no seasons."""
+    return next(iter(schedule.tiers), "off-peak")
+
+
+class CompiledSchedule:
+    """Per-year tier index tables and effective-rate vector for a TOUSchedule.
+
+    Resolution (holiday override, then the month's season, then the first
+    tier when there are no seasons) matches ``TOUSchedule.get_tier_id``.
+    Validation guarantees every grid row has 24 known tier IDs, so tables
+    index ``schedule.tiers`` directly; only a schedule with no tiers at all
+    resolves to an ID outside it, priced at 0.0 like ``compute_effective_rate``.
+    """
+
+    def __init__(self, schedule: TOUSchedule) -> None:
+        """Build the tier and rate vectors; year tables are built on demand."""
+        self.schedule = schedule
+        tier_ids = list(dict.fromkeys([
+            *schedule.tiers, _first_tier(schedule), schedule.holidays.rate_tier,
+        ]))
+        if len(tier_ids) > MAX_TIERS:
+            raise ValueError(f"Too many tiers to compile ({len(tier_ids)} > {MAX_TIERS})")
+
+        self.tier_ids: tuple[str, ...] = tuple(tier_ids)
+        self.index: dict[str, int] = {tid: i for i, tid in enumerate(tier_ids)}
+        self.rates: tuple[float, ...] = tuple(
+            schedule.compute_effective_rate(tid) for tid in tier_ids
+        )
+        self._tables: dict[int, bytes] = {}
+        self._transitions: dict[int, array] = {}
+        self._holidays: dict[int, frozenset[date]] = {}
+        self._calendar: HolidayCalendar | None = None
+
+        # Derived results (price horizons, window searches, ...) that stay
+        # valid for the lifetime of this compile — a config change builds a
+        # new CompiledSchedule, which drops them all at once.
+        self.memo: dict[Any, Any] = {}
+
+    # ── Table construction ─────────────────────────────────
+
+    def _day_rows(self) -> dict[tuple[int, int], bytes]:
+        """Return the 24-slot row of every (season index, weekday)."""
+        from .schedule import DAY_KEYS
+
+        return {
+            (si, wd): bytes(self.index[tid] for tid in season.grid[day_key])
+            for si, season in enumerate(self.schedule.seasons)
+            for wd, day_key in enumerate(DAY_KEYS)
+        }
+
+    def calendar(self, year: int) -> HolidayCalendar:
+        """The holiday calendar, re-resolved over a wider range if ``year`` is outside it.
+
+        The first build covers the year before ``year`` through the years
+        next_transition may search.
+        """
+        cal = self._calendar
+        if cal is None or not cal.covers(year):
+            first, last = year - 1, year + TRANSITION_SEARCH_YEARS
+            if cal is not None:
+                first, last = min(first, cal.first_year), max(last, cal.last_year)
+            cfg = self.schedule.holidays
+            cal = self._calendar = HolidayCalendar(
+                cfg.standard, cfg.custom, first, last, cfg.observe_nearest_weekday
+            )
+        return cal
+
+    def is_holiday(self, d: date) -> bool:
+        """Whether a date is a holiday (same rules as ``TOUSchedule.is_holiday``)."""
+        return d in self.calendar(d.year)
+
+    def holidays(self, year: int) -> frozenset[date]:
+        """The holidays that fall in a year (those ``is_holiday`` matches)."""
+        hol = self._holidays.get(year)
+        if hol is None:
+            hol = frozenset(self.calendar(year).dates(year))
+            self._holidays[year] = hol
+        return hol
+
+    def cached_years(self) -> list[int]:
+        """Years whose tables are built."""
+        return sorted(self._tables)
+
+    def year_table(self, year: int) -> bytes:
+        """Return the tier-index table for a calendar year (built once)."""
+        table = self._tables.get(year)
+        if table is None:
+            table = self._build_year(year)
+            self._tables[year] = table
+        return table
+
+    def _month_seasons(self) -> dict[int, int | None]:
+        """Month → season index (resolved once by the schedule)."""
+        by_month = self.schedule._season_by_month
+        return {m: by_month[m - 1] if by_month else None for m in range(1, 13)}
+
+    def _row_builder(self, year: int):
+        """Return a date → 24-slot row function for one year."""
+        rows = self._day_rows()
+        holiday_row = bytes([self.index[self.schedule.holidays.rate_tier]]) * SLOTS_PER_DAY
+        no_season_row = bytes([self.index[_first_tier(self.schedule)]]) * SLOTS_PER_DAY
+        month_season = self._month_seasons()
+        holidays = self.holidays(year)  # the calendar's slice for the year
+
+        def row(d: date) -> bytes:
+            if d in holidays:
+                return holiday_row
+            si = month_season[d.month]
+            return no_season_row if si is None else rows[(si, d.weekday())]
+
+        return row
+
+    def _build_year(self, year: int) -> bytes:
+        """Resolve every slot of a year into a tier index."""
+        row = self._row_builder(year)
+        start = date(year, 1, 1).toordinal()
+        end = date(year + 1, 1, 1).toordinal()
+        return b"".join(row(date.fromordinal(o)) for o in range(start, end))
+
+    # ── Partial rebuilds ───────────────────────────────────
+
+    def rebase(self, schedule: TOUSchedule, changes: set[str]) -> CompiledSchedule:
+        """Compile an edited schedule, reusing whatever the edit left valid.
+
+        ``changes`` names what changed: ``"rates"`` (tier rates or adders —
+        tables are shared as-is), ``"holidays"`` (only holiday days are
+        rewritten), ``"season:<i>"`` (only days of season i's months are
+        rewritten) or ``"structure"`` (anything else — nothing is reused).
+        Tables are also dropped if the set of tier IDs changed.
+        """
+        new = CompiledSchedule(schedule)
+        if "structure" in changes or new.tier_ids != self.tier_ids:
+            return new
+        seasons = {int(c.split(":", 1)[1]) for c in changes if c.startswith("season:")}
+        if "holidays" not in changes and not seasons:
+            new._tables = self._tables
+            new._transitions = self._transitions
+            new._holidays = self._holidays
+            new._calendar = self._calendar
+            return new
+
+        holiday_tier_changed = schedule.holidays.rate_tier != self.schedule.holidays.rate_tier
+        month_season = new._month_seasons()
+        months = {m for m, si in month_season.items() if si in seasons}
+        for year, table in self._tables.items():
+            days: set[date] = set()
+            if "holidays" in changes:
+                old, fresh = self.holidays(year), new.holidays(year)
+                days |= old ^ fresh
+                if holiday_tier_changed:
+                    days |= fresh
+            else:
+                new._holidays[year] = self.holidays(year)
+                new._calendar = self._calendar
+            if months:
+                start = date(year, 1, 1).toordinal()
+                end = date(year + 1, 1, 1).toordinal()
+                for o in range(start, end):
+                    d = date.fromordinal(o)
+                    if d.month in months:
+                        days.add(d)
+            row = new._row_builder(year)
+            patched = bytearray(table)
+            jan1 = date(year, 1, 1)
+            for d in days:
+                if d.year == year:
+                    pos = (d - jan1).days * SLOTS_PER_DAY
+                    patched[pos:pos + SLOTS_PER_DAY] = row(d)
+            new._tables[year] = bytes(patched)
+        return new
+
+    def detached(self) -> CompiledSchedule:
+        """A private compile of the same schedule, for use off the event loop.
+
+        Building a year fills the caches of the object it is asked of, and
+        the event loop reads (and ``rebase`` iterates) this one's.  Executor
+        jobs build into the copy instead; years built so far are shared,
+        since the tables themselves are immutable.
+        """
+        new = CompiledSchedule(self.schedule)
+        new._tables = self._tables.copy()
+        new._transitions = self._transitions.copy()
+        new._holidays = self._holidays.copy()
+        new._calendar = self._calendar
+        return new
+
+    def export_year(self, year: int) -> tuple[bytes, array, frozenset[date]]:
+        """Return (table, transitions, holidays) for a year, building them if needed."""
+        return self.year_table(year), self.transitions(year), self.holidays(year)
+
+    def prime_year(
+        self,
+        year: int,
+        table: bytes,
+        transitions: Sequence[int],
+        holidays: frozenset[date],
+    ) -> None:
+        """Install a previously exported year instead of building it."""
+        slots = (date(year + 1, 1, 1) - date(year, 1, 1)).days * SLOTS_PER_DAY
+        if len(table) != slots:
+            raise ValueError(f"Table for {year} has {len(table)} slots, expected {slots}")
+        if table and max(table) >= len(self.tier_ids):
+            raise ValueError(f"Table for {year} references an unknown tier index")
+        self._tables[year] = bytes(table)
+        self._transitions[year] = array("H", transitions)
+        self._holidays[year] = frozenset(holidays)
+
+    # ── Lookups ────────────────────────────────────────────
+
+    def tier_index(self, now: datetime) -> int:
+        """Return the tier index active at a datetime."""
+        year, slot = slot_of(now)
+        return self.year_table(year)[slot]
+
+    def tier_id(self, now: datetime) -> str:
+        """Return the tier ID active at a datetime."""
+        return self.tier_ids[self.tier_index(now)]
+
+    def rate(self, now: datetime) -> float:
+        """Return the effective $/kWh active at a datetime."""
+        return self.rates[self.tier_index(now)]
+
+    def slot_rates(self, year: int, slot: int, count: int) -> list[float]:
+        """Effective rates for ``count`` consecutive slots, crossing year ends."""
+        rates = self.rates
+        out: list[float] = []
+        while len(out) < count:
+            table = self.year_table(year)
+            chunk = table[slot:slot + count - len(out)]
+            out.extend(rates[i] for i in chunk)
+            year, slot = year + 1, 0
+        return out
+
+    def rle_year(self, year: int) -> list[tuple[int, int, int]]:
+        """Run-length encode a year table as (start slot, length, tier index) spans."""
+        table = self.year_table(year)
+        starts = [0, *self.transitions(year)]
+        ends = [*starts[1:], len(table)]
+        return [(start, end - start, table[start]) for start, end in zip(starts, ends)]
+
+    # ── Transition index ───────────────────────────────────
+
+    def transitions(self, year: int) -> array:
+        """Slots within a year whose tier differs from the previous slot.
+
+        Slot 0 is never listed; crossing into a new year is handled by
+        ``next_transition``.  Stored as uint16 (slots < 8784): a list of
+        int objects would be most of an entry's memory (benchmarks/memory.py).
+        """
+        trans = self._transitions.get(year)
+        if trans is None:
+            table = self.year_table(year)
+            trans = array("H", (i for i in range(1, len(table)) if table[i] != table[i - 1]))
+            self._transitions[year] = trans
+        return trans
+
+    def next_transition(self, now: datetime) -> tuple[datetime, int] | None:
+        """Return (start, tier index) of the first slot after ``now`` with a new tier."""
+        year, slot = slot_of(now)
+        table = self.year_table(year)
+        for y in range(year, year + TRANSITION_SEARCH_YEARS + 1):
+            if y != year:
+                nxt = self.year_table(y)
+                if nxt[0] != table[-1]:
+                    return slot_start(y, 0, now.tzinfo), nxt[0]
+                table, slot = nxt, 0
+            trans = self.transitions(y)
+            i = bisect.bisect_right(trans, slot)
+            if i < len(trans):
+                return slot_start(y, trans[i], now.tzinfo), table[trans[i]]
+        return None
+
+    def runs(self, start: datetime, end: datetime) -> list[tuple[datetime, int]]:
+        """Return (start, tier index) runs covering [start, end) from the transition index.
+
+        The first run starts at ``start`` itself; each later run starts at a
+        transition.
+        """
+        runs = [(start, self.tier_index(start))]
+        cursor = start
+        while True:
+            nxt = self.next_transition(cursor)
+            if nxt is None or nxt[0] >= end:
+                return runs
+            runs.append(nxt)
+            cursor = nxt[0]
@@ -0,0 +1,198 @@
+"""Persisted compiled-table cache for Solarseed TOU.
+
+Building a year table walks 365 days through holiday and season lookups;
+with several entries that is measurable at HA startup.  The built tables,
+transition indices and holiday calendars are written to a compact binary
+side file next to the entry's config store:
+
+    header  magic "STOU", format, tier count, config digest (32 bytes), years
+    year    year, slot count, transition count, holiday count
+            table      one byte per slot
+            trans      uint16 per transition slot
+            holidays   int32 day offset from Jan 1 per holiday
+
+All integers are little-endian.  The file is only used when its digest
+matches the canonical config digest (see ``TOUStorage.digest``); otherwise
+the tables are rebuilt in the background and the file is replaced.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import sys
+from array import array
+from datetime import date, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .compiled import CompiledSchedule
+from .const import DOMAIN, STORAGE_KEY
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_MAGIC = b"STOU"
+CACHE_FORMAT = 1
+
+# Years cached from the current one (this year's sensors + the year-end lookahead)
+CACHE_YEARS = 2
+
+_HEADER = struct.Struct("<4sHH32sH")
+_YEAR = struct.Struct("<HHHH")
+
+YearParts = tuple[bytes, array, frozenset[date]]
+
+
+def _le(arr: array) -> bytes:
+    """Serialize an array little-endian regardless of host byte order."""
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, raw: bytes) -> array:
+    """Inverse of ``_le``."""
+    arr = array(typecode)
+    arr.frombytes(raw)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def encode_cache(compiled: CompiledSchedule, digest: str, years: range) -> bytes:
+    """Export the given years of a compiled schedule to the cache format."""
+    parts = [_HEADER.pack(
+        CACHE_MAGIC, CACHE_FORMAT, len(compiled.tier_ids), bytes.fromhex(digest), len(years)
+    )]
+    for year in years:
+        table, trans, holidays = compiled.export_year(year)
+        jan1 = date(year, 1, 1)
+        offsets = sorted((d - jan1).days for d in holidays)
+        parts.append(_YEAR.pack(year, len(table), len(trans), len(offsets)))
+        parts.append(table)
+        parts.append(_le(array("H", trans)))
+        parts.append(_le(array("i", offsets)))
+    return b"".join(parts)
+
+
+def decode_cache(blob: bytes, digest: str, tier_count: int) -> dict[int, YearParts] | None:
+    """Parse a cache blob; None if it is corrupt or for a different config."""
+    try:
+        magic, fmt, tiers, stored_digest, count = _HEADER.unpack_from(blob, 0)
+        if (
+            magic != CACHE_MAGIC
+            or fmt != CACHE_FORMAT
+            or tiers != tier_count
+            or stored_digest != bytes.fromhex(digest)
+        ):
+            return None
+        pos = _HEADER.size
+        years: dict[int, YearParts] = {}
+        for _ in range(count):
+            year, slots, n_trans, n_hol = _YEAR.unpack_from(blob, pos)
+            pos += _YEAR.size
+            table = blob[pos:pos + slots]
+            pos += slots
+            trans = _from_le("H", blob[pos:pos + 2 * n_trans])
+            pos += 2 * n_trans
+            offsets = _from_le("i", blob[pos:pos + 4 * n_hol])
+            pos += 4 * n_hol
+            if len(table) != slots or len(trans) != n_trans or len(offsets) != n_hol:
+                return None
+            jan1 = date(year, 1, 1)
+            years[year] = (table, trans, frozenset(jan1 + timedelta(days=o) for o in offsets))
+        return years
+    except (struct.error, ValueError):
+        return None
+
+
+class CompiledCache:
+    """Binary side-store of one entry's compiled tables."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache for a config entry."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._path = hass.config.path(".storage", f"{STORAGE_KEY}.{entry_id}.compiled")
+        self._latest: str | None = None  # digest of the newest schedule seen
+
+    async def async_prime(self, compiled: CompiledSchedule, digest: str) -> bool:
+        """Load cached tables into ``compiled``; rebuild in the background on a miss."""
+        self._latest = digest
+        years = self._years()
+        cached = await self._hass.async_add_executor_job(
+            self._read, digest, len(compiled.tier_ids)
+        )
+        if cached is not None and all(y in cached for y in years):
+            try:
+                for year, parts in cached.items():
+                    compiled.prime_year(year, *parts)
+            except ValueError as err:
+                _LOGGER.debug("Solarseed TOU: ignoring compiled cache: %s", err)
+            else:
+                return True
+        self.async_schedule_rebuild(compiled, digest)
+        return False
+
+    @callback
+    def async_schedule_rebuild(self, compiled: CompiledSchedule, digest: str) -> None:
+        """Build the tables off the event loop and persist them."""
+        self._latest = digest
+        self._hass.async_create_background_task(
+            self._async_rebuild(compiled, digest),
+            f"{DOMAIN} compile {self._entry_id}",
+        )
+
+    async def _async_rebuild(self, compiled: CompiledSchedule, digest: str) -> None:
+        """Build and encode in the executor; skip the write if a newer config arrived.
+
+        The executor builds into a private copy, and the built years are
+        primed into ``compiled`` back on the event loop.
+        """
+        years = self._years()
+        private = compiled.detached()
+        blob = await self._hass.async_add_executor_job(encode_cache, private, digest, years)
+        built = set(compiled.cached_years())
+        for year in years:
+            if year not in built:
+                compiled.prime_year(year, *private.export_year(year))
+        if digest == self._latest:
+            await self._hass.async_add_executor_job(self._write, blob)
+
+    async def async_remove(self) -> None:
+        """Delete the cache file."""
+        await self._hass.async_add_executor_job(self._remove)
+
+    @staticmethod
+    def _years() -> range:
+        """Years to cache, starting with the current one."""
+        year = dt_util.now().year
+        return range(year, year + CACHE_YEARS)
+
+    def _read(self, digest: str, tier_count: int) -> dict[int, YearParts] | None:
+        """Read and decode the cache file (executor)."""
+        try:
+            with open(self._path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        return decode_cache(blob, digest, tier_count)
+
+    def _write(self, blob: bytes) -> None:
+        """Atomically replace the cache file (executor)."""
+        tmp = f"{self._path}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._path)
+        except OSError as err:
+            _LOGGER.warning("Solarseed TOU: could not write compiled cache: %s", err)
+
+    def _remove(self) -> None:
+        """Delete the cache file if present (executor)."""
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
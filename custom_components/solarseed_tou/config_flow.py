@@ -1,26 +1,87 @@
-"""Config flow for Solarseed TOU Energy Metering."""
+"""Config flow for Solarseed TOU Energy Metering.
+
+Selectors are imported when a form is first shown and the YAML stack
+(rate_yaml, PyYAML) inside the executor job that parses a paste, so loading
+the flow stays cheap.
+"""
 from __future__ import annotations
 
 import logging
 from typing import Any
 
 import voluptuous as vol
-import yaml
 
 from homeassistant import config_entries
-from homeassistant.helpers import selector
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-
-from .const import DOMAIN, CONF_ENERGY_SENSOR
-from .schedule import TOUSchedule
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_CHECKPOINT_INTERVAL,
+    CONF_ENERGY_SENSOR,
+    DEFAULT_CHECKPOINT_INTERVAL,
+    MAX_CHECKPOINT_INTERVAL,
+    MIN_CHECKPOINT_INTERVAL,
+)
+from . import async_apply_rate_history
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _parse_rate_yaml(text: str, energy_sensor: str, year: int):
+    """Import the YAML stack and parse a paste (executor)."""
+    from .rate_yaml import parse_rate_yaml
+
+    return parse_rate_yaml(text, energy_sensor, year)
+
+
+def _user_schema() -> vol.Schema:
+    """Form schema of the initial step."""
+    from homeassistant.helpers import selector
+
+    return vol.Schema({
+        vol.Required(CONF_ENERGY_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor",
+            ),
+        ),
+    })
+
+
+def _options_schema(current_sensor: str, current_interval: int) -> vol.Schema:
+    """Form schema of the options step."""
+    from homeassistant.helpers import selector
+
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_ENERGY_SENSOR, default=current_sensor
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                ),
+            ),
+            vol.Optional("yaml_config", default=""): selector.TextSelector(
+                selector.TextSelectorConfig(multiline=True),
+            ),
+            vol.Optional(
+                CONF_CHECKPOINT_INTERVAL, default=current_interval
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_CHECKPOINT_INTERVAL,
+                    max=MAX_CHECKPOINT_INTERVAL,
+                    step=10,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+        }
+    )
+
+
 class SolarseedTOUConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Solarseed TOU."""
 
-    VERSION = 1
+    VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -50,13 +111,7 @@ class SolarseedTOUConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_ENERGY_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(
-                        domain="sensor",
-                    ),
-                ),
-            }),
+            data_schema=_user_schema(),
             errors=errors,
             description_placeholders={
                 "docs_url": "https://johnnysolarseed.org/tou",
@@ -81,6 +136,9 @@ class SolarseedTOUOptionsFlow(config_entries.OptionsFlow):
         errors: dict[str, str] = {}
 
         current_sensor = self.config_entry.data.get(CONF_ENERGY_SENSOR, "")
+        current_interval = self.config_entry.options.get(
+            CONF_CHECKPOINT_INTERVAL, DEFAULT_CHECKPOINT_INTERVAL
+        )
 
         if user_input is not None:
             new_sensor = user_input.get(CONF_ENERGY_SENSOR, current_sensor).strip()
@@ -110,61 +168,39 @@ class SolarseedTOUOptionsFlow(config_entries.OptionsFlow):
                         stored["energy_sensor"] = new_sensor
                         await storage.async_save(stored)
 
-                # Handle YAML import if provided
+                # Handle YAML import if provided — parsing, validation and
+                # compilation run in the executor
                 if yaml_text:
+                    effective_sensor = new_sensor if sensor_changed else current_sensor
                     try:
-                        parsed = yaml.safe_load(yaml_text)
-                    except yaml.YAMLError:
-                        errors["yaml_config"] = "invalid_yaml"
+                        parsed, history = await self.hass.async_add_executor_job(
+                            _parse_rate_yaml, yaml_text, effective_sensor, dt_util.now().year
+                        )
+                    except ValueError as err:  # RateConfigError
+                        errors["yaml_config"] = getattr(err, "reason", "invalid_config")
                     else:
-                        if isinstance(parsed, dict) and "tou_metering" in parsed:
-                            parsed = parsed["tou_metering"]
-
-                        if not isinstance(parsed, dict):
-                            errors["yaml_config"] = "invalid_yaml"
-                        else:
-                            try:
-                                effective_sensor = new_sensor if sensor_changed else current_sensor
-                                parsed["energy_sensor"] = effective_sensor
-                                schedule = TOUSchedule.from_dict(parsed)
-
-                                entry_data = self.hass.data[DOMAIN].get(
-                                    self.config_entry.entry_id
-                                )
-                                if entry_data:
-                                    storage = entry_data["storage"]
-                                    await storage.async_save(parsed)
-                                    entry_data["schedule"] = schedule
-
-                                    # Notify sensors to pick up new schedule
-                                    async_dispatcher_send(
-                                        self.hass,
-                                        f"{DOMAIN}_config_updated",
-                                        schedule,
-                                    )
-
-                            except Exception:  # noqa: BLE001
-                                errors["yaml_config"] = "invalid_config"
+                        entry_data = self.hass.data[DOMAIN].get(
+                            self.config_entry.entry_id
+                        )
+                        if entry_data:
+                            await entry_data["storage"].async_save(parsed)
+                            # Switches to the version in effect now and
+                            # notifies the sensors
+                            async_apply_rate_history(self.hass, entry_data, history)
 
                 if not errors:
-                    return self.async_create_entry(title="", data={})
+                    return self.async_create_entry(
+                        title="",
+                        data={
+                            CONF_CHECKPOINT_INTERVAL: int(
+                                user_input.get(CONF_CHECKPOINT_INTERVAL, current_interval)
+                            ),
+                        },
+                    )
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        CONF_ENERGY_SENSOR, default=current_sensor
-                    ): selector.EntitySelector(
-                        selector.EntitySelectorConfig(
-                            domain="sensor",
-                        ),
-                    ),
-                    vol.Optional("yaml_config", default=""): selector.TextSelector(
-                        selector.TextSelectorConfig(multiline=True),
-                    ),
-                }
-            ),
+            data_schema=_options_schema(current_sensor, current_interval),
             errors=errors,
             description_placeholders={
                 "calculator_url": "https://johnnysolarseed.org/tou-calculator",
@@ -4,9 +4,19 @@ DOMAIN = "solarseed_tou"
 VERSION = "0.7.0"
 CONF_ENERGY_SENSOR = "energy_sensor"
 
+# Dispatcher signal carrying an entry's new TOUSchedule — format with entry_id
+SIGNAL_CONFIG_UPDATED = f"{DOMAIN}_config_updated_{{}}"
+
 # Storage
-STORAGE_KEY = f"{DOMAIN}_config"
+STORAGE_KEY = f"{DOMAIN}_config"  # per entry: f"{STORAGE_KEY}.{entry_id}"
 STORAGE_VERSION = 2  # v2: added formula fields (regulatory, passthrough, programs, tax, fixed)
+STORAGE_SAVE_DELAY = 10  # seconds — coalesce bursts of config writes into one
+
+# Accumulator checkpoints (options flow)
+CONF_CHECKPOINT_INTERVAL = "checkpoint_interval"
+DEFAULT_CHECKPOINT_INTERVAL = 60  # seconds
+MIN_CHECKPOINT_INTERVAL = 10
+MAX_CHECKPOINT_INTERVAL = 900
 
 # Defaults — PGE Schedule 7 example values (Oregon Residential TOU)
 DEFAULT_TIERS = {
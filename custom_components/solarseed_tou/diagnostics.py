@@ -0,0 +1,103 @@
+"""Config-entry diagnostics for Solarseed TOU.
+
+The download answers "why is my cost wrong?" in one file: the config and
+rate version in effect, each tier's effective rate, the tier transitions
+of the coming week, the holiday calendar, every accumulator's internals
+and the entry's sample counters and latency histograms (see stats.py).
+
+Everything is read from structures the entry already keeps: the compiled
+schedule's vectors, transition index and holiday cache, the accumulators'
+checkpoint snapshots and the stats.  Only the week of transitions is
+walked, through the transition index.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import get_entry_data
+from .compiled import CompiledSchedule
+
+# Source entity IDs identify the user's hardware; the entry title embeds one
+TO_REDACT = {"energy_sensor", "title"}
+
+# How far ahead tier transitions are listed
+TRANSITION_WINDOW = timedelta(days=7)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry (source entity IDs redacted)."""
+    return build_diagnostics(entry, get_entry_data(hass, entry.entry_id))
+
+
+def build_diagnostics(
+    entry: ConfigEntry, entry_data: dict[str, Any], *, redact: bool = True
+) -> dict[str, Any]:
+    """Assemble the diagnostics dump; ``redact=False`` keeps the source entity IDs."""
+    now = dt_util.now()
+    history = entry_data["history"]
+    schedule = entry_data["schedule"]
+    compiled = schedule.compiled
+    hub = entry_data.get("hub")
+    stats = entry_data.get("stats")
+    checkpoint = entry_data.get("checkpoint")
+
+    data = {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "config": history.config_at(now),
+        "config_digest": entry_data["storage"].digest,
+        "rate_versions": {
+            "count": len(history),
+            "active": history.index_at(now),
+            "starts": [start.isoformat() for start in history.starts],
+        },
+        "validation": [d.as_dict() for d in history.diagnostics],
+        "tiers": _tiers(compiled),
+        "transitions": _transitions(compiled, now),
+        "holidays": {
+            str(year): sorted(d.isoformat() for d in compiled.holidays(year))
+            for year in compiled.cached_years()
+        },
+        "compiled_years": compiled.cached_years(),
+        "accumulators": checkpoint.snapshot() if checkpoint else {},
+        "stats": stats.as_dict() if stats else None,
+        "subscribers": hub.subscriber_count if hub else 0,
+    }
+    return async_redact_data(data, TO_REDACT) if redact else data
+
+
+def _tiers(compiled: CompiledSchedule) -> list[dict[str, Any]]:
+    """Each tier's base and effective rate (from the compiled rate vector)."""
+    tiers = compiled.schedule.tiers
+    return [
+        {
+            "id": tier_id,
+            "name": tiers[tier_id].name if tier_id in tiers else None,
+            "base_rate": tiers[tier_id].rate if tier_id in tiers else None,
+            "effective_rate": round(rate, 6),
+        }
+        for tier_id, rate in zip(compiled.tier_ids, compiled.rates)
+    ]
+
+
+def _transitions(compiled: CompiledSchedule, now: datetime) -> list[dict[str, Any]]:
+    """Tier runs from now to the end of TRANSITION_WINDOW."""
+    return [
+        {
+            "at": start.isoformat(),
+            "tier_id": compiled.tier_ids[idx],
+            "effective_rate": round(compiled.rates[idx], 6),
+        }
+        for start, idx in compiled.runs(now, now + TRANSITION_WINDOW)
+    ]
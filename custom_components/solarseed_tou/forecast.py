@@ -0,0 +1,174 @@
+"""Cost forecasting for Solarseed TOU.
+
+Projects end-of-day and end-of-cycle cost as
+
+    projected = accumulated + Σ expected_kwh(weekday, slot) × rate(slot)
+
+over the slots that remain.  Expected usage comes from a LoadProfile — an
+exponentially weighted kWh figure per (weekday, hourly slot) learned from
+the same samples the accumulators price.  Rates come from the compiled
+tier table, so holidays and seasons are already folded in.
+
+Everything is incremental so it stays cheap at 1 Hz sampling:
+
+- A sample only adds to the current slot's bucket (O(1)).
+- When the slot rolls over, the bucket is folded into the profile (O(1)).
+- The remaining-today sum is a suffix array rebuilt once per day (24 ops).
+- The remaining-days sum to a period end is rebuilt once per day.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .compiled import SLOTS_PER_DAY, CompiledSchedule, slot_of
+
+# Weight of the newest observation for a (weekday, slot) cell.  At 0.3 a
+# weekly cell is ~90% adapted to a new usage level after six weeks.
+PROFILE_ALPHA = 0.3
+
+# Slots with no samples between two samples are learned as 0 kWh (an energy
+# meter that does not tick used nothing) — but only across short gaps;
+# anything longer is treated as an outage and left unlearned.
+MAX_IDLE_FILL_SLOTS = 6
+
+
+class LoadProfile:
+    """Exponentially weighted kWh per (weekday, slot), stored as a flat array."""
+
+    def __init__(self, alpha: float = PROFILE_ALPHA) -> None:
+        """Initialize an empty (unlearned) profile."""
+        self.alpha = alpha
+        self.values: list[float] = [0.0] * (7 * SLOTS_PER_DAY)
+        self.seen = bytearray(7 * SLOTS_PER_DAY)
+
+    def update(self, weekday: int, slot: int, kwh: float) -> None:
+        """Fold one slot's observed kWh into the profile."""
+        i = weekday * SLOTS_PER_DAY + slot
+        if self.seen[i]:
+            self.values[i] += self.alpha * (kwh - self.values[i])
+        else:
+            self.values[i] = kwh
+            self.seen[i] = 1
+
+    def expected(self, weekday: int, slot: int) -> float:
+        """Expected kWh for a (weekday, slot) cell (0.0 until learned)."""
+        return self.values[weekday * SLOTS_PER_DAY + slot]
+
+
+class CostForecaster:
+    """Incremental expected-cost projection over a LoadProfile."""
+
+    def __init__(self, compiled: CompiledSchedule, profile: LoadProfile | None = None) -> None:
+        """Initialize with the compiled schedule used for future rates."""
+        self.profile = profile or LoadProfile()
+        self._compiled = compiled
+        self._slot_key: tuple[int, int] | None = None  # (ordinal, hour) of bucket
+        self._bucket = 0.0
+        self._day: int | None = None  # ordinal the suffix was built for
+        self._suffix: list[float] = [0.0] * (SLOTS_PER_DAY + 1)
+        self._tail_key: tuple[int, int] | None = None
+        self._tail = 0.0
+
+    def set_schedule(self, compiled: CompiledSchedule) -> None:
+        """Switch to new rates (config update); keeps the learned profile."""
+        self._compiled = compiled
+        self._day = None
+        self._tail_key = None
+
+    # ── Learning ───────────────────────────────────────────
+
+    def add(self, now: datetime, kwh: float) -> None:
+        """Record kWh consumed at ``now``."""
+        key = (now.toordinal(), now.hour)
+        if key != self._slot_key:
+            self._roll(key)
+        self._bucket += kwh
+
+    def _roll(self, key: tuple[int, int]) -> None:
+        """Close the current slot bucket and start a new one."""
+        prev = self._slot_key
+        if prev is not None:
+            self.profile.update(date.fromordinal(prev[0]).weekday(), prev[1], self._bucket)
+            gap = (key[0] - prev[0]) * SLOTS_PER_DAY + key[1] - prev[1] - 1
+            if 0 < gap <= MAX_IDLE_FILL_SLOTS:
+                ordinal, hour = prev
+                for _ in range(gap):
+                    hour += 1
+                    if hour == SLOTS_PER_DAY:
+                        ordinal, hour = ordinal + 1, 0
+                    self.profile.update(date.fromordinal(ordinal).weekday(), hour, 0.0)
+        self._slot_key = key
+        self._bucket = 0.0
+
+    def export_state(self) -> dict[str, Any]:
+        """Profile arrays and the open slot bucket, for checkpoints."""
+        return {
+            "values": list(self.profile.values),
+            "seen": self.profile.seen.hex(),
+            "slot": list(self._slot_key) if self._slot_key else None,
+            "bucket": self._bucket,
+        }
+
+    def import_state(self, state: dict[str, Any]) -> None:
+        """Resume from ``export_state`` output; malformed parts are ignored."""
+        values = state.get("values")
+        seen = state.get("seen")
+        size = 7 * SLOTS_PER_DAY
+        try:
+            if isinstance(values, list) and len(values) == size and isinstance(seen, str):
+                seen_bytes = bytearray.fromhex(seen)
+                if len(seen_bytes) == size:
+                    self.profile.values = [float(v) for v in values]
+                    self.profile.seen = seen_bytes
+            slot = state.get("slot")
+            if slot:
+                self._slot_key = (int(slot[0]), int(slot[1]))
+                self._bucket = float(state.get("bucket", 0.0))
+        except (TypeError, ValueError):
+            return
+        self._day = None
+        self._tail_key = None
+
+    # ── Projection ─────────────────────────────────────────
+
+    def _day_cost(self, d: date) -> list[float]:
+        """Suffix sums of expected cost for a day: out[s] = cost of slots ≥ s."""
+        compiled = self._compiled
+        year, first = slot_of(datetime.combine(d, datetime.min.time()))
+        table = compiled.year_table(year)
+        rates = compiled.rates
+        profile = self.profile.values
+        base = d.weekday() * SLOTS_PER_DAY
+        out = [0.0] * (SLOTS_PER_DAY + 1)
+        for s in range(SLOTS_PER_DAY - 1, -1, -1):
+            out[s] = out[s + 1] + profile[base + s] * rates[table[first + s]]
+        return out
+
+    def remaining_today(self, now: datetime) -> float:
+        """Expected cost from ``now`` until midnight."""
+        ordinal = now.toordinal()
+        if self._day != ordinal:
+            self._suffix = self._day_cost(now.date())
+            self._day = ordinal
+        hour = now.hour
+        expected = self.profile.expected(now.weekday(), hour)
+        used = self._bucket if self._slot_key == (ordinal, hour) else 0.0
+        current = max(expected - used, 0.0) * self._compiled.rate(now)
+        return current + self._suffix[hour + 1]
+
+    def remaining_until(self, now: datetime, end: date) -> float:
+        """Expected cost from ``now`` until the start of ``end`` (exclusive)."""
+        today = now.date()
+        if end <= today:
+            return 0.0
+        key = (today.toordinal(), end.toordinal())
+        if self._tail_key != key:
+            tail = 0.0
+            d = today + timedelta(days=1)
+            while d < end:
+                tail += self._day_cost(d)[0]
+                d += timedelta(days=1)
+            self._tail = tail
+            self._tail_key = key
+        return self.remaining_today(now) + self._tail
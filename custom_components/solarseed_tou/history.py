@@ -0,0 +1,262 @@
+"""Dated rate history for Solarseed TOU.
+
+Utilities change rates on arbitrary dates, often mid billing cycle.  A
+config may carry a ``rate_history`` list of later versions, each an
+``effective_from`` date (or whole-hour local datetime) plus the top-level
+keys that changed on that date:
+
+    rate_history:
+      - effective_from: "2026-03-15"
+        tiers: {...}
+      - effective_from: "2026-07-01"
+        regulatory_per_kwh: 0.0061
+
+Each version is the previous one with those keys replaced; the top-level
+config applies before the first date.  Every version is parsed into its own
+TOUSchedule, lookups pick the version by bisect on the timestamp, and
+intervals are split at version boundaries so backfills, simulations and
+repricing use the rates that were actually in effect.
+"""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from typing import Any
+
+from .compiled import SLOTS_PER_DAY, slot_of
+from .schedule import Diagnostic, ScheduleValidationError, TOUSchedule
+
+HISTORY_KEY = "rate_history"
+
+
+def parse_effective_from(value: Any) -> datetime:
+    """Parse an ``effective_from`` value into a naive local wall-clock datetime.
+
+    Versions start on whole hours so that every hourly slot has exactly one
+    version.  Raises ValueError.
+    """
+    if isinstance(value, datetime):
+        when = value
+    elif isinstance(value, date):
+        when = datetime.combine(value, time())
+    elif isinstance(value, str):
+        when = datetime.fromisoformat(value)
+    else:
+        raise ValueError(f"expected a date or datetime, got {value!r}")
+    when = when.replace(tzinfo=None)
+    if when.minute or when.second or when.microsecond:
+        raise ValueError(f"must start on a whole hour, got {value!r}")
+    return when
+
+
+def _wall(when: datetime) -> datetime:
+    """Local wall-clock time of a datetime (matches ``slot_of``)."""
+    return when.replace(tzinfo=None)
+
+
+class RateHistory:
+    """Ordered (effective_from, schedule) versions of one entry's rates.
+
+    ``schedules[0]`` applies before ``starts[0]``, ``schedules[i]`` from
+    ``starts[i - 1]`` on.  ``configs`` holds the full config of each version.
+    """
+
+    def __init__(
+        self,
+        schedules: Sequence[TOUSchedule],
+        starts: Sequence[datetime] = (),
+        configs: Sequence[dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize from parsed versions (starts sorted, one fewer than schedules)."""
+        if len(starts) != len(schedules) - 1:
+            raise ValueError("need exactly one start per version after the first")
+        self.schedules = list(schedules)
+        self.starts = [_wall(s) for s in starts]
+        self.configs = list(configs) if configs is not None else [{} for _ in schedules]
+        # Validation warnings (see from_config); defaults to the first version's
+        self.diagnostics: list[Diagnostic] = list(self.schedules[0].diagnostics)
+        # Derived results valid for the lifetime of this history (a config
+        # change builds a new one)
+        self.memo: dict[Any, Any] = {}
+
+    @classmethod
+    def single(cls, schedule: TOUSchedule, config: dict[str, Any] | None = None) -> RateHistory:
+        """A history with one version that is always in effect."""
+        return cls([schedule], (), [config if config is not None else schedule.to_dict()])
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RateHistory:
+        """Parse a config and its ``rate_history`` versions.
+
+        Raises ScheduleValidationError listing the problems of every version;
+        paths of later versions are prefixed with ``rate_history.<n>``.
+        """
+        diags: list[Diagnostic] = []
+        entries: list[tuple[datetime, int, dict[str, Any]]] = []
+        raw = config.get(HISTORY_KEY) or []
+        if not isinstance(raw, list):
+            raise ScheduleValidationError([
+                Diagnostic("error", HISTORY_KEY, "must be a list of versions")
+            ])
+        for i, entry in enumerate(raw):
+            path = f"{HISTORY_KEY}.{i}"
+            if not isinstance(entry, dict):
+                diags.append(Diagnostic("error", path, "version must be a mapping"))
+                continue
+            try:
+                start = parse_effective_from(entry.get("effective_from"))
+            except ValueError as err:
+                diags.append(Diagnostic("error", f"{path}.effective_from", str(err)))
+                continue
+            entries.append((start, i, entry))
+        entries.sort(key=lambda e: e[0])
+        for (prev, _, _), (start, i, _) in zip(entries, entries[1:]):
+            if start == prev:
+                diags.append(Diagnostic(
+                    "error", f"{HISTORY_KEY}.{i}.effective_from",
+                    f"two versions start at {start.isoformat()}",
+                ))
+
+        configs = [{k: v for k, v in config.items() if k != HISTORY_KEY}]
+        for _, _, entry in entries:
+            changed = {k: v for k, v in entry.items() if k != "effective_from"}
+            configs.append({**configs[-1], **changed})
+
+        schedules: list[TOUSchedule] = []
+        prefixes = [""] + [f"{HISTORY_KEY}.{i}." for _, i, _ in entries]
+        for version, (prefix, cfg) in enumerate(zip(prefixes, configs)):
+            try:
+                schedule = TOUSchedule.from_dict(cfg)
+            except ScheduleValidationError as err:
+                found = err.diagnostics
+                schedule = None
+            else:
+                found = schedule.diagnostics
+            if version:
+                # Findings in inherited sections were already reported once
+                own = entries[version - 1][2]
+                found = [d for d in found if d.path.split(".", 1)[0] in own]
+            diags.extend(
+                Diagnostic(d.severity, prefix + d.path, d.message) for d in found
+            )
+            if schedule is not None:
+                schedules.append(schedule)
+
+        if any(d.severity == "error" for d in diags):
+            raise ScheduleValidationError(diags)
+        history = cls(schedules, [start for start, _, _ in entries], configs)
+        history.diagnostics = diags
+        return history
+
+    def __len__(self) -> int:
+        """Number of versions."""
+        return len(self.schedules)
+
+    # ── Lookups ────────────────────────────────────────────
+
+    def index_at(self, when: datetime) -> int:
+        """Index of the version in effect at a datetime."""
+        return bisect.bisect_right(self.starts, _wall(when))
+
+    def schedule_at(self, when: datetime) -> TOUSchedule:
+        """Schedule in effect at a datetime."""
+        return self.schedules[self.index_at(when)]
+
+    def config_at(self, when: datetime) -> dict[str, Any]:
+        """Full config of the version in effect at a datetime."""
+        return self.configs[self.index_at(when)]
+
+    def next_change(self, when: datetime) -> datetime | None:
+        """Start of the first version after ``when`` (in ``when``'s timezone)."""
+        i = self.index_at(when)
+        if i >= len(self.starts):
+            return None
+        return self.starts[i].replace(tzinfo=when.tzinfo)
+
+    # ── Interval splitting ─────────────────────────────────
+
+    def split(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, datetime, TOUSchedule]]:
+        """Split [start, end) into (start, end, schedule) pieces at version boundaries."""
+        pieces = []
+        i = self.index_at(start)
+        cursor = start
+        while i < len(self.starts):
+            boundary = self.starts[i].replace(tzinfo=start.tzinfo)
+            if boundary >= end:
+                break
+            pieces.append((cursor, boundary, self.schedules[i]))
+            cursor = boundary
+            i += 1
+        pieces.append((cursor, end, self.schedules[i]))
+        return pieces
+
+    def cost(self, start: datetime, end: datetime, kwh: float) -> float:
+        """Price kWh consumed evenly over [start, end).
+
+        The interval is split at version boundaries and, within each
+        version, at tier transitions.  An empty interval is priced at
+        ``start``.
+        """
+        total = (end - start).total_seconds()
+        if total <= 0:
+            return kwh * self.schedule_at(start).compiled.rate(start)
+        cost = 0.0
+        for piece_start, piece_end, schedule in self.split(start, end):
+            compiled = schedule.compiled
+            runs = compiled.runs(piece_start, piece_end)
+            bounds = [run_start for run_start, _ in runs[1:]] + [piece_end]
+            for (run_start, idx), run_end in zip(runs, bounds):
+                share = (run_end - run_start).total_seconds() / total
+                cost += kwh * share * compiled.rates[idx]
+        return cost
+
+    # ── Export ─────────────────────────────────────────────
+
+    def rate_table(self, year: int) -> dict[str, Any]:
+        """A calendar year as run-length-encoded spans over a tier table.
+
+        ``spans`` are ``[start slot, length, tier]`` with hourly slots from
+        Jan 1 00:00; ``tier`` indexes ``tiers``, which has one entry per
+        distinct (tier ID, effective rate) across the versions in the year.
+        Runs in the executor, so tables are built on detached compiles.
+        """
+        tiers: list[dict[str, Any]] = []
+        tier_index: dict[tuple[str, float], int] = {}
+        spans: list[list[int]] = []
+        year_start, year_end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        for piece_start, piece_end, schedule in self.split(year_start, year_end):
+            compiled = schedule.compiled.detached()
+            lo = slot_of(piece_start)[1]
+            hi = (
+                len(compiled.year_table(year)) if piece_end == year_end
+                else slot_of(piece_end)[1]
+            )
+            for start, length, idx in compiled.rle_year(year):
+                first, last = max(start, lo), min(start + length, hi)
+                if first >= last:
+                    continue
+                tier_id, rate = compiled.tier_ids[idx], round(compiled.rates[idx], 6)
+                key = (tier_id, rate)
+                if key not in tier_index:
+                    tier = schedule.tiers.get(tier_id)
+                    tier_index[key] = len(tiers)
+                    tiers.append({
+                        "id": tier_id,
+                        "name": tier.name if tier else tier_id,
+                        "color": tier.color if tier else None,
+                        "effective_rate": rate,
+                    })
+                ti = tier_index[key]
+                if spans and spans[-1][2] == ti and spans[-1][0] + spans[-1][1] == first:
+                    spans[-1][1] += last - first
+                else:
+                    spans.append([first, last - first, ti])
+        return {
+            "year": year,
+            "slots_per_day": SLOTS_PER_DAY,
+            "tiers": tiers,
+            "spans": spans,
+        }
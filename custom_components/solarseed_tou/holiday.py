@@ -1,4 +1,25 @@
-"""Holiday pattern resolution for Solarseed TOU."""
+"""Holiday pattern resolution for Solarseed TOU.
+
+Rule types:
+
+    fixed    month + day
+    nth      nth weekday of a month (n = 1..4)
+    last     last weekday of a month
+    offset   ``days`` after (or before, if negative) a ``base`` holiday —
+             a standard holiday ID or a rule; e.g. the day after Thanksgiving
+    easter   ``days`` after (or before) Western Easter Sunday; e.g. Good Friday
+
+Any rule may carry an ``observe`` policy (see OBSERVE_POLICIES) for its own
+weekend shifting; rules without one follow ``observe_nearest_weekday``.
+
+``resolve_holidays_for_year`` resolves one year at a time.  HolidayCalendar
+resolves a whole range of years in one pass into a sorted day-ordinal
+array with bisect membership; the compiled schedule uses it.
+"""
+from array import array
+import bisect
+from collections.abc import Callable
+from itertools import accumulate
 from datetime import date, timedelta
 import calendar
 
@@ -38,8 +59,52 @@ def observe_nearest_weekday(d: date) -> date:
     return d
 
 
+def observe_saturday_to_friday(d: date) -> date:
+    """If date falls on Sat, observe Fri; Sundays stay."""
+    return d - timedelta(days=1) if d.weekday() == 5 else d
+
+
+def observe_sunday_to_monday(d: date) -> date:
+    """If date falls on Sun, observe Mon; Saturdays stay."""
+    return d + timedelta(days=1) if d.weekday() == 6 else d
+
+
+def observe_next_monday(d: date) -> date:
+    """If date falls on Sat or Sun, observe the following Mon."""
+    return d + timedelta(days=7 - d.weekday()) if d.weekday() >= 5 else d
+
+
+def _observe_none(d: date) -> date:
+    return d
+
+
+# Per-rule ``observe`` values
+OBSERVE_POLICIES: dict[str, Callable[[date], date]] = {
+    "nearest": observe_nearest_weekday,
+    "sat_to_fri": observe_saturday_to_friday,
+    "sun_to_mon": observe_sunday_to_monday,
+    "next_monday": observe_next_monday,
+    "none": _observe_none,
+}
+
+
+def easter_sunday(year: int) -> date:
+    """Western (Gregorian) Easter Sunday — the anonymous Gregorian algorithm."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
 def resolve_holiday(rule: dict, year: int) -> date:
-    """Resolve a single holiday rule to a date for the given year."""
+    """Resolve a single holiday rule to a date for the given year (before observing)."""
     rule_type = rule["rule"]
     if rule_type == "fixed":
         return resolve_fixed(year, rule["month"], rule["day"])
@@ -47,9 +112,25 @@ def resolve_holiday(rule: dict, year: int) -> date:
         return resolve_nth_weekday(year, rule["month"], rule["weekday"], rule["n"])
     elif rule_type == "last":
         return resolve_last_weekday(year, rule["month"], rule["weekday"])
+    elif rule_type == "offset":
+        base = rule["base"]
+        base_rule = STANDARD_HOLIDAYS[base] if isinstance(base, str) else base
+        return resolve_holiday(base_rule, year) + timedelta(days=rule["days"])
+    elif rule_type == "easter":
+        return easter_sunday(year) + timedelta(days=rule.get("days", 0))
     raise ValueError(f"Unknown holiday rule type: {rule_type}")
 
 
+def _observed_rules(
+    standard_ids: list[str], custom_rules: list[dict], shift_observed: bool
+) -> list[tuple[dict, str]]:
+    """(rule, observe policy name) for every standard and custom rule."""
+    default = "nearest" if shift_observed else "none"
+    rules = [STANDARD_HOLIDAYS[hid] for hid in standard_ids if hid in STANDARD_HOLIDAYS]
+    rules.extend(custom_rules)
+    return [(rule, rule.get("observe", default)) for rule in rules]
+
+
 def resolve_holidays_for_year(
     standard_ids: list[str],
     custom_rules: list[dict],
@@ -58,25 +139,132 @@ def resolve_holidays_for_year(
 ) -> set[date]:
     """Resolve all holiday patterns to concrete dates for a given year.
 
-    Returns a set of dates that are considered holidays.
+    Returns a set of dates that are considered holidays.  An observed date
+    can fall in a neighbouring year (New Year's Day on a Saturday is
+    observed on Dec 31); it is listed here but, as ``is_holiday`` only
+    consults the set of a date's own year, never matches.
+    """
+    return {
+        OBSERVE_POLICIES[policy](resolve_holiday(rule, year))
+        for rule, policy in _observed_rules(standard_ids, custom_rules, shift_observed)
+    }
+
+
+# ── Range precompute on day ordinals ───────────────────────
+
+# Days before each month (index 1-12; 13 is the year length), common / leap
+_MONTH_STARTS = tuple(
+    tuple(accumulate([0, 0] + [calendar.monthrange(y, m)[1] for m in range(1, 13)]))
+    for y in (2001, 2000)
+)
+
+# Day shift per weekday (Mon..Sun) of each observe policy
+_OBSERVE_SHIFTS = {
+    "nearest": (0, 0, 0, 0, 0, -1, 1),
+    "sat_to_fri": (0, 0, 0, 0, 0, -1, 0),
+    "sun_to_mon": (0, 0, 0, 0, 0, 0, 1),
+    "next_monday": (0, 0, 0, 0, 0, 2, 1),
+    "none": (0,) * 7,
+}
+
+# (year, Jan 1 ordinal, leap) -> day ordinal
+_OrdinalRule = Callable[[int, int, bool], int]
+
+
+def _ordinal_rule(rule: dict) -> _OrdinalRule:
+    """Compile a rule to day-ordinal arithmetic (same results as resolve_holiday)."""
+    kind = rule["rule"]
+    if kind == "fixed":
+        month, day = rule["month"], rule["day"]
+
+        def fixed(year: int, jan1: int, leap: bool) -> int:
+            starts = _MONTH_STARTS[leap]
+            if day > starts[month + 1] - starts[month]:
+                raise ValueError(f"day {day} does not exist in {year}-{month:02d}")
+            return jan1 + starts[month] + day - 1
+
+        return fixed
+    if kind == "nth":
+        month, weekday, n = rule["month"], rule["weekday"], rule["n"]
+
+        def nth(year: int, jan1: int, leap: bool) -> int:
+            first = jan1 + _MONTH_STARTS[leap][month]
+            return first + (weekday - first - 6) % 7 + 7 * (n - 1)
+
+        return nth
+    if kind == "last":
+        month, weekday = rule["month"], rule["weekday"]
+
+        def last(year: int, jan1: int, leap: bool) -> int:
+            end = jan1 + _MONTH_STARTS[leap][month + 1] - 1
+            return end - (end + 6 - weekday) % 7
+
+        return last
+    if kind == "offset":
+        base = rule["base"]
+        resolve = _ordinal_rule(STANDARD_HOLIDAYS[base] if isinstance(base, str) else base)
+        days = rule["days"]
+        return lambda year, jan1, leap: resolve(year, jan1, leap) + days
+    if kind == "easter":
+        days = rule.get("days", 0)
+        return lambda year, jan1, leap: easter_sunday(year).toordinal() + days
+    raise ValueError(f"Unknown holiday rule type: {kind}")
+
+
+class HolidayCalendar:
+    """Holiday dates of a rule set over a range of years, as sorted day ordinals.
+
+    Each rule is compiled once to day-ordinal arithmetic, then resolved for
+    every year in one pass without building dates.  Like ``is_holiday``, a date
+    counts only if a rule of its own year resolves to it, so observed
+    dates shifted into a neighbouring year are left out.
     """
-    holidays: set[date] = set()
-
-    # Standard holidays
-    for hid in standard_ids:
-        rule = STANDARD_HOLIDAYS.get(hid)
-        if rule is None:
-            continue
-        d = resolve_holiday(rule, year)
-        if shift_observed:
-            d = observe_nearest_weekday(d)
-        holidays.add(d)
-
-    # Custom holidays
-    for rule in custom_rules:
-        d = resolve_holiday(rule, year)
-        if shift_observed:
-            d = observe_nearest_weekday(d)
-        holidays.add(d)
-
-    return holidays
+
+    __slots__ = ("first_year", "last_year", "_days")
+
+    def __init__(
+        self,
+        standard_ids: list[str],
+        custom_rules: list[dict],
+        first_year: int,
+        last_year: int,
+        shift_observed: bool = True,
+    ) -> None:
+        """Resolve every rule for first_year..last_year (inclusive)."""
+        rules = [
+            (_ordinal_rule(rule), _OBSERVE_SHIFTS[policy])
+            for rule, policy in _observed_rules(standard_ids, custom_rules, shift_observed)
+        ]
+        days: set[int] = set()
+        jan1 = date(first_year, 1, 1).toordinal()
+        for year in range(first_year, last_year + 1):
+            leap = calendar.isleap(year)
+            next_jan1 = jan1 + _MONTH_STARTS[leap][13]
+            for resolve, shifts in rules:
+                o = resolve(year, jan1, leap)
+                o += shifts[(o + 6) % 7]
+                if jan1 <= o < next_jan1:
+                    days.add(o)
+            jan1 = next_jan1
+        self.first_year = first_year
+        self.last_year = last_year
+        self._days = array("i", sorted(days))
+
+    def covers(self, year: int) -> bool:
+        """Whether ``year`` is within the resolved range."""
+        return self.first_year <= year <= self.last_year
+
+    def __contains__(self, d: date) -> bool:
+        """Whether ``d`` is a holiday (its year must be covered)."""
+        o = d.toordinal()
+        i = bisect.bisect_left(self._days, o)
+        return i < len(self._days) and self._days[i] == o
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def dates(self, year: int) -> list[date]:
+        """The holidays of one covered year, in order."""
+        lo = bisect.bisect_left(self._days, date(year, 1, 1).toordinal())
+        hi = bisect.bisect_left(self._days, date(year + 1, 1, 1).toordinal())
+        return [date.fromordinal(o) for o in self._days[lo:hi]]
@@ -0,0 +1,183 @@
+"""Incremental config updates for Solarseed TOU.
+
+Applies JSON-patch style path operations to a stored config:
+
+    [{"op": "replace", "path": "/tiers/on-peak/rate", "value": 0.2841},
+     {"op": "add", "path": "/holidays/standard/-", "value": "juneteenth"}]
+
+Paths are JSON Pointers (RFC 6901).  Only the containers along each path
+are copied, so the rest of the config is shared with the original.  The
+touched paths then decide what has to be re-parsed and recompiled:
+
+- tier rates / per-kWh adders  → rate vector only
+- holidays                     → holiday days of the compiled tables
+- one season's grid            → that season's days
+- anything else structural     → full rebuild
+"""
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable
+from typing import Any
+
+from .schedule import TOUSchedule
+
+PATCH_OPS = ("add", "remove", "replace", "test")
+
+# Top-level keys whose edits only change effective rates
+_RATE_KEYS = frozenset({
+    "regulatory_per_kwh",
+    "state_passthrough_per_kwh",
+    "programs_per_kwh",
+    "tax_rate_pct",
+})
+
+# Top-level keys that do not feed the compiled tables at all
+_UNCOMPILED_KEYS = frozenset({"energy_sensor", "fixed_monthly", "billing_cycle"})
+
+
+class PatchError(ValueError):
+    """A patch operation could not be applied."""
+
+
+def parse_pointer(path: str) -> list[str]:
+    """Split a JSON Pointer into unescaped segments."""
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise PatchError(f"Invalid path: {path!r}")
+    return [seg.replace("~1", "/").replace("~0", "~") for seg in path[1:].split("/")]
+
+
+def _list_index(container: list, seg: str, *, allow_end: bool) -> int:
+    """Resolve a list segment ("-" appends when allowed)."""
+    if seg == "-" and allow_end:
+        return len(container)
+    if not seg.isdigit():
+        raise PatchError(f"Invalid list index: {seg!r}")
+    idx = int(seg)
+    if idx > len(container) or (idx == len(container) and not allow_end):
+        raise PatchError(f"List index out of range: {idx}")
+    return idx
+
+
+def apply_patch(
+    config: dict[str, Any], ops: Iterable[dict[str, Any]]
+) -> tuple[dict[str, Any], list[list[str]]]:
+    """Apply patch operations; returns (new config, touched paths).
+
+    ``config`` is not modified.  Operations apply in order and the whole
+    patch fails on the first bad one.
+    """
+    root = dict(config)
+    copied: set[int] = {id(root)}
+    touched: list[list[str]] = []
+
+    for op in ops:
+        if not isinstance(op, dict) or op.get("op") not in PATCH_OPS:
+            raise PatchError(f"Unsupported operation: {op!r}")
+        kind = op["op"]
+        path = parse_pointer(op.get("path"))
+        if kind != "remove" and "value" not in op:
+            raise PatchError(f"{kind} at {op['path']} needs a value")
+
+        # Walk to the parent, copying containers on the way (copy-on-write)
+        parent: Any = root
+        for seg in path[:-1]:
+            if isinstance(parent, dict):
+                if seg not in parent:
+                    raise PatchError(f"Path not found: {op['path']}")
+                child = parent[seg]
+            elif isinstance(parent, list):
+                child = parent[_list_index(parent, seg, allow_end=False)]
+            else:
+                raise PatchError(f"Path not found: {op['path']}")
+            if kind != "test" and isinstance(child, (dict, list)) and id(child) not in copied:
+                child = dict(child) if isinstance(child, dict) else list(child)
+                copied.add(id(child))
+                if isinstance(parent, dict):
+                    parent[seg] = child
+                else:
+                    parent[int(seg)] = child
+            parent = child
+
+        last = path[-1]
+        value = copy.deepcopy(op.get("value"))
+        if isinstance(parent, dict):
+            exists = last in parent
+            if kind in ("remove", "replace", "test") and not exists:
+                raise PatchError(f"Path not found: {op['path']}")
+            if kind == "test":
+                if parent[last] != value:
+                    raise PatchError(f"Test failed at {op['path']}")
+                continue
+            if kind == "remove":
+                del parent[last]
+            else:
+                parent[last] = value
+        elif isinstance(parent, list):
+            idx = _list_index(parent, last, allow_end=kind == "add")
+            if kind == "test":
+                if parent[idx] != value:
+                    raise PatchError(f"Test failed at {op['path']}")
+                continue
+            if kind == "add":
+                parent.insert(idx, value)
+            elif kind == "remove":
+                del parent[idx]
+            else:
+                parent[idx] = value
+        else:
+            raise PatchError(f"Path not found: {op['path']}")
+        touched.append(path)
+
+    return root, touched
+
+
+def classify_changes(
+    paths: list[list[str]], old: dict[str, Any], new: dict[str, Any]
+) -> tuple[set[str], set[str]]:
+    """Return (top-level sections touched, compiled changes) for touched paths.
+
+    Compiled changes use the vocabulary of ``CompiledSchedule.rebase``.
+    """
+    sections: set[str] = set()
+    changes: set[str] = set()
+    for path in paths:
+        key = path[0]
+        sections.add(key)
+        if key in _UNCOMPILED_KEYS:
+            continue
+        if key in _RATE_KEYS or key == "tiers":
+            # Added / removed tiers are caught by rebase's tier-ID check
+            changes.add("rates")
+        elif key == "holidays":
+            changes.add("holidays")
+        elif (
+            key == "seasons"
+            and len(path) >= 3
+            and path[2] == "grid"
+            and list(old.get("seasons", {})) == list(new.get("seasons", {}))
+        ):
+            changes.add(f"season:{list(new['seasons']).index(path[1])}")
+        else:
+            changes.add("structure")
+    return sections, changes
+
+
+def patch_schedule(
+    schedule: TOUSchedule, config: dict[str, Any], ops: Iterable[dict[str, Any]]
+) -> tuple[dict[str, Any], TOUSchedule, set[str]]:
+    """Apply ``ops`` to ``config`` and derive the matching schedule.
+
+    Returns (new config, new schedule, compiled changes).  Only touched
+    sections are re-parsed (and so validated); the compiled tables are
+    rebased rather than rebuilt.  Raises ValueError on a bad patch or an
+    invalid touched section.
+    """
+    new_config, paths = apply_patch(config, ops)
+    sections, changes = classify_changes(paths, config, new_config)
+    try:
+        new_schedule = schedule.patched(new_config, sections)
+    except (TypeError, AttributeError) as err:
+        raise ValueError(f"Invalid config after patch: {err}") from err
+    new_schedule._compiled = schedule.compiled.rebase(new_schedule, changes)
+    return new_config, new_schedule, changes
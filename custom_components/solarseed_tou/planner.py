@@ -0,0 +1,190 @@
+"""Cheapest-window search for load scheduling (EV charging, water heating, ...).
+
+Finds the contiguous run of hourly slots with the lowest cost within the
+next 24–48 h by sliding a window over the compiled effective-rate table.
+Without a kWh profile every slot weighs 1 kWh (a flat 1 kW load), which is
+a plain sliding sum; with a profile the window cost is Σ kwh[j] × rate[i+j].
+
+Results are memoized on the CompiledSchedule, so a config change drops
+them.  Entries are keyed by the request and the current slot and expire at
+the next tier transition — repeated calls from automations are a dict hit.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from .compiled import SLOTS_PER_DAY, CompiledSchedule, slot_of, slot_start
+
+DEFAULT_HORIZON_SLOTS = 24
+MAX_HORIZON_SLOTS = 48
+
+# Hours covered by the published price horizon
+PRICE_HORIZON_HOURS = 48
+
+_SLOT = timedelta(hours=24 / SLOTS_PER_DAY)
+
+
+@dataclass(frozen=True)
+class CheapestWindow:
+    """Result of a cheapest-window search."""
+    start: datetime
+    end: datetime
+    cost: float  # $ for the kWh profile (1 kWh per slot if none was given)
+    average_rate: float  # kWh-weighted $/kWh over the window
+    rates: tuple[float, ...]  # effective rate of each slot in the window
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for service responses / the WebSocket API."""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "cost": round(self.cost, 6),
+            "average_rate": round(self.average_rate, 6),
+            "rates": [round(r, 6) for r in self.rates],
+        }
+
+
+def find_cheapest_window(
+    compiled: CompiledSchedule,
+    now: datetime,
+    slots: int | None = None,
+    *,
+    horizon: int = DEFAULT_HORIZON_SLOTS,
+    earliest_start: datetime | None = None,
+    latest_end: datetime | None = None,
+    kwh_profile: Sequence[float] | None = None,
+) -> CheapestWindow | None:
+    """Return the cheapest window of ``slots`` consecutive slots, or None.
+
+    Candidate windows start at slot boundaries from the slot containing
+    ``max(now, earliest_start)`` and must finish by ``latest_end`` and
+    within ``horizon`` slots of now.  A window starting in the current slot
+    is reported as starting at ``now``.  ``kwh_profile`` gives the expected
+    kWh per slot of the load; its length is the window length when
+    ``slots`` is omitted.  Ties go to the earliest window.
+    """
+    if kwh_profile is not None:
+        weights = tuple(float(k) for k in kwh_profile)
+        if slots is None:
+            slots = len(weights)
+        if len(weights) != slots:
+            raise ValueError("kwh_profile length must match the window length")
+    else:
+        weights = None
+    if not slots or slots < 1:
+        raise ValueError("Window length must be at least one slot")
+    horizon = max(1, min(horizon, MAX_HORIZON_SLOTS))
+
+    year, slot = slot_of(now)
+    key = (slots, horizon, earliest_start, latest_end, weights)
+    cache: dict = compiled.memo.setdefault("cheapest_window", {})
+    if cache.get("_slot") != (year, slot) or (
+        cache.get("_expires") is not None and now >= cache["_expires"]
+    ):
+        cache.clear()
+        cache["_slot"] = (year, slot)
+        nxt = compiled.next_transition(now)
+        cache["_expires"] = nxt[0] if nxt else None
+    if key in cache:
+        return _materialize(cache[key], now, slots, weights, year, slot)
+
+    rates = compiled.slot_rates(year, slot, horizon)
+    origin = slot_start(year, slot, now.tzinfo)
+    first = 0
+    if earliest_start is not None:
+        first = max(0, _slot_offset(origin, earliest_start))
+    last = horizon - slots  # last candidate start offset
+    if latest_end is not None:
+        last = min(last, _slot_offset(origin, latest_end, ceil=False) - slots)
+
+    best: tuple[float, int] | None = None
+    if first <= last:
+        if weights is None:
+            window = sum(rates[first:first + slots])
+            best = (window, first)
+            for i in range(first + 1, last + 1):
+                window += rates[i + slots - 1] - rates[i - 1]
+                if window < best[0] - 1e-12:
+                    best = (window, i)
+        else:
+            for i in range(first, last + 1):
+                cost = sum(w * r for w, r in zip(weights, rates[i:i + slots]))
+                if best is None or cost < best[0] - 1e-12:
+                    best = (cost, i)
+
+    cache[key] = None if best is None else (best[1], tuple(rates[best[1]:best[1] + slots]))
+    return _materialize(cache[key], now, slots, weights, year, slot)
+
+
+def _slot_offset(origin: datetime, when: datetime, ceil: bool = True) -> int:
+    """Whole slots from ``origin`` to ``when`` (rounded up unless ``ceil`` is False)."""
+    if origin.tzinfo is not None:
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=origin.tzinfo)
+        else:
+            when = when.astimezone(origin.tzinfo)
+    slots, rem = divmod(when.replace(tzinfo=None) - origin.replace(tzinfo=None), _SLOT)
+    return slots + (1 if ceil and rem else 0)
+
+
+def _materialize(
+    hit: tuple[int, tuple[float, ...]] | None,
+    now: datetime,
+    slots: int,
+    weights: tuple[float, ...] | None,
+    year: int,
+    slot: int,
+) -> CheapestWindow | None:
+    """Turn a cached (offset, rates) hit into a result relative to ``now``."""
+    if hit is None:
+        return None
+    offset, rates = hit
+    w = weights or (1.0,) * slots
+    cost = sum(k * r for k, r in zip(w, rates))
+    total_kwh = sum(w)
+    start = slot_start(year, slot + offset, now.tzinfo)
+    return CheapestWindow(
+        start=max(start, now),
+        end=slot_start(year, slot + offset + slots, now.tzinfo),
+        cost=cost,
+        average_rate=cost / total_kwh if total_kwh else 0.0,
+        rates=rates,
+    )
+
+
+def price_horizon(
+    compiled: CompiledSchedule, now: datetime, hours: int = PRICE_HORIZON_HOURS
+) -> list[dict[str, Any]]:
+    """Upcoming rate curve as compact (start, tier_id, effective_rate) runs.
+
+    Built from the transition index and memoized on the CompiledSchedule
+    until the next transition (or for ``hours`` when there is none), so
+    callers polling every few seconds get the same list back.  The horizon
+    always reaches ``hours`` past that expiry, so it still covers ``hours``
+    ahead right before it is regenerated.
+    """
+    cached = compiled.memo.get("price_horizon")
+    if cached is not None:
+        built_hours, built_origin, valid_until, runs = cached
+        if built_hours == hours and built_origin <= now < valid_until:
+            return runs
+
+    year, slot = slot_of(now)
+    origin = slot_start(year, slot, now.tzinfo)
+    nxt = compiled.next_transition(now)
+    # A flat schedule has no transition; roll the window forward anyway
+    valid_until = nxt[0] if nxt else origin + timedelta(hours=hours)
+    end = valid_until + timedelta(hours=hours)
+    runs = [
+        {
+            "start": start.isoformat(),
+            "tier_id": compiled.tier_ids[idx],
+            "effective_rate": round(compiled.rates[idx], 6),
+        }
+        for start, idx in compiled.runs(origin, end)
+    ]
+    compiled.memo["price_horizon"] = (hours, origin, valid_until, runs)
+    return runs
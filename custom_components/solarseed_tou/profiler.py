@@ -0,0 +1,224 @@
+"""On-demand profiling of the event loop for Solarseed TOU.
+
+Answers "is this integration behind the event-loop lag?" on a running
+instance.  The ``solarseed_tou.profile`` service captures the event-loop
+thread for a number of seconds and writes the result to the config
+directory, then stops by itself:
+
+    sample    a background thread samples the loop's stack every
+              ``interval`` seconds and writes collapsed stacks
+              (``solarseed_tou_profile_<time>.collapsed``, the input of
+              flamegraph.pl / speedscope).  Stacks through this
+              integration are kept whole; the rest are folded into
+              ``[other]`` (busy elsewhere) or ``[idle]`` (waiting in the
+              selector), so the file also shows this integration's share
+              of busy loop time.
+    cprofile  cProfile on the loop thread, written as a pstats file
+              (``solarseed_tou_profile_<time>.pstats``); restrict the
+              report with ``pstats.Stats(path).print_stats("solarseed_tou")``.
+
+Nothing is installed on the hot path: while no capture is running there
+is no profiler, sampling thread or wrapper anywhere.
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import FrameType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+MODES = ("sample", "cprofile")
+DEFAULT_DURATION = 30  # seconds
+MAX_DURATION = 600
+DEFAULT_INTERVAL = 0.005  # seconds between stack samples
+MIN_INTERVAL = 0.001
+MAX_INTERVAL = 0.1
+
+# Frames from files under this directory belong to the integration
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Collapsed-stack lines for samples that never pass through the integration
+OTHER = "[other]"
+IDLE = "[idle]"
+
+# hass.data[DOMAIN] key of the running session
+_SESSION = "_profile"
+
+
+def _in_package(filename: str) -> bool:
+    return filename.startswith(PACKAGE_DIR)
+
+
+class StackSampler:
+    """Samples one thread's stack from a background thread into collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL) -> None:
+        """Prepare to sample ``thread_id``; nothing runs until start()."""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the sampling thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="solarseed_tou_profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop sampling; ``wait`` joins the thread (up to one interval)."""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return  # thread gone
+            self.sample(frame)
+
+    def sample(self, frame: FrameType) -> None:
+        """Record one stack (innermost frame given)."""
+        self.samples += 1
+        if frame.f_code.co_filename.endswith("selectors.py"):
+            self.stacks[IDLE] += 1  # the loop is waiting for I/O or a timer
+            return
+        names = []
+        ours = False
+        while frame is not None:
+            code = frame.f_code
+            ours = ours or _in_package(code.co_filename)
+            names.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names)) if ours else OTHER] += 1
+
+    @property
+    def share(self) -> float:
+        """Fraction of busy (non-idle) samples that passed through the integration."""
+        busy = self.samples - self.stacks.get(IDLE, 0)
+        if not busy:
+            return 0.0
+        return 1 - self.stacks.get(OTHER, 0) / busy
+
+    def write(self, path: str) -> None:
+        """Write ``stack count`` lines, most frequent first."""
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+
+
+def package_share(stats: pstats.Stats) -> float:
+    """Fraction of profiled own time spent in the integration's functions."""
+    total = ours = 0.0
+    for (filename, _line, _name), (_cc, _nc, tottime, _ct, _callers) in stats.stats.items():
+        total += tottime
+        if _in_package(filename):
+            ours += tottime
+    return ours / total if total else 0.0
+
+
+@dataclass
+class ProfileSession:
+    """One running capture."""
+    mode: str
+    path: str
+    started: datetime
+    duration: float
+    _profile: cProfile.Profile | None = field(default=None, repr=False)
+    _sampler: StackSampler | None = field(default=None, repr=False)
+
+    def start(self, interval: float) -> None:
+        """Begin capturing the calling (event-loop) thread."""
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()  # ValueError if another profiler is active
+        else:
+            self._sampler = StackSampler(threading.get_ident(), interval)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop capturing (event loop); the sampler thread is joined by write()."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop(wait=False)
+
+    def write(self) -> float:
+        """Write the capture to ``path`` (executor); returns the integration's busy share."""
+        if self._profile is not None:
+            stats = pstats.Stats(self._profile)
+            stats.dump_stats(self.path)
+            return package_share(stats)
+        assert self._sampler is not None
+        self._sampler.stop()
+        self._sampler.write(self.path)
+        return self._sampler.share
+
+    def as_dict(self) -> dict[str, Any]:
+        """Service response."""
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "started": self.started.isoformat(),
+            "duration": self.duration,
+        }
+
+
+@callback
+def async_start_profile(
+    hass: HomeAssistant,
+    mode: str = "sample",
+    duration: float = DEFAULT_DURATION,
+    interval: float = DEFAULT_INTERVAL,
+) -> ProfileSession:
+    """Start a capture on the event loop that stops itself after ``duration`` seconds.
+
+    Raises ValueError if a capture is already running or cProfile cannot
+    be enabled (another profiler is active).
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(_SESSION) is not None:
+        raise ValueError("A profile is already running")
+    started = dt_util.now()
+    suffix = "pstats" if mode == "cprofile" else "collapsed"
+    path = hass.config.path(f"{DOMAIN}_profile_{started:%Y%m%d_%H%M%S}.{suffix}")
+    session = ProfileSession(mode, path, started, duration)
+    session.start(interval)
+    domain_data[_SESSION] = session
+
+    async def _finish(_now: datetime) -> None:
+        session.stop()
+        domain_data.pop(_SESSION, None)
+        try:
+            share = await hass.async_add_executor_job(session.write)
+        except OSError as err:
+            _LOGGER.warning("Solarseed TOU: could not write profile %s: %s", path, err)
+            return
+        _LOGGER.info(
+            "Solarseed TOU: %s profile written to %s (%.1f%% of busy event-loop time in "
+            "this integration)", mode, path, share * 100,
+        )
+
+    async_call_later(hass, duration, _finish)
+    return session
@@ -0,0 +1,200 @@
+"""Push subscriptions for Solarseed TOU (``solarseed_tou/subscribe``).
+
+External tools used to poll ``get_config`` and entity states.  Instead, an
+entry's UpdateHub pushes three kinds of events to every subscriber:
+
+    tier    at each tier transition (and on subscribe)
+    config  when a config or rate version change is applied
+    cost    accumulator totals, at most every COST_SNAPSHOT_INTERVAL and
+            only when they changed
+
+Each event is serialized once and the same JSON is spliced into every
+subscriber's message.  Messages go straight to the connection, whose own
+bounded queue is Home Assistant's backpressure: a client that cannot keep
+up is disconnected there.  Cost events are throttled at the source instead.
+
+The hub is created on the first subscription and its timers only run while
+someone is subscribed.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import SIGNAL_CONFIG_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cost snapshots are published at most this often
+COST_SNAPSHOT_INTERVAL = timedelta(seconds=10)
+
+
+def serialize_event(event: dict[str, Any]) -> str:
+    """Encode an event body once for all subscribers."""
+    return json.dumps(event, separators=(",", ":"), default=str)
+
+
+class Subscriber:
+    """One client's subscription: its send callable and message prefix."""
+
+    def __init__(self, send: Callable[[str], Any], msg_id: int) -> None:
+        """Initialize for a connection's send callable and subscription id."""
+        self._send = send
+        self._prefix = f'{{"id":{int(msg_id)},"type":"event","event":'
+
+    def offer(self, payload: str) -> None:
+        """Send a serialized event."""
+        self._send(self._prefix + payload + "}")
+
+
+class UpdateHub:
+    """Fan-out of one entry's tier, config and cost events."""
+
+    def __init__(self, hass: HomeAssistant, entry_data: dict[str, Any]) -> None:
+        """Initialize for an entry (reads its live schedule and checkpoint)."""
+        self._hass = hass
+        self._entry_data = entry_data
+        self._subscribers: set[Subscriber] = set()
+        self._unsubs: list[Callable[[], None]] = []
+        self._unsub_transition: Callable[[], None] | None = None
+        self._last_costs: dict[str, float] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    @callback
+    def async_subscribe(self, send: Callable[[str], Any], msg_id: int) -> Callable[[], None]:
+        """Add a subscriber; returns the callback that removes it."""
+        sub = Subscriber(send, msg_id)
+        if not self._subscribers:
+            self._async_start()
+        self._subscribers.add(sub)
+
+        # Current state, for this subscriber only
+        now = dt_util.now()
+        sub.offer(serialize_event(self._tier_event(now)))
+        costs = self._costs()
+        if costs:
+            sub.offer(serialize_event(
+                {"type": "cost", "at": now.isoformat(), "costs": costs}
+            ))
+
+        @callback
+        def _unsubscribe() -> None:
+            self._subscribers.discard(sub)
+            if not self._subscribers:
+                self.async_stop()
+
+        return _unsubscribe
+
+    @callback
+    def publish(self, event: dict[str, Any]) -> None:
+        """Serialize an event once and send it to every subscriber."""
+        payload = serialize_event(event)
+        for sub in self._subscribers:
+            sub.offer(payload)
+
+    # ── Sources ────────────────────────────────────────────
+
+    @callback
+    def _async_start(self) -> None:
+        """Start the event sources (first subscriber)."""
+        self._unsubs.append(async_track_time_interval(
+            self._hass, self._handle_cost_tick, COST_SNAPSHOT_INTERVAL
+        ))
+        self._unsubs.append(async_dispatcher_connect(
+            self._hass,
+            SIGNAL_CONFIG_UPDATED.format(self._entry_data["entry"].entry_id),
+            self._handle_config_update,
+        ))
+        self._async_arm_transition()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the event sources and drop every subscriber."""
+        self._subscribers.clear()
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs.clear()
+        if self._unsub_transition:
+            self._unsub_transition()
+            self._unsub_transition = None
+        self._last_costs = None
+
+    @callback
+    def _async_arm_transition(self) -> None:
+        """(Re)arm the tier event at the next transition."""
+        if self._unsub_transition:
+            self._unsub_transition()
+            self._unsub_transition = None
+        nxt = self._entry_data["schedule"].compiled.next_transition(dt_util.now())
+        if nxt is not None:
+            self._unsub_transition = async_track_point_in_time(
+                self._hass, self._handle_transition, nxt[0]
+            )
+
+    @callback
+    def _handle_transition(self, now: datetime) -> None:
+        """Tier changed."""
+        self._unsub_transition = None
+        self.publish(self._tier_event(now))
+        self._async_arm_transition()
+
+    @callback
+    def _handle_config_update(self, schedule: Any) -> None:
+        """A config or rate version was applied."""
+        now = dt_util.now()
+        self.publish({
+            "type": "config",
+            "at": now.isoformat(),
+            "rates": {tid: schedule.compute_effective_rate(tid) for tid in schedule.tiers},
+            "fixed_monthly": schedule.fixed_monthly,
+        })
+        self.publish(self._tier_event(now))
+        self._async_arm_transition()
+
+    @callback
+    def _handle_cost_tick(self, now: datetime) -> None:
+        """Publish accumulator totals if they changed."""
+        costs = self._costs()
+        if costs and costs != self._last_costs:
+            self._last_costs = costs
+            self.publish({"type": "cost", "at": now.isoformat(), "costs": costs})
+
+    # ── Event bodies ───────────────────────────────────────
+
+    def _tier_event(self, now: datetime) -> dict[str, Any]:
+        """The tier in effect at ``now`` and when it next changes."""
+        compiled = self._entry_data["schedule"].compiled
+        idx = compiled.tier_index(now)
+        tier_id = compiled.tier_ids[idx]
+        tier = self._entry_data["schedule"].tiers.get(tier_id)
+        nxt = compiled.next_transition(now)
+        return {
+            "type": "tier",
+            "at": now.isoformat(),
+            "tier_id": tier_id,
+            "tier_name": tier.name if tier else tier_id,
+            "effective_rate": round(compiled.rates[idx], 6),
+            "next_change": nxt[0].isoformat() if nxt else None,
+        }
+
+    def _costs(self) -> dict[str, float]:
+        """Current totals of the entry's accumulators, by unique ID."""
+        checkpoint = self._entry_data.get("checkpoint")
+        if checkpoint is None:
+            return {}
+        return {uid: round(cost, 4) for uid, cost in checkpoint.costs().items()}
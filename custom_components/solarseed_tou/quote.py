@@ -0,0 +1,205 @@
+"""Batch cost quotes for Solarseed TOU (``solarseed_tou/quote``).
+
+External load planners price hundreds of candidate (start, end, kWh) blocks
+at a time.  Each block's kWh is spread evenly over its duration and priced
+at the effective rates in force, split at rate version boundaries and at
+every hourly slot it touches.
+
+Rather than walking slots one by one, each (version, year) table gets a
+prefix sum of its per-slot rates, so the rate integral over any stretch of
+a year is two lookups plus the partial first and last slots.  Prefix sums
+live in the history's memo and are shared by every quote until the config
+changes.  Fixed monthly charges are not included.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from .compiled import MAX_TABLE_YEAR, MIN_TABLE_YEAR
+from .history import RateHistory
+
+# Largest batch a single request may price
+MAX_QUOTE_INTERVALS = 10_000
+
+# Longest single interval
+MAX_INTERVAL_SPAN = timedelta(days=366)
+
+# Largest packed-array step, in seconds
+MAX_PACKED_STEP = 31 * 86400
+
+_SECONDS_PER_SLOT = 3600
+
+
+@dataclass(frozen=True)
+class QuoteInterval:
+    """One block to price: local wall-clock [start, end) and the kWh used over it."""
+    start: datetime
+    end: datetime
+    kwh: float
+
+
+def _timestamp(value: Any) -> datetime:
+    """Parse an ISO timestamp (or pass a datetime through)."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _local_as_is(ts: datetime) -> datetime:
+    return ts
+
+
+def parse_intervals(
+    rows: Iterable[Any], localize: Callable[[datetime], datetime] = _local_as_is
+) -> list[QuoteInterval]:
+    """Parse ``[start, end, kwh]`` rows or ``{"start", "end", "kwh"}`` mappings.
+
+    ``localize`` converts each timestamp to local time before it is checked.
+    Raises ValueError on a malformed row, a negative duration or a batch
+    over MAX_QUOTE_INTERVALS.
+    """
+    intervals = []
+    for i, row in enumerate(rows):
+        if len(intervals) >= MAX_QUOTE_INTERVALS:
+            raise ValueError(f"at most {MAX_QUOTE_INTERVALS} intervals per quote")
+        try:
+            if isinstance(row, Mapping):
+                start, end, kwh = row["start"], row["end"], row["kwh"]
+            else:
+                start, end, kwh = tuple(row)[:3]
+        except (KeyError, TypeError, ValueError) as err:
+            raise ValueError(f"interval {i}: {err}") from err
+        intervals.append(_interval(start, end, kwh, i, localize))
+    return intervals
+
+
+def unpack_intervals(
+    start: Any,
+    step: int,
+    kwh: Iterable[Any],
+    localize: Callable[[datetime], datetime] = _local_as_is,
+) -> list[QuoteInterval]:
+    """Expand a packed array: consecutive ``step``-second blocks from ``start``.
+
+    Raises ValueError like ``parse_intervals``.
+    """
+    step = int(step)
+    if not 0 < step <= MAX_PACKED_STEP:
+        raise ValueError(f"step must be 1–{MAX_PACKED_STEP} seconds")
+    cursor = _timestamp(start)
+    delta = timedelta(seconds=step)
+    intervals = []
+    for i, value in enumerate(kwh):
+        if i >= MAX_QUOTE_INTERVALS:
+            raise ValueError(f"at most {MAX_QUOTE_INTERVALS} intervals per quote")
+        try:
+            end = cursor + delta
+        except OverflowError as err:
+            raise ValueError(f"interval {i}: {err}") from err
+        intervals.append(_interval(cursor, end, value, i, localize))
+        cursor = end
+    return intervals
+
+
+def _interval(
+    start: Any, end: Any, kwh: Any, i: int, localize: Callable[[datetime], datetime]
+) -> QuoteInterval:
+    """Build one interval in local time and check it; any problem is a ValueError."""
+    try:
+        interval = QuoteInterval(
+            localize(_timestamp(start)), localize(_timestamp(end)), float(kwh)
+        )
+        problem = _problem(interval)
+    except (OverflowError, TypeError, ValueError) as err:
+        problem = str(err)  # e.g. naive and aware timestamps mixed, or kWh of None
+    if problem:
+        raise ValueError(f"interval {i}: {problem}")
+    return interval
+
+
+def _problem(interval: QuoteInterval) -> str | None:
+    """Why an interval runs backwards, is too long or leaves the table years."""
+    if interval.end < interval.start:
+        return "end is before start"
+    if interval.end - interval.start > MAX_INTERVAL_SPAN:
+        return f"longer than {MAX_INTERVAL_SPAN.days} days"
+    if not MIN_TABLE_YEAR <= interval.start.year <= interval.end.year <= MAX_TABLE_YEAR:
+        return f"outside {MIN_TABLE_YEAR}–{MAX_TABLE_YEAR}"
+    return None
+
+
+def _prefix(history: RateHistory, version: int, year: int) -> list[float]:
+    """Prefix sums of a version's per-slot rates over a year (memoized)."""
+    sums: dict[tuple[int, int], list[float]] = history.memo.setdefault("rate_prefix", {})
+    prefix = sums.get((version, year))
+    if prefix is None:
+        compiled = history.schedules[version].compiled.detached()  # runs in the executor
+        rates = compiled.rates
+        prefix = list(itertools.accumulate(
+            (rates[i] for i in compiled.year_table(year)), initial=0.0
+        ))
+        sums[(version, year)] = prefix
+    return prefix
+
+
+def _integral(prefix: list[float], hours: float) -> float:
+    """Rate integral from the start of the year to ``hours`` into it ($/kWh × h)."""
+    slot = min(int(math.floor(hours)), len(prefix) - 1)
+    if slot == len(prefix) - 1:
+        return prefix[-1]
+    return prefix[slot] + (hours - slot) * (prefix[slot + 1] - prefix[slot])
+
+
+def quote_costs(history: RateHistory, intervals: Iterable[QuoteInterval]) -> list[float]:
+    """Energy cost of each interval (matches ``RateHistory.cost``).
+
+    Timestamps are local wall-clock times; a zero-length interval is priced
+    at its start.
+    """
+    costs = []
+    for interval in intervals:
+        start = interval.start.replace(tzinfo=None)
+        end = interval.end.replace(tzinfo=None)
+        if end <= start:  # the rate of the start slot, from the same prefix sums
+            prefix = _prefix(history, history.index_at(start), start.year)
+            slot = int((start - datetime(start.year, 1, 1)).total_seconds() // _SECONDS_PER_SLOT)
+            costs.append(interval.kwh * (prefix[slot + 1] - prefix[slot]))
+            continue
+        rate_hours = 0.0
+        version = history.index_at(start)
+        for piece_start, piece_end, _ in history.split(start, end):
+            for year in range(piece_start.year, piece_end.year + 1):
+                year_start = datetime(year, 1, 1)
+                lo = max(piece_start, year_start)
+                hi = min(piece_end, datetime(year + 1, 1, 1))
+                if lo >= hi:
+                    continue
+                prefix = _prefix(history, version, year)
+                rate_hours += (
+                    _integral(prefix, (hi - year_start).total_seconds() / _SECONDS_PER_SLOT)
+                    - _integral(prefix, (lo - year_start).total_seconds() / _SECONDS_PER_SLOT)
+                )
+            version += 1
+        hours = (end - start).total_seconds() / _SECONDS_PER_SLOT
+        costs.append(interval.kwh * rate_hours / hours)
+    return costs
+
+
+def quote(history: RateHistory, intervals: list[QuoteInterval]) -> dict[str, Any]:
+    """Price a batch; returns per-interval and total cost plus the time it took."""
+    started = time.perf_counter()
+    costs = quote_costs(history, intervals)
+    elapsed = time.perf_counter() - started
+    return {
+        "intervals": len(costs),
+        "costs": [round(cost, 6) for cost in costs],
+        "total_kwh": round(sum(i.kwh for i in intervals), 6),
+        "total_cost": round(math.fsum(costs), 6),
+        "elapsed_ms": round(elapsed * 1000, 3),
+    }
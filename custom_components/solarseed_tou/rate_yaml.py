@@ -0,0 +1,94 @@
+"""YAML rate-config import for Solarseed TOU.
+
+Parsing a pasted calculator export (and compiling the resulting schedule)
+is too slow for the event loop on large multi-season configs, so the
+options flow runs ``parse_rate_yaml`` in the executor.  PyYAML's libyaml
+loader is used when available, and parsed configs are memoized by a hash of
+the text so re-submitting the same paste skips the YAML parse.  Every call
+gets its own copy of the config and a freshly built RateHistory: entries
+never share mutable schedules, memos or compiled tables.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+import yaml
+
+from .history import RateHistory
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+# Recently parsed pastes kept in memory
+PARSE_CACHE_SIZE = 8
+
+_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()  # text hash -> unwrapped config
+_cache_lock = Lock()  # executor threads share the cache
+
+
+class RateConfigError(ValueError):
+    """A pasted config could not be imported; ``reason`` is the form error key."""
+
+    def __init__(self, reason: str, message: str) -> None:
+        """Initialize with a form error key and a human-readable message."""
+        super().__init__(message)
+        self.reason = reason
+
+
+def load_yaml(text: str) -> Any:
+    """Parse YAML text with the fastest available safe loader."""
+    return yaml.load(text, Loader=_SafeLoader)  # noqa: S506 — safe loader
+
+
+def unwrap_config(parsed: Any) -> dict[str, Any]:
+    """Strip an optional ``tou_metering:`` root; raise if not a mapping."""
+    if isinstance(parsed, dict) and "tou_metering" in parsed:
+        parsed = parsed["tou_metering"]
+    if not isinstance(parsed, dict):
+        raise RateConfigError("invalid_yaml", "Not a TOU config mapping")
+    return parsed
+
+
+def parse_rate_yaml(
+    text: str, energy_sensor: str, year: int
+) -> tuple[dict[str, Any], RateHistory]:
+    """Parse, validate and compile a pasted config (run in the executor).
+
+    Returns (config dict, rate history) with ``year``'s tables of every
+    version already built; pass the current year in HA's time zone.  Both
+    are new objects the caller owns.  Raises RateConfigError.
+    """
+    key = hashlib.sha256(text.encode()).hexdigest()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+
+    parsed = cached
+    if parsed is None:
+        try:
+            parsed = unwrap_config(load_yaml(text))
+        except yaml.YAMLError as err:
+            raise RateConfigError("invalid_yaml", str(err)) from err
+
+    config = copy.deepcopy(parsed)
+    config["energy_sensor"] = energy_sensor
+    try:
+        history = RateHistory.from_config(config)
+        for schedule in history.schedules:
+            schedule.compiled.year_table(year)
+    except Exception as err:  # noqa: BLE001 — any parse failure is a config error
+        raise RateConfigError("invalid_config", str(err)) from err
+
+    if cached is None:  # only configs that validated
+        with _cache_lock:
+            _cache[key] = parsed
+            while len(_cache) > PARSE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return copy.deepcopy(config), history
@@ -7,19 +7,62 @@ Given a datetime, determines the active rate tier by:
 4. Indexing by hour to get the tier ID
 5. Computing the effective rate using the full YAML-contract formula:
    effective = (tier.rate + regulatory + passthrough + programs) × (1 + tax/100)
+
+``from_dict`` validates the config up front.  Contract violations that
+would silently misprice (unknown tier IDs, overlapping or invalid months,
+malformed holiday rules) are rejected with a ScheduleValidationError;
+recoverable gaps (short/long/missing grid rows, uncovered months, unknown
+standard holiday IDs) are normalized and reported as warnings in
+``TOUSchedule.diagnostics``.  Lookups can then assume a total 7×24 grid and
+a season for every month.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, date, timedelta
 from typing import Any
 
-from .holiday import resolve_holidays_for_year
+from .compiled import SLOTS_PER_DAY, CompiledSchedule
+from .const import STANDARD_HOLIDAYS
+from .holiday import OBSERVE_POLICIES, resolve_holidays_for_year
 
 
 DAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
 
 
+@dataclass(frozen=True)
+class Diagnostic:
+    """One finding of config validation."""
+    severity: str  # "error" (config rejected) or "warning" (normalized)
+    path: str  # dotted config path, e.g. "seasons.summer.grid.mon"
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+    def as_dict(self) -> dict[str, str]:
+        """Serialize for the WebSocket API / diagnostics."""
+        return {"severity": self.severity, "path": self.path, "message": self.message}
+
+
+class ScheduleValidationError(ValueError):
+    """The config has errors; ``diagnostics`` lists every finding."""
+
+    def __init__(self, diagnostics: list[Diagnostic]) -> None:
+        """Initialize from the full diagnostics list."""
+        self.diagnostics = diagnostics
+        errors = [str(d) for d in diagnostics if d.severity == "error"]
+        super().__init__("Invalid TOU config: " + "; ".join(errors))
+
+
+def _error(path: str, message: str) -> Diagnostic:
+    return Diagnostic("error", path, message)
+
+
+def _warning(path: str, message: str) -> Diagnostic:
+    return Diagnostic("warning", path, message)
+
+
 @dataclass
 class RateTier:
     """A rate tier with a per-kWh base rate (usage + transmission + distribution + PCA)."""
@@ -46,6 +89,229 @@ class HolidayConfig:
     custom: list[dict] = field(default_factory=list)
 
 
+@dataclass
+class BillingCycleConfig:
+    """Meter read schedule: a read day of the month and/or explicit read dates."""
+    read_day: int = 1  # 1-31, clamped to short months
+    read_dates: list[date] = field(default_factory=list)
+
+
+_SCALAR_KEYS = frozenset({
+    "regulatory_per_kwh",
+    "state_passthrough_per_kwh",
+    "programs_per_kwh",
+    "tax_rate_pct",
+    "fixed_monthly",
+})
+
+# Top-level config keys TOUSchedule.patched can re-parse on their own
+PATCHABLE_SECTIONS = frozenset({
+    "energy_sensor", "tiers", "seasons", "holidays", "billing_cycle",
+}) | _SCALAR_KEYS
+
+
+def _parse_tiers(data: dict[str, Any], diags: list[Diagnostic]) -> dict[str, RateTier]:
+    """Parse the ``tiers`` section."""
+    tiers = {}
+    for tid, tdata in data.get("tiers", {}).items():
+        try:
+            rate = float(tdata.get("rate", 0))
+        except (TypeError, ValueError):
+            diags.append(_error(f"tiers.{tid}.rate", f"not a number: {tdata.get('rate')!r}"))
+            rate = 0.0
+        tiers[tid] = RateTier(
+            id=tid,
+            name=tdata.get("name", tid),
+            rate=rate,
+            color=tdata.get("color", "#888888"),
+        )
+    return tiers
+
+
+def _parse_seasons(
+    data: dict[str, Any], tiers: dict[str, RateTier], diags: list[Diagnostic]
+) -> list[Season]:
+    """Parse the ``seasons`` section (order is significant).
+
+    Grid rows are normalized to exactly 24 entries for all seven days,
+    padding with the first tier; every entry must be a known tier ID.
+    """
+    fallback = next(iter(tiers), "off-peak")
+    seasons = []
+    for sid, sdata in data.get("seasons", {}).items():
+        path = f"seasons.{sid}"
+        months = []
+        for month in sdata.get("months", []):
+            if isinstance(month, bool) or not isinstance(month, int) or not 1 <= month <= 12:
+                diags.append(_error(f"{path}.months", f"invalid month {month!r}"))
+            else:
+                months.append(month)
+
+        raw_grid = sdata.get("grid") or {}
+        for day_key in raw_grid:
+            if day_key not in DAY_KEYS:
+                diags.append(_warning(f"{path}.grid.{day_key}", "unknown day key ignored"))
+        grid: dict[str, list[str]] = {}
+        unknown: set[str] = set()
+        for day_key in DAY_KEYS:
+            row_path = f"{path}.grid.{day_key}"
+            row = raw_grid.get(day_key)
+            if row is None:
+                diags.append(_warning(row_path, f"missing day row, filled with {fallback!r}"))
+                row = []
+            elif not isinstance(row, list):
+                diags.append(_error(row_path, "day row must be a list of tier IDs"))
+                row = []
+            elif len(row) < SLOTS_PER_DAY:
+                diags.append(_warning(
+                    row_path, f"{len(row)} hours, padded to 24 with {fallback!r}"
+                ))
+            elif len(row) > SLOTS_PER_DAY:
+                diags.append(_warning(row_path, f"{len(row)} hours, truncated to 24"))
+            row = list(row[:SLOTS_PER_DAY])
+            row.extend([fallback] * (SLOTS_PER_DAY - len(row)))
+            unknown.update(str(tid) for tid in row if tid not in tiers)
+            grid[day_key] = row
+        if unknown:
+            diags.append(_error(f"{path}.grid", f"unknown tier IDs: {', '.join(sorted(unknown))}"))
+
+        seasons.append(Season(name=sdata.get("name", sid), months=months, grid=grid))
+
+    # Every month in exactly one season
+    owner: dict[int, str] = {}
+    for season in seasons:
+        for month in season.months:
+            if month in owner and owner[month] != season.name:
+                diags.append(_error(
+                    "seasons", f"month {month} is in both {owner[month]!r} and {season.name!r}"
+                ))
+            owner.setdefault(month, season.name)
+    missing = [m for m in range(1, 13) if m not in owner]
+    if seasons and missing:
+        diags.append(_warning(
+            "seasons",
+            f"months {', '.join(map(str, missing))} are in no season, "
+            f"using {seasons[0].name!r}",
+        ))
+    return seasons
+
+
+def _parse_holidays(
+    data: dict[str, Any], tiers: dict[str, RateTier], diags: list[Diagnostic]
+) -> HolidayConfig:
+    """Parse the ``holidays`` section (rate tier defaults to the first tier)."""
+    hdata = data.get("holidays", {})
+    rate_tier = hdata.get("rate_tier", next(iter(tiers), "off-peak"))
+    if tiers and rate_tier not in tiers:
+        diags.append(_error("holidays.rate_tier", f"unknown tier ID {rate_tier!r}"))
+
+    standard = []
+    for hid in hdata.get("standard", []):
+        if hid in STANDARD_HOLIDAYS:
+            standard.append(hid)
+        else:
+            diags.append(_warning("holidays.standard", f"unknown holiday {hid!r} ignored"))
+
+    custom = hdata.get("custom", [])
+    for i, rule in enumerate(custom):
+        problem = _holiday_rule_problem(rule)
+        if problem:
+            diags.append(_error(f"holidays.custom.{i}", problem))
+
+    return HolidayConfig(
+        rate_tier=rate_tier,
+        observe_nearest_weekday=hdata.get("observe_nearest_weekday", True),
+        standard=standard,
+        custom=custom,
+    )
+
+
+# Largest |days| of an offset or easter rule
+MAX_HOLIDAY_OFFSET_DAYS = 366
+
+
+def _holiday_rule_problem(rule: Any, *, nested: bool = False) -> str | None:
+    """Return why a custom holiday rule is invalid, or None."""
+    if not isinstance(rule, dict):
+        return "rule must be a mapping"
+
+    def _int(key: str, lo: int, hi: int) -> bool:
+        value = rule.get(key)
+        return isinstance(value, int) and not isinstance(value, bool) and lo <= value <= hi
+
+    kind = rule.get("rule")
+    if kind not in ("fixed", "nth", "last", "offset", "easter"):
+        return f"unknown rule type {kind!r}"
+    if "observe" in rule and rule["observe"] not in OBSERVE_POLICIES:
+        return f"observe must be one of {', '.join(OBSERVE_POLICIES)}"
+    if kind in ("offset", "easter"):
+        limit = MAX_HOLIDAY_OFFSET_DAYS
+        if not _int("days", -limit, limit) and (kind == "offset" or "days" in rule):
+            return f"days must be {-limit} to {limit}"
+        if kind == "easter":
+            return None
+        if nested:
+            return "base of an offset rule cannot itself be an offset"
+        base = rule.get("base")
+        if isinstance(base, str):
+            return None if base in STANDARD_HOLIDAYS else f"unknown base holiday {base!r}"
+        problem = _holiday_rule_problem(base, nested=True)
+        return f"base: {problem}" if problem else None
+    if not _int("month", 1, 12):
+        return "month must be 1-12"
+    if kind == "fixed":
+        if not _int("day", 1, 31):
+            return "day must be 1-31"
+        try:
+            date(2001, rule["month"], rule["day"])  # must exist every year: no Feb 29
+        except ValueError:
+            return f"day {rule['day']} does not exist every year in month {rule['month']}"
+        return None
+    if not _int("weekday", 0, 6):
+        return "weekday must be 0 (Mon) - 6 (Sun)"
+    if kind == "nth" and not _int("n", 1, 4):
+        return "n must be 1-4"
+    return None
+
+
+def _parse_billing_cycle(data: dict[str, Any], diags: list[Diagnostic]) -> BillingCycleConfig:
+    """Parse the ``billing_cycle`` section."""
+    bdata = data.get("billing_cycle") or {}
+    try:
+        read_day = int(bdata.get("read_day", 1))
+    except (TypeError, ValueError):
+        read_day = 0
+    if not 1 <= read_day <= 31:
+        diags.append(_error(
+            "billing_cycle.read_day", f"must be 1-31, got {bdata.get('read_day')!r}"
+        ))
+        read_day = 1
+    read_dates = []
+    for d in bdata.get("read_dates", []):
+        try:
+            read_dates.append(d if isinstance(d, date) else date.fromisoformat(str(d)))
+        except ValueError:
+            diags.append(_error("billing_cycle.read_dates", f"not an ISO date: {d!r}"))
+    return BillingCycleConfig(read_day=read_day, read_dates=sorted(read_dates))
+
+
+def _parse_scalars(data: dict[str, Any], diags: list[Diagnostic]) -> dict[str, float]:
+    """Parse the shared per-kWh adders, tax and fixed charge."""
+    values = {}
+    for key in _SCALAR_KEYS:
+        try:
+            values[key] = float(data.get(key, 0.0))
+        except (TypeError, ValueError):
+            diags.append(_error(key, f"not a number: {data.get(key)!r}"))
+            values[key] = 0.0
+    return values
+
+
+def _section_of(diagnostic: Diagnostic) -> str:
+    """Top-level config key a diagnostic belongs to."""
+    return diagnostic.path.split(".", 1)[0]
+
+
 @dataclass
 class TOUSchedule:
     """Complete TOU schedule configuration.
@@ -69,10 +335,36 @@ class TOUSchedule:
     # Fixed monthly charge (after tax) — not part of per-kWh formula
     fixed_monthly: float = 0.0
 
+    # Meter read schedule for billing-cycle accumulators
+    billing_cycle: BillingCycleConfig = field(default_factory=BillingCycleConfig)
+
     # Resolved holidays for current year (cached)
     _holiday_dates: set[date] = field(default_factory=set, repr=False)
     _holiday_year: int = 0
 
+    # Validation warnings for normalized parts of the config (errors raise)
+    diagnostics: list[Diagnostic] = field(default_factory=list, repr=False, compare=False)
+
+    # Compiled per-year tier tables (built lazily, see compiled.py)
+    _compiled: CompiledSchedule | None = field(default=None, repr=False, compare=False)
+
+    # Season index per month (0-11 → index into seasons); total once validated
+    _season_by_month: tuple[int, ...] = field(
+        init=False, default=(), repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Resolve each month to its season ("first matching season wins")."""
+        if not self.seasons:
+            self._season_by_month = ()
+            return
+        by_month = []
+        for month in range(1, 13):
+            by_month.append(next(
+                (i for i, season in enumerate(self.seasons) if month in season.months), 0
+            ))
+        self._season_by_month = tuple(by_month)
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> TOUSchedule:
         """Parse configuration dict into a TOUSchedule.
@@ -84,41 +376,60 @@ class TOUSchedule:
         if "tou_metering" in data and isinstance(data["tou_metering"], dict):
             data = data["tou_metering"]
 
-        tiers = {}
-        for tid, tdata in data.get("tiers", {}).items():
-            tiers[tid] = RateTier(
-                id=tid,
-                name=tdata.get("name", tid),
-                rate=float(tdata.get("rate", 0)),
-                color=tdata.get("color", "#888888"),
-            )
-
-        seasons = []
-        for _sid, sdata in data.get("seasons", {}).items():
-            seasons.append(Season(
-                name=sdata.get("name", _sid),
-                months=sdata.get("months", []),
-                grid=sdata.get("grid", {}),
-            ))
-
-        hdata = data.get("holidays", {})
-        holidays = HolidayConfig(
-            rate_tier=hdata.get("rate_tier", next(iter(tiers), "off-peak")),
-            observe_nearest_weekday=hdata.get("observe_nearest_weekday", True),
-            standard=hdata.get("standard", []),
-            custom=hdata.get("custom", []),
-        )
-
-        return cls(
+        diags: list[Diagnostic] = []
+        tiers = _parse_tiers(data, diags)
+        schedule = cls(
             energy_sensor=data.get("energy_sensor", ""),
             tiers=tiers,
-            seasons=seasons,
-            holidays=holidays,
-            regulatory_per_kwh=float(data.get("regulatory_per_kwh", 0.0)),
-            state_passthrough_per_kwh=float(data.get("state_passthrough_per_kwh", 0.0)),
-            programs_per_kwh=float(data.get("programs_per_kwh", 0.0)),
-            tax_rate_pct=float(data.get("tax_rate_pct", 0.0)),
-            fixed_monthly=float(data.get("fixed_monthly", 0.0)),
+            seasons=_parse_seasons(data, tiers, diags),
+            holidays=_parse_holidays(data, tiers, diags),
+            billing_cycle=_parse_billing_cycle(data, diags),
+            **_parse_scalars(data, diags),
+        )
+        if any(d.severity == "error" for d in diags):
+            raise ScheduleValidationError(diags)
+        schedule.diagnostics = diags
+        return schedule
+
+    def patched(self, data: dict[str, Any], sections: set[str]) -> TOUSchedule:
+        """Return a new schedule with only the given top-level sections re-parsed.
+
+        ``data`` is the full, already patched config dict; sections not in
+        ``sections`` are shared with this schedule.  The compiled tables are
+        not carried over — see ``CompiledSchedule.rebase``.
+        """
+        if "tou_metering" in data or not sections <= PATCHABLE_SECTIONS:
+            return TOUSchedule.from_dict(data)
+        diags: list[Diagnostic] = []
+        changes: dict[str, Any] = {}
+        if "tiers" in sections:
+            changes["tiers"] = _parse_tiers(data, diags)
+            # Adding, removing or reordering tiers can invalidate grid and
+            # holiday references, so those sections are re-checked too
+            if list(changes["tiers"]) != list(self.tiers):
+                sections = set(sections) | {"seasons", "holidays"}
+        tiers = changes.get("tiers", self.tiers)
+        if "seasons" in sections:
+            changes["seasons"] = _parse_seasons(data, tiers, diags)
+        if "holidays" in sections:
+            changes["holidays"] = _parse_holidays(data, tiers, diags)
+        if "billing_cycle" in sections:
+            changes["billing_cycle"] = _parse_billing_cycle(data, diags)
+        if "energy_sensor" in sections:
+            changes["energy_sensor"] = data.get("energy_sensor", "")
+        if sections & _SCALAR_KEYS:
+            changes.update(_parse_scalars(data, diags))
+        if any(d.severity == "error" for d in diags):
+            raise ScheduleValidationError(diags)
+        reparsed = set(sections) | (_SCALAR_KEYS if sections & _SCALAR_KEYS else set())
+        kept = [d for d in self.diagnostics if _section_of(d) not in reparsed]
+        return replace(
+            self,
+            _holiday_dates=set(),
+            _holiday_year=0,
+            _compiled=None,
+            diagnostics=kept + diags,
+            **changes,
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -131,6 +442,10 @@ class TOUSchedule:
             "programs_per_kwh": self.programs_per_kwh,
             "tax_rate_pct": self.tax_rate_pct,
             "fixed_monthly": self.fixed_monthly,
+            "billing_cycle": {
+                "read_day": self.billing_cycle.read_day,
+                "read_dates": [d.isoformat() for d in self.billing_cycle.read_dates],
+            },
             "seasons": {},
             "holidays": {
                 "rate_tier": self.holidays.rate_tier,
@@ -168,6 +483,13 @@ class TOUSchedule:
         )
         return base * (1.0 + self.tax_rate_pct / 100.0)
 
+    @property
+    def compiled(self) -> CompiledSchedule:
+        """Return the compiled tier tables for this schedule (built once)."""
+        if self._compiled is None:
+            self._compiled = CompiledSchedule(self)
+        return self._compiled
+
     # ── Schedule resolution ────────────────────────────────
 
     def _ensure_holidays(self, year: int) -> None:
@@ -187,12 +509,13 @@ class TOUSchedule:
         return d in self._holiday_dates
 
     def get_season(self, month: int) -> Season | None:
-        """Find the season for a given month (1-12)."""
-        for season in self.seasons:
-            if month in season.months:
-                return season
-        # Fallback: return first season
-        return self.seasons[0] if self.seasons else None
+        """Find the season for a given month (1-12).
+
+        Months in no season were assigned to the first season at validation.
+        """
+        if not self.seasons:
+            return None
+        return self.seasons[self._season_by_month[month - 1]]
 
     def get_tier_id(self, now: datetime) -> str:
         """Resolve the active tier ID for a given datetime."""
@@ -205,15 +528,8 @@ class TOUSchedule:
         if season is None:
             return next(iter(self.tiers), "off-peak")
 
-        # Get day-of-week grid row
-        day_key = DAY_KEYS[now.weekday()]  # 0=Mon -> "mon"
-        day_grid = season.grid.get(day_key, [])
-
-        # Index by hour
-        if now.hour < len(day_grid):
-            return day_grid[now.hour]
-
-        return next(iter(self.tiers), "off-peak")
+        # Grids are normalized to 7 full 24-hour rows at parse time
+        return season.grid[DAY_KEYS[now.weekday()]][now.hour]
 
     def get_rate(self, now: datetime) -> float:
         """Get the effective $/kWh rate for a given datetime.
@@ -1,9 +1,17 @@
-"""Sensor platform for Solarseed TOU Energy Metering."""
+"""Sensor platform for Solarseed TOU Energy Metering.
+
+Entities receive a parsed schedule from the entry, so the schedule stack
+is only referenced for type hints here; the package loads it anyway, since
+entry setup parses the stored config.  The planner is only needed when the
+rate sensor publishes its price horizon and is imported on first use.
+"""
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime, date, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -11,15 +19,26 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.const import EntityCategory, UnitOfEnergy, UnitOfPower
 from homeassistant.core import HomeAssistant, callback, Event, State
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_ENERGY_SENSOR, VERSION
+from .billing import BillingCalendar, prorated_fixed
+from .checkpoint import reading_is_fresh
+from .const import DOMAIN, CONF_ENERGY_SENSOR, SIGNAL_CONFIG_UPDATED, VERSION
+from .forecast import CostForecaster
+from .stats import LATENCY_SAMPLE_MASK, EntityStats, EntryStats
+
+if TYPE_CHECKING:
+    from .checkpoint import AccumulatorCheckpoint
+    from .schedule import TOUSchedule
 
 # Unit → multiplier to get kW (for power sensors) or kWh (for energy sensors)
 _POWER_UNITS = {
@@ -39,7 +58,11 @@ def _detect_sensor_mode(hass: HomeAssistant, entity_id: str) -> tuple[str, float
 
     Returns ('power', mult) or ('energy', mult).  Defaults to ('energy', 1.0).
     """
-    state = hass.states.get(entity_id)
+    return _sensor_mode_of(hass.states.get(entity_id))
+
+
+def _sensor_mode_of(state: State | None) -> tuple[str, float]:
+    """(mode, multiplier) for a source sensor state; see _detect_sensor_mode."""
     if state is None:
         return ("energy", 1.0)
     unit = state.attributes.get("unit_of_measurement", "")
@@ -52,7 +75,6 @@ def _detect_sensor_mode(hass: HomeAssistant, entity_id: str) -> tuple[str, float
     if dc == "power":
         return ("power", 0.001)  # assume W
     return ("energy", 1.0)  # assume kWh
-from .schedule import TOUSchedule
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -75,6 +97,11 @@ async def async_setup_entry(
         TOUCostTodaySensor(entry, schedule, energy_sensor),
         TOUCostWeekSensor(entry, schedule, energy_sensor),
         TOUCostMonthSensor(entry, schedule, energy_sensor),
+        TOUCostBillingCycleSensor(entry, schedule, energy_sensor),
+        TOUProjectedCostTodaySensor(entry, schedule, energy_sensor),
+        TOUProjectedBillSensor(entry, schedule, energy_sensor),
+        TOUSourceSamplesSensor(entry, schedule),
+        TOUIngestLatencySensor(entry, schedule),
     ]
 
     async_add_entities(entities, True)
@@ -85,6 +112,10 @@ class TOUBaseSensor(SensorEntity):
 
     _attr_has_entity_name = True
 
+    # Source of the current time when set (benchmarks/replay.py drives the
+    # sensors from recorded timestamps); Home Assistant's clock otherwise
+    _clock: Callable[[], datetime] | None = None
+
     def __init__(self, entry: ConfigEntry, schedule: TOUSchedule) -> None:
         """Initialize."""
         self._entry = entry
@@ -96,17 +127,33 @@ class TOUBaseSensor(SensorEntity):
             "model": "TOU Energy Metering",
             "sw_version": VERSION,
         }
+        # Replaced by the entry's shared stats once added to hass
+        self._entry_stats = EntryStats()
+        self._stats = EntityStats()
 
     async def async_added_to_hass(self) -> None:
-        """Register dispatcher listener when added to HA."""
+        """Register dispatcher listener and stats when added to HA."""
+        entry_stats = self.hass.data[DOMAIN][self._entry.entry_id].get("stats")
+        if entry_stats is not None:
+            self._entry_stats = entry_stats
+            entry_stats.add(self._attr_unique_id, self._stats)
         self.async_on_remove(
             async_dispatcher_connect(
                 self.hass,
-                f"{DOMAIN}_config_updated",
+                SIGNAL_CONFIG_UPDATED.format(self._entry.entry_id),
                 self._handle_config_update,
             )
         )
 
+    def _now(self) -> datetime:
+        """Current local time."""
+        return self._clock() if self._clock is not None else dt_util.now()
+
+    def async_write_ha_state(self) -> None:
+        """Write the state, counting writes."""
+        self._stats.writes += 1
+        super().async_write_ha_state()
+
     @callback
     def _handle_config_update(self, schedule: TOUSchedule) -> None:
         """Handle config changes from the options flow or WebSocket API."""
@@ -122,6 +169,8 @@ class TOUCurrentRateSensor(TOUBaseSensor):
     _attr_native_unit_of_measurement = "$/kWh"
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_suggested_display_precision = 4
+    # The 48 h curve changes only at transitions; keep it out of recorder history
+    _unrecorded_attributes = frozenset({"price_horizon"})
 
     def __init__(self, entry: ConfigEntry, schedule: TOUSchedule) -> None:
         """Initialize."""
@@ -130,7 +179,7 @@ class TOUCurrentRateSensor(TOUBaseSensor):
 
     def update(self) -> None:
         """Update current rate using the full YAML-contract formula."""
-        now = dt_util.now()
+        now = self._now()
         self._attr_native_value = round(self._schedule.get_rate(now), 6)
 
         tier = self._schedule.get_tier(now)
@@ -155,6 +204,14 @@ class TOUCurrentRateSensor(TOUBaseSensor):
                 self._attr_extra_state_attributes["next_rate_change"] = nxt_dt.isoformat()
                 self._attr_extra_state_attributes["next_tier"] = nxt_tier.name if nxt_tier else nxt_tid
 
+            # Same list object until the next transition (memoized on the
+            # compile).  planner is already loaded by services.py at setup.
+            from .planner import price_horizon
+
+            self._attr_extra_state_attributes["price_horizon"] = price_horizon(
+                self._schedule.compiled, now
+            )
+
 
 class TOUCurrentTierSensor(TOUBaseSensor):
     """Sensor showing the current tier name (for automations).
@@ -174,7 +231,7 @@ class TOUCurrentTierSensor(TOUBaseSensor):
 
     def update(self) -> None:
         """Update current tier and fire event on change."""
-        now = dt_util.now()
+        now = self._now()
         tier = self._schedule.get_tier(now)
         self._attr_native_value = tier.name if tier else "Unknown"
         if tier:
@@ -283,7 +340,7 @@ class TOUCostHourlySensor(TOUBaseSensor):
         except (ValueError, TypeError):
             return
 
-        now = dt_util.now()
+        now = self._now()
         mode, mult = _detect_sensor_mode(self.hass, self._energy_sensor)
         rate = self._schedule.get_rate(now)
 
@@ -337,6 +394,7 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
         self._energy_sensor = energy_sensor
         self._cost: float = 0.0
         self._last_energy: float | None = None  # energy mode: last kWh reading
+        self._last_energy_time: datetime | None = None  # when _last_energy was taken
         self._last_power_time: datetime | None = None  # power mode: last timestamp
         self._last_reset: date | None = None
         self._sensor_mode: str = "energy"  # 'energy' or 'power'
@@ -358,16 +416,44 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
             self._unit_multiplier,
         )
 
-        # Restore previous state
+        # Restore previous state — the entry's checkpoint is newer than
+        # RestoreEntity's periodic dump, so prefer it when present
+        checkpoint: AccumulatorCheckpoint | None = self.hass.data[DOMAIN][
+            self._entry.entry_id
+        ].get("checkpoint")
+        saved = checkpoint.restore(self._attr_unique_id) if checkpoint else None
+        if saved is not None:
+            self._restore_checkpoint(saved)
+        else:
+            await self._restore_last_state()
+        if checkpoint:
+            self.async_on_remove(
+                checkpoint.register(
+                    self._attr_unique_id, self._checkpoint_state, lambda: self._cost
+                )
+            )
+
+        # Check if we need to reset (e.g., HA restarted on a new day)
+        self._check_reset()
+
+        # Track sensor state changes
+        self._unsub = async_track_state_change_event(
+            self.hass, [self._energy_sensor], self._handle_sensor_change
+        )
+
+    async def _restore_last_state(self) -> None:
+        """Fall back to the last recorded state (first start with checkpoints)."""
         last_state = await self.async_get_last_state()
         if last_state and last_state.state not in (None, "unknown", "unavailable"):
             try:
-                self._cost = float(last_state.state)
+                self._cost = self._restored_cost(last_state)
             except (ValueError, TypeError):
                 self._cost = 0.0
 
             attrs = last_state.attributes
-            if "last_energy_reading" in attrs:
+            if "last_energy_reading" in attrs and reading_is_fresh(
+                last_state.last_updated, self._now()
+            ):
                 try:
                     self._last_energy = float(attrs["last_energy_reading"])
                 except (ValueError, TypeError):
@@ -378,13 +464,48 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
                 except (ValueError, TypeError):
                     pass
 
-        # Check if we need to reset (e.g., HA restarted on a new day)
-        self._check_reset()
+    def _checkpoint_state(self) -> dict[str, Any]:
+        """Everything needed to resume accumulating after a crash."""
+        return {
+            "cost": self._cost,
+            "last_energy": self._last_energy,
+            "last_energy_time": (
+                self._last_energy_time.isoformat() if self._last_energy_time else None
+            ),
+            "last_power_time": (
+                self._last_power_time.isoformat() if self._last_power_time else None
+            ),
+            "last_reset": self._last_reset.isoformat() if self._last_reset else None,
+            "sensor_mode": self._sensor_mode,
+            "unit_multiplier": self._unit_multiplier,
+        }
 
-        # Track sensor state changes
-        self._unsub = async_track_state_change_event(
-            self.hass, [self._energy_sensor], self._handle_sensor_change
-        )
+    def _restore_checkpoint(self, saved: dict[str, Any]) -> None:
+        """Resume from a checkpoint; readings too old to price correctly are dropped."""
+        now = self._now()
+        try:
+            self._cost = float(saved.get("cost", 0.0))
+        except (ValueError, TypeError):
+            self._cost = 0.0
+        try:
+            self._last_reset = (
+                date.fromisoformat(saved["last_reset"]) if saved.get("last_reset") else None
+            )
+        except (ValueError, TypeError):
+            self._last_reset = None
+        if saved.get("sensor_mode") != self._sensor_mode:
+            return  # source changed mode while we were down — start tracking fresh
+        if saved.get("last_energy") is not None and reading_is_fresh(
+            saved.get("last_energy_time"), now
+        ):
+            self._last_energy = float(saved["last_energy"])
+            self._last_energy_time = datetime.fromisoformat(saved["last_energy_time"])
+        elif saved.get("last_energy") is not None:
+            _LOGGER.info(
+                "Solarseed TOU: discarding stale meter reading for %s", self.entity_id
+            )
+        if reading_is_fresh(saved.get("last_power_time"), now):
+            self._last_power_time = datetime.fromisoformat(saved["last_power_time"])
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up."""
@@ -394,10 +515,16 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
     @callback
     def _handle_sensor_change(self, event: Event) -> None:
         """Handle source sensor state change (power or energy)."""
+        stats = self._stats
+        stats.samples += 1
+        timed = not stats.samples & LATENCY_SAMPLE_MASK
+        if timed:
+            started = time.perf_counter_ns()
         new_state: State | None = event.data.get("new_state")
         if new_state is None or new_state.state in ("unknown", "unavailable"):
             # Sensor went unavailable — clear power timestamp so we don't
             # accumulate a huge gap when it comes back.
+            stats.unavailable += 1
             if self._sensor_mode == "power":
                 self._last_power_time = None
             return
@@ -405,10 +532,11 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
         try:
             raw_value = float(new_state.state)
         except (ValueError, TypeError):
+            stats.unparseable += 1
             return
 
         # Re-detect mode in case sensor unit changed (rare, but safe)
-        new_mode, new_mult = _detect_sensor_mode(self.hass, self._energy_sensor)
+        new_mode, new_mult = _sensor_mode_of(new_state)
         if new_mode != self._sensor_mode:
             _LOGGER.info(
                 "Solarseed TOU: source sensor mode changed %s → %s",
@@ -422,20 +550,35 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
             self._last_power_time = None
 
         self._check_reset()
-        now = dt_util.now()
+        now = self._now()
 
         if self._sensor_mode == "power":
             self._accumulate_power(raw_value, now)
         else:
             self._accumulate_energy(raw_value, now)
 
+        if not timed:
+            self._update_state()
+            self.async_write_ha_state()
+            return
+        ingested = time.perf_counter_ns()
+        self._update_state()
+        self.async_write_ha_state()
+        self._entry_stats.ingest.record(ingested - started)
+        self._entry_stats.publish.record(time.perf_counter_ns() - ingested)
+
+    def _update_state(self) -> None:
+        """Publish the accumulated cost and tracking attributes."""
         self._attr_native_value = round(self._cost, 4)
         self._attr_extra_state_attributes = {
             "last_energy_reading": self._last_energy,
             "sensor_mode": self._sensor_mode,
             "last_reset": self._last_reset.isoformat() if self._last_reset else None,
         }
-        self.async_write_ha_state()
+
+    def _restored_cost(self, last_state: State) -> float:
+        """Return the accumulated cost to resume from a restored state."""
+        return float(last_state.state)
 
     def _accumulate_energy(self, new_kwh_raw: float, now: datetime) -> None:
         """Energy mode: delta between cumulative readings."""
@@ -443,9 +586,11 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
         if self._last_energy is not None:
             delta = new_kwh - self._last_energy
             if delta > 0:
-                rate = self._schedule.get_rate(now)
-                self._cost += delta * rate
+                self._add_usage(delta, now)
+            elif delta < 0:
+                self._stats.negative_delta += 1
         self._last_energy = new_kwh
+        self._last_energy_time = now
 
     def _accumulate_power(self, power_raw: float, now: datetime) -> None:
         """Power mode: integrate instantaneous power over time."""
@@ -455,9 +600,9 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
             if 0 < dt_hours <= 1.0:
                 power_kw = power_raw * self._unit_multiplier
                 delta_kwh = power_kw * dt_hours
-                rate = self._schedule.get_rate(now)
-                self._cost += delta_kwh * rate
+                self._add_usage(delta_kwh, now)
             elif dt_hours > 1.0:
+                self._stats.gap += 1
                 _LOGGER.debug(
                     "Solarseed TOU: skipping %.1fh power gap for %s",
                     dt_hours,
@@ -468,6 +613,15 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
         # but keep the field populated for consistency)
         self._last_energy = power_raw
 
+    def _add_usage(self, kwh: float, now: datetime) -> None:
+        """Price consumed kWh at the rate in effect at ``now``."""
+        if self._stats.samples & LATENCY_SAMPLE_MASK:
+            self._cost += kwh * self._schedule.get_rate(now)
+            return
+        started = time.perf_counter_ns()
+        self._cost += kwh * self._schedule.get_rate(now)
+        self._entry_stats.price.record(time.perf_counter_ns() - started)
+
     def _check_reset(self) -> None:
         """Check if accumulator should reset. Override in subclasses."""
         pass
@@ -475,7 +629,7 @@ class TOUCostAccumulatorSensor(TOUBaseSensor, RestoreEntity):
     def update(self) -> None:
         """Periodic update."""
         self._check_reset()
-        self._attr_native_value = round(self._cost, 4)
+        self._update_state()
 
 
 class TOUCostTodaySensor(TOUCostAccumulatorSensor):
@@ -489,7 +643,7 @@ class TOUCostTodaySensor(TOUCostAccumulatorSensor):
         self._attr_unique_id = f"{entry.entry_id}_cost_today"
 
     def _check_reset(self):
-        today = dt_util.now().date()
+        today = self._now().date()
         if self._last_reset != today:
             self._cost = 0.0
             self._last_reset = today
@@ -506,7 +660,7 @@ class TOUCostWeekSensor(TOUCostAccumulatorSensor):
         self._attr_unique_id = f"{entry.entry_id}_cost_week"
 
     def _check_reset(self):
-        today = dt_util.now().date()
+        today = self._now().date()
         # Monday = 0
         week_start = today - timedelta(days=today.weekday())
         if self._last_reset is None or self._last_reset < week_start:
@@ -525,8 +679,240 @@ class TOUCostMonthSensor(TOUCostAccumulatorSensor):
         self._attr_unique_id = f"{entry.entry_id}_cost_month"
 
     def _check_reset(self):
-        today = dt_util.now().date()
+        today = self._now().date()
         month_start = today.replace(day=1)
         if self._last_reset is None or self._last_reset < month_start:
             self._cost = 0.0
             self._last_reset = month_start
+
+
+class TOUCostBillingCycleSensor(TOUCostAccumulatorSensor):
+    """Cost accumulated this billing cycle, including the prorated fixed charge.
+
+    The cycle runs from one meter read date to the next (``billing_cycle``
+    in the config).  Boundaries are precomputed by BillingCalendar and the
+    reset fires from a scheduled callback at the next read date, so samples
+    never compare dates.
+    """
+
+    _attr_name = "Cost This Billing Cycle"
+    _attr_icon = "mdi:receipt-text-clock"
+
+    def __init__(self, entry, schedule, energy_sensor):
+        super().__init__(entry, schedule, energy_sensor)
+        self._attr_unique_id = f"{entry.entry_id}_cost_billing_cycle"
+        self._calendar = BillingCalendar(schedule.billing_cycle, self._now().date())
+        self._cycle_start: date | None = None
+        self._cycle_end: date | None = None
+        self._unsub_rollover: callback | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore, align to the current cycle and schedule the next reset."""
+        await super().async_added_to_hass()
+        self._start_cycle()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Clean up."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_rollover:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    def _check_reset(self) -> None:
+        """Resets are scheduled at cycle boundaries, not checked per sample."""
+
+    def _start_cycle(self) -> None:
+        """Align to the cycle containing today and schedule its rollover."""
+        self._cycle_start, self._cycle_end = self._calendar.cycle_for(self._now().date())
+        if self._last_reset != self._cycle_start:
+            self._cost = 0.0
+            self._last_reset = self._cycle_start
+
+        if self._unsub_rollover:
+            self._unsub_rollover()
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass,
+            self._handle_cycle_rollover,
+            dt_util.start_of_local_day(self._cycle_end),
+        )
+        self._update_state()
+
+    @callback
+    def _handle_cycle_rollover(self, _now: datetime) -> None:
+        """Meter read date reached — start a new cycle."""
+        self._unsub_rollover = None
+        self._start_cycle()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_config_update(self, schedule: TOUSchedule) -> None:
+        """Re-read the billing cycle config; keep the running total."""
+        self._schedule = schedule
+        self._calendar = BillingCalendar(schedule.billing_cycle, self._now().date())
+        keep_reset = self._last_reset
+        self._start_cycle()
+        if keep_reset is not None and self._last_reset != keep_reset:
+            _LOGGER.info(
+                "Solarseed TOU: billing cycle changed, new cycle starts %s",
+                self._cycle_start,
+            )
+        self.async_write_ha_state()
+
+    def _fixed_charge(self) -> float:
+        """Fixed monthly charge prorated over this cycle's length."""
+        if self._cycle_start is None or self._cycle_end is None:
+            return 0.0
+        return prorated_fixed(self._schedule.fixed_monthly, self._cycle_start, self._cycle_end)
+
+    def _update_state(self) -> None:
+        """Cycle total = energy cost + prorated fixed charge."""
+        super()._update_state()
+        fixed = self._fixed_charge()
+        self._attr_native_value = round(self._cost + fixed, 4)
+        self._attr_extra_state_attributes.update({
+            "energy_cost": round(self._cost, 4),
+            "fixed_charge": round(fixed, 4),
+            "cycle_start": self._cycle_start.isoformat() if self._cycle_start else None,
+            "cycle_end": self._cycle_end.isoformat() if self._cycle_end else None,
+            "cycle_days": (
+                (self._cycle_end - self._cycle_start).days
+                if self._cycle_start and self._cycle_end else None
+            ),
+        })
+
+    def _restored_cost(self, last_state: State) -> float:
+        """The state includes the fixed charge; resume from the energy part."""
+        return float(last_state.attributes.get("energy_cost", last_state.state))
+
+
+class TOUCostForecastMixin:
+    """Adds a learned-profile cost projection to an accumulator sensor.
+
+    Every priced kWh also feeds the CostForecaster; the state becomes the
+    accumulated cost plus the expected cost of the remaining slots up to
+    ``_forecast_end()``.
+    """
+
+    _attr_icon = "mdi:crystal-ball"
+
+    def __init__(self, entry, schedule, energy_sensor):
+        super().__init__(entry, schedule, energy_sensor)
+        self._forecaster = CostForecaster(schedule.compiled)
+
+    def _add_usage(self, kwh: float, now: datetime) -> None:
+        """Accumulate and learn from the same sample."""
+        super()._add_usage(kwh, now)
+        self._forecaster.add(now, kwh)
+
+    @callback
+    def _handle_config_update(self, schedule: TOUSchedule) -> None:
+        """Re-price the remaining slots with the new rates."""
+        self._forecaster.set_schedule(schedule.compiled)
+        super()._handle_config_update(schedule)
+
+    def _forecast_end(self) -> date:
+        """First day not covered by the projection. Override in subclasses."""
+        return self._now().date() + timedelta(days=1)
+
+    def _update_state(self) -> None:
+        """State = accumulated + expected remaining cost."""
+        super()._update_state()
+        remaining = self._forecaster.remaining_until(self._now(), self._forecast_end())
+        self._attr_native_value = round(self._attr_native_value + remaining, 4)
+        self._attr_extra_state_attributes["forecast_remaining"] = round(remaining, 4)
+
+    def _checkpoint_state(self) -> dict[str, Any]:
+        """Also checkpoint the learned profile."""
+        state = super()._checkpoint_state()
+        state["forecast"] = self._forecaster.export_state()
+        return state
+
+    def _restore_checkpoint(self, saved: dict[str, Any]) -> None:
+        """Resume the learned profile along with the accumulator."""
+        super()._restore_checkpoint(saved)
+        if isinstance(saved.get("forecast"), dict):
+            self._forecaster.import_state(saved["forecast"])
+
+    def _restored_cost(self, last_state: State) -> float:
+        """The state includes the forecast; resume from the accumulated part."""
+        attrs = last_state.attributes
+        return float(attrs.get("energy_cost", attrs.get("accumulated_cost", last_state.state)))
+
+
+class TOUProjectedCostTodaySensor(TOUCostForecastMixin, TOUCostTodaySensor):
+    """Projected cost at end of day: cost so far + expected rest of day."""
+
+    _attr_name = "Projected Cost Today"
+
+    def __init__(self, entry, schedule, energy_sensor):
+        super().__init__(entry, schedule, energy_sensor)
+        self._attr_unique_id = f"{entry.entry_id}_projected_cost_today"
+
+    def _update_state(self) -> None:
+        """Expose the accumulated part separately."""
+        super()._update_state()
+        self._attr_extra_state_attributes["accumulated_cost"] = round(self._cost, 4)
+
+
+class TOUProjectedBillSensor(TOUCostForecastMixin, TOUCostBillingCycleSensor):
+    """Projected bill: cycle cost so far + prorated fixed + expected rest of cycle."""
+
+    _attr_name = "Projected Bill"
+    _attr_icon = "mdi:receipt-text-clock-outline"
+
+    def __init__(self, entry, schedule, energy_sensor):
+        super().__init__(entry, schedule, energy_sensor)
+        self._attr_unique_id = f"{entry.entry_id}_projected_bill"
+
+    def _forecast_end(self) -> date:
+        """Project to the next meter read."""
+        return self._cycle_end or super()._forecast_end()
+
+
+class TOUSourceSamplesSensor(TOUBaseSensor):
+    """Diagnostic: source samples received and dropped (see stats.py)."""
+
+    _attr_name = "Source Samples"
+    _attr_icon = "mdi:counter"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, entry: ConfigEntry, schedule: TOUSchedule) -> None:
+        """Initialize."""
+        super().__init__(entry, schedule)
+        self._attr_unique_id = f"{entry.entry_id}_source_samples"
+
+    def update(self) -> None:
+        """Read the entry's counters."""
+        counts = self._entry_stats.source()
+        self._attr_native_value = counts.pop("samples")
+        self._attr_extra_state_attributes = counts
+
+
+class TOUIngestLatencySensor(TOUBaseSensor):
+    """Diagnostic: 95th percentile time to handle a source sample."""
+
+    _attr_name = "Ingest Latency"
+    _attr_icon = "mdi:timer-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = "µs"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, schedule: TOUSchedule) -> None:
+        """Initialize."""
+        super().__init__(entry, schedule)
+        self._attr_unique_id = f"{entry.entry_id}_ingest_latency"
+
+    def update(self) -> None:
+        """Read the entry's histograms."""
+        stats = self._entry_stats
+        self._attr_native_value = stats.ingest.percentile(95)
+        self._attr_extra_state_attributes = {
+            "ingest_p50_us": stats.ingest.percentile(50),
+            "ingest_p99_us": stats.ingest.percentile(99),
+            "ingest_max_us": round(stats.ingest.max_ns / 1000, 3),
+            "price_p95_us": stats.price.percentile(95),
+            "publish_p95_us": stats.publish.percentile(95),
+        }
@@ -0,0 +1,130 @@
+"""Services for Solarseed TOU.
+
+Imported on first entry setup rather than with the integration, together
+with the schemas shared by the WebSocket commands (see websocket.py).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from . import get_entry_data
+from .const import DOMAIN
+from .planner import DEFAULT_HORIZON_SLOTS, MAX_HORIZON_SLOTS, find_cheapest_window
+from .profiler import (
+    DEFAULT_DURATION,
+    DEFAULT_INTERVAL,
+    MAX_DURATION,
+    MAX_INTERVAL,
+    MIN_INTERVAL,
+    MODES,
+    async_start_profile,
+)
+from .schedule import TOUSchedule
+
+# Optional entry selector accepted by every command and service
+ENTRY_ID_FIELD = {vol.Optional("entry_id"): str}
+
+CHEAPEST_WINDOW_FIELDS = {
+    vol.Optional("duration"): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_HORIZON_SLOTS)
+    ),
+    vol.Optional("horizon", default=DEFAULT_HORIZON_SLOTS): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_HORIZON_SLOTS)
+    ),
+    vol.Optional("earliest_start"): cv.datetime,
+    vol.Optional("latest_end"): cv.datetime,
+    vol.Optional("kwh_profile"): [vol.Coerce(float)],
+}
+
+PROFILE_FIELDS = {
+    vol.Optional("mode", default="sample"): vol.In(MODES),
+    vol.Optional("duration", default=DEFAULT_DURATION): vol.All(
+        vol.Coerce(float), vol.Range(min=1, max=MAX_DURATION)
+    ),
+    vol.Optional("interval", default=DEFAULT_INTERVAL): vol.All(
+        vol.Coerce(float), vol.Range(min=MIN_INTERVAL, max=MAX_INTERVAL)
+    ),
+}
+
+
+def cheapest_window(schedule: TOUSchedule, params: dict[str, Any]) -> dict[str, Any]:
+    """Run a cheapest-window search from service / WebSocket parameters."""
+    now = dt_util.now()
+
+    def _local(value: Any):
+        if value is None:
+            return None
+        return dt_util.as_local(value) if value.tzinfo else value.replace(tzinfo=now.tzinfo)
+
+    if "duration" not in params and "kwh_profile" not in params:
+        raise ValueError("Either duration or kwh_profile is required")
+    window = find_cheapest_window(
+        schedule.compiled,
+        now,
+        params.get("duration"),
+        horizon=params.get("horizon", DEFAULT_HORIZON_SLOTS),
+        earliest_start=_local(params.get("earliest_start")),
+        latest_end=_local(params.get("latest_end")),
+        kwh_profile=params.get("kwh_profile"),
+    )
+    if window is None:
+        return {"found": False}
+    return {"found": True, **window.as_dict()}
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register integration services (once)."""
+    if hass.services.has_service(DOMAIN, "find_cheapest_window"):
+        return
+
+    async def handle_find_cheapest_window(call: ServiceCall) -> ServiceResponse:
+        """Service: cheapest contiguous window for load scheduling."""
+        entry_data = get_entry_data(hass, call.data.get("entry_id"))
+        try:
+            return cheapest_window(entry_data["schedule"], dict(call.data))
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+
+    hass.services.async_register(
+        DOMAIN,
+        "find_cheapest_window",
+        handle_find_cheapest_window,
+        schema=vol.Schema({**CHEAPEST_WINDOW_FIELDS, **ENTRY_ID_FIELD}),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Service: capture the event loop for a while (see profiler.py)."""
+        try:
+            session = async_start_profile(
+                hass,
+                call.data.get("mode", "sample"),
+                call.data.get("duration", DEFAULT_DURATION),
+                call.data.get("interval", DEFAULT_INTERVAL),
+            )
+        except ValueError as err:
+            raise HomeAssistantError(str(err)) from err
+        return session.as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        handle_profile,
+        schema=vol.Schema(PROFILE_FIELDS),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,157 @@
+"""Offline simulator for Solarseed TOU.
+
+Prices a recorded load profile under one or more rate plans without a
+running Home Assistant instance — the same YAML the calculator exports is
+accepted as a plan:
+
+    python -m custom_components.solarseed_tou.simulator \\
+        --load usage.csv --plan schedule7.yaml --plan schedule32.yaml
+
+The load CSV has one ``timestamp,kwh`` row per interval (ISO-8601 local
+timestamps; a header row is optional).  With many plans the pricing is
+spread across a process pool; each worker receives the decomposed load
+once, not once per plan.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .compare import (
+    IntervalData,
+    Plan,
+    PlanCost,
+    compare_plans,
+    decompose,
+    parse_samples,
+    price_plan,
+)
+
+# Fan plans out to worker processes only when there are enough of them to
+# amortize process start-up and shipping the decomposition to each worker.
+PARALLEL_THRESHOLD = 8
+
+# The decomposed load, set once in each pool worker
+_worker_data: IntervalData | None = None
+
+
+def load_intervals_csv(path: str | Path) -> list[tuple[datetime, float]]:
+    """Read ``timestamp,kwh`` rows from a CSV file, skipping a header row."""
+    rows = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.reader(fh):
+            if len(row) < 2 or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            try:
+                float(row[1])
+            except ValueError:
+                continue  # header
+            rows.append((row[0].strip(), row[1]))
+    return parse_samples(rows)
+
+
+def load_plan_yaml(path: str | Path) -> dict[str, Any]:
+    """Read a calculator YAML export (optionally wrapped in ``tou_metering:``)."""
+    from .rate_yaml import load_yaml, unwrap_config
+
+    with open(path, encoding="utf-8") as fh:
+        parsed = load_yaml(fh.read())
+    try:
+        return unwrap_config(parsed)
+    except ValueError as err:
+        raise ValueError(f"{path}: {err}") from err
+
+
+def _init_worker(data: IntervalData) -> None:
+    global _worker_data
+    _worker_data = data
+
+
+def _price_plan_job(job: tuple[str, Plan]) -> PlanCost:
+    """Process-pool entry point (must be module-level to be picklable)."""
+    assert _worker_data is not None
+    return price_plan(job[0], job[1], _worker_data)
+
+
+def compare_plans_parallel(
+    plans: Mapping[str, Plan],
+    data: IntervalData,
+    *,
+    parallel_threshold: int = PARALLEL_THRESHOLD,
+    max_workers: int | None = None,
+) -> list[PlanCost]:
+    """``compare_plans`` across a process pool once there are ``parallel_threshold`` plans.
+
+    Only for standalone use: forking from inside Home Assistant is unsafe.
+    """
+    if len(plans) < max(parallel_threshold, 2):
+        return compare_plans(plans, data)
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(data,)
+    ) as pool:
+        results = list(pool.map(_price_plan_job, plans.items()))
+    return sorted(results, key=lambda r: r.total)
+
+
+def format_report(results: list[PlanCost]) -> str:
+    """Render a plain-text comparison table, cheapest plan first."""
+    if not results:
+        return "No plans to compare."
+    months = list(results[0].monthly)
+    width = max(len(r.name) for r in results)
+    lines = [f"{'plan':<{width}}  {'kWh':>10}  {'energy $':>10}  {'fixed $':>9}  {'total $':>10}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<{width}}  {r.energy_kwh:>10.2f}  {r.energy_cost:>10.2f}"
+            f"  {r.fixed_cost:>9.2f}  {r.total:>10.2f}"
+        )
+    if len(results) > 1:
+        best, runner_up = results[0], results[1]
+        lines.append("")
+        lines.append(
+            f"Cheapest: {best.name} (saves ${runner_up.total - best.total:.2f} "
+            f"vs {runner_up.name} over {len(months)} month(s))"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare TOU rate plans over a recorded load profile."
+    )
+    parser.add_argument("--load", required=True, help="CSV of timestamp,kwh rows")
+    parser.add_argument(
+        "--plan", action="append", required=True,
+        help="Plan YAML file (repeatable); NAME=path overrides the plan name",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    plans: dict[str, dict[str, Any]] = {}
+    for spec in args.plan:
+        name, sep, path = spec.partition("=")
+        if not sep:
+            name, path = Path(spec).stem, spec
+        plans[name] = load_plan_yaml(path)
+
+    data = decompose(load_intervals_csv(args.load))
+    results = compare_plans_parallel(plans, data, max_workers=args.workers)
+
+    if args.json:
+        print(json.dumps([r.as_dict() for r in results], indent=2))
+    else:
+        print(format_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
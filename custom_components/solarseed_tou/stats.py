@@ -0,0 +1,141 @@
+"""Hot-path counters and latency histograms for Solarseed TOU.
+
+Each entry keeps one EntryStats: fixed-bucket latency histograms for the
+three stages of handling a source sample, shared by the entry's sensors,
+
+    ingest   parsing, mode detection, resets and accumulation
+    price    the rate lookup for one priced sample
+    publish  rebuilding the state and writing it
+
+and one EntityStats per sensor counting samples, dropped samples by reason
+and state writes.  Every accumulator sees the same source stream, so the
+entry's source figures are the largest count of any of its sensors.
+Counters see every sample; latency is measured on one sample in
+LATENCY_SAMPLE_EVERY, which keeps the always-on cost to a few hundred
+nanoseconds per sample.  Exposed through ``solarseed_tou/stats`` and the
+(disabled by default) diagnostic sensors.
+"""
+from __future__ import annotations
+
+import bisect
+from typing import Any
+
+# Histogram bucket upper bounds, in microseconds; a last bucket catches the rest
+LATENCY_BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 20000)
+_BOUNDS_NS = tuple(b * 1000 for b in LATENCY_BUCKETS_US)
+
+STAGES = ("ingest", "price", "publish")
+
+# Latency is measured on samples whose count is a multiple of this (power of two)
+LATENCY_SAMPLE_EVERY = 16
+LATENCY_SAMPLE_MASK = LATENCY_SAMPLE_EVERY - 1
+
+
+class LatencyHistogram:
+    """Counts of durations per fixed bucket, plus their sum and maximum."""
+
+    __slots__ = ("counts", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        """Initialize empty."""
+        self.counts = [0] * (len(_BOUNDS_NS) + 1)
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        """Add one duration in nanoseconds."""
+        self.counts[bisect.bisect_left(_BOUNDS_NS, ns)] += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @property
+    def count(self) -> int:
+        """Number of recorded durations."""
+        return sum(self.counts)
+
+    def percentile(self, pct: float) -> float | None:
+        """Upper bound (µs) of the bucket holding the ``pct`` percentile.
+
+        The overflow bucket reports the maximum seen.
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = pct / 100 * total
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS_US, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(bound)
+        return round(self.max_ns / 1000, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for the WebSocket API and diagnostics."""
+        count = self.count
+        return {
+            "count": count,
+            "mean_us": round(self.total_ns / count / 1000, 3) if count else None,
+            "max_us": round(self.max_ns / 1000, 3),
+            "p50_us": self.percentile(50),
+            "p95_us": self.percentile(95),
+            "p99_us": self.percentile(99),
+            "buckets_us": [*LATENCY_BUCKETS_US, None],
+            "counts": list(self.counts),
+        }
+
+
+# Counters of the source stream, as opposed to the sensor's own writes
+SOURCE_COUNTERS = ("samples", "unavailable", "unparseable", "negative_delta", "gap")
+
+
+class EntityStats:
+    """Per-sensor sample and state-write counters."""
+
+    __slots__ = (*SOURCE_COUNTERS, "writes")
+
+    def __init__(self) -> None:
+        """Initialize at zero."""
+        self.samples = 0         # source states received
+        self.unavailable = 0     # unknown / unavailable states
+        self.unparseable = 0     # states that are not numbers
+        self.negative_delta = 0  # energy meter went backwards (meter reset)
+        self.gap = 0             # power readings more than an hour apart
+        self.writes = 0          # state writes
+
+    def as_dict(self) -> dict[str, int]:
+        """Serialize the counters."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class EntryStats:
+    """One entry's latency histograms and its sensors' counters."""
+
+    def __init__(self) -> None:
+        """Initialize with empty histograms and no sensors."""
+        self.ingest = LatencyHistogram()
+        self.price = LatencyHistogram()
+        self.publish = LatencyHistogram()
+        self.entities: dict[str, EntityStats] = {}
+
+    def add(self, unique_id: str, stats: EntityStats) -> None:
+        """Attach a sensor's counters."""
+        self.entities[unique_id] = stats
+
+    def source(self) -> dict[str, int]:
+        """Source sample counters (largest of any sensor) and total state writes."""
+        counts = dict.fromkeys(EntityStats.__slots__, 0)
+        for stats in self.entities.values():
+            for name in SOURCE_COUNTERS:
+                counts[name] = max(counts[name], getattr(stats, name))
+            counts["writes"] += stats.writes
+        return counts
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize everything."""
+        return {
+            "latency": {stage: getattr(self, stage).as_dict() for stage in STAGES},
+            "latency_sample_every": LATENCY_SAMPLE_EVERY,
+            "source": self.source(),
+            "entities": {uid: stats.as_dict() for uid, stats in self.entities.items()},
+        }
@@ -1,6 +1,8 @@
 """Persistent storage for Solarseed TOU configuration."""
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 from typing import Any
 
@@ -10,6 +12,7 @@ from homeassistant.helpers.storage import Store
 from .const import (
     DOMAIN,
     STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
     STORAGE_VERSION,
     DEFAULT_TIERS,
     DEFAULT_SEASON,
@@ -71,13 +74,55 @@ def _migrate_v1_to_v2(config: dict[str, Any]) -> dict[str, Any]:
     return config
 
 
+def _config_digest(config: dict[str, Any]) -> str:
+    """Hash the canonical JSON form of a config (key order independent)."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def storage_key(entry_id: str | None) -> str:
+    """Return the Store key for a config entry's configuration."""
+    return f"{STORAGE_KEY}.{entry_id}" if entry_id else STORAGE_KEY
+
+
+async def async_migrate_shared_store(hass: HomeAssistant, entry_id: str) -> bool:
+    """Copy the legacy shared config into an entry's own namespace.
+
+    Config entry version 1 kept every entry's config in the single
+    ``STORAGE_KEY`` store.  Returns True if there was anything to copy;
+    removing the shared store is left to the caller.
+    """
+    legacy = await Store(hass, STORAGE_VERSION, STORAGE_KEY).async_load()
+    if legacy is None:
+        return False
+    target = Store(hass, STORAGE_VERSION, storage_key(entry_id))
+    if await target.async_load() is None:
+        await target.async_save(legacy)
+        _LOGGER.info("Solarseed TOU: migrated shared config to entry %s", entry_id)
+    return True
+
+
+async def async_remove_shared_store(hass: HomeAssistant) -> None:
+    """Delete the legacy shared config store."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY).async_remove()
+
+
 class TOUStorage:
-    """Manage persistent TOU configuration storage."""
+    """Manage persistent TOU configuration storage.
 
-    def __init__(self, hass: HomeAssistant) -> None:
-        """Initialize storage."""
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+    Writes are diff-aware: a save whose canonical content matches what is
+    already stored is skipped, and real changes go through the Store's
+    delayed save so bursts of edits become one write (SD cards on Pi
+    installs thank us).  ``async_flush`` writes a pending save at once and
+    must be called when the entry unloads.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str | None = None) -> None:
+        """Initialize storage for one config entry (shared legacy key if None)."""
+        self._store = Store(hass, STORAGE_VERSION, storage_key(entry_id))
         self._data: dict[str, Any] | None = None
+        self._digest: str | None = None  # digest of the last stored/scheduled config
+        self._pending = False  # a delayed save is scheduled
 
     async def async_load(self) -> dict[str, Any]:
         """Load configuration from storage, running migrations if needed."""
@@ -85,19 +130,49 @@ class TOUStorage:
         if self._data is None:
             _LOGGER.debug("No stored TOU config found, using defaults")
             self._data = _default_config("")
+            self._digest = None
         else:
+            self._digest = _config_digest(self._data)
             # Run migrations
             schema = self._data.get("_schema_version", 1)
             if schema < 2:
                 self._data = _migrate_v1_to_v2(self._data)
-                await self._store.async_save(self._data)
+                await self.async_save(self._data)
         return self._data
 
     async def async_save(self, data: dict[str, Any]) -> None:
-        """Save configuration to storage."""
+        """Save configuration, skipping the write if nothing changed."""
         data.setdefault("_schema_version", STORAGE_VERSION)
         self._data = data
-        await self._store.async_save(data)
+        digest = _config_digest(data)
+        if digest == self._digest:
+            _LOGGER.debug("Solarseed TOU: config unchanged, skipping storage write")
+            return
+        self._digest = digest
+        self._pending = True
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write a pending delayed save now (replaces the scheduled write)."""
+        if self._pending:
+            self._pending = False
+            await self._store.async_save(self._data)
+
+    @property
+    def digest(self) -> str:
+        """Canonical digest of the current config (keys derived caches)."""
+        return _config_digest(self._data or {})
+
+    async def async_remove(self) -> None:
+        """Delete this entry's stored config (cancels a pending delayed save)."""
+        self._pending = False
+        await self._store.async_remove()
+        self._data = None
+        self._digest = None
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data for the delayed save (evaluated at write time)."""
+        return self._data  # type: ignore[return-value]
 
     async def async_get_config(self) -> dict[str, Any]:
         """Get current config, loading if needed."""
@@ -106,9 +181,16 @@ class TOUStorage:
         return self._data  # type: ignore[return-value]
 
     async def async_update_config(self, updates: dict[str, Any]) -> dict[str, Any]:
-        """Merge updates into config and save."""
+        """Merge updates into config; only changed keys are marked and saved."""
         config = await self.async_get_config()
-        config.update(updates)
+        changed = {
+            key: value for key, value in updates.items()
+            if key not in config or config[key] != value
+        }
+        if not changed:
+            return config
+        config.update(changed)
+        _LOGGER.debug("Solarseed TOU: config keys changed: %s", sorted(changed))
         await self.async_save(config)
         return config
 
@@ -0,0 +1,359 @@
+"""WebSocket API for Solarseed TOU.
+
+Imported on first entry setup rather than with the integration, so that
+websocket_api and the plan-comparison / patch machinery stay off the
+integration's import path.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from . import async_apply_rate_history, get_entry_data
+from .compare import (
+    MAX_COMPARE_INTERVALS,
+    MAX_COMPARE_PLANS,
+    compare_plans,
+    decompose,
+    parse_samples,
+)
+from .compiled import MAX_TABLE_YEAR, MIN_TABLE_YEAR
+from .const import DOMAIN
+from .history import HISTORY_KEY, RateHistory
+from .patch import apply_patch, patch_schedule
+from .push import UpdateHub
+from .quote import parse_intervals, quote, unpack_intervals
+from .services import CHEAPEST_WINDOW_FIELDS, ENTRY_ID_FIELD, cheapest_window
+from .storage import TOUStorage
+
+
+@callback
+def async_register_websocket(hass: HomeAssistant) -> None:
+    """Register WebSocket commands for config read/write (once)."""
+
+    @websocket_api.websocket_command(
+        {vol.Required("type"): "solarseed_tou/get_config", **ENTRY_ID_FIELD}
+    )
+    @websocket_api.async_response
+    async def ws_get_config(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Return current TOU configuration."""
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+
+        storage: TOUStorage = entry_data["storage"]
+        config = await storage.async_get_config()
+        connection.send_result(msg["id"], config)
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/set_config",
+            vol.Required("config"): dict,
+            **ENTRY_ID_FIELD,
+        }
+    )
+    @websocket_api.async_response
+    async def ws_set_config(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Update TOU configuration (used by external tooling / automations)."""
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+
+        storage: TOUStorage = entry_data["storage"]
+        new_config = msg["config"]
+
+        # Validate and save
+        try:
+            history = RateHistory.from_config(new_config)
+        except Exception as err:
+            connection.send_error(msg["id"], "invalid_config", str(err))
+            return
+
+        await storage.async_save(new_config)
+        async_apply_rate_history(hass, entry_data, history)
+
+        connection.send_result(msg["id"], {
+            "success": True,
+            "warnings": [d.as_dict() for d in history.diagnostics],
+        })
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/patch_config",
+            vol.Required("ops"): [dict],
+            **ENTRY_ID_FIELD,
+        }
+    )
+    @websocket_api.async_response
+    async def ws_patch_config(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Apply JSON-patch style operations to the configuration.
+
+        Only the touched sections are re-validated and only the affected
+        parts of the compiled tables are rebuilt.  Configs with a dated
+        rate history are re-parsed in full.
+        """
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+
+        storage: TOUStorage = entry_data["storage"]
+        config = await storage.async_get_config()
+        try:
+            if HISTORY_KEY in config:
+                new_config, _ = apply_patch(config, msg["ops"])
+                schedule = None
+            else:
+                new_config, schedule, changes = patch_schedule(
+                    entry_data["schedule"], config, msg["ops"]
+                )
+            if schedule is None or HISTORY_KEY in new_config:
+                history = RateHistory.from_config(new_config)
+                changes = {"structure"}
+            else:
+                history = RateHistory.single(schedule, new_config)
+        except Exception as err:
+            connection.send_error(msg["id"], "invalid_config", str(err))
+            return
+
+        await storage.async_save(new_config)
+        async_apply_rate_history(hass, entry_data, history)
+
+        connection.send_result(msg["id"], {"success": True, "rebuilt": sorted(changes)})
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/compare_plans",
+            vol.Required("plans"): dict,
+            vol.Required("intervals"): list,
+        }
+    )
+    @websocket_api.async_response
+    async def ws_compare_plans(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Price one interval dataset under several plans (name → config dict).
+
+        ``intervals`` is a list of ``[iso_timestamp, kwh]`` rows.  Aware
+        timestamps are converted to HA local time before slot lookup.  At
+        most MAX_COMPARE_PLANS plans and MAX_COMPARE_INTERVALS rows.
+        """
+        configs, rows = msg["plans"], msg["intervals"]
+        if len(configs) > MAX_COMPARE_PLANS:
+            connection.send_error(
+                msg["id"], "invalid_format", f"at most {MAX_COMPARE_PLANS} plans per comparison"
+            )
+            return
+        if len(rows) > MAX_COMPARE_INTERVALS:
+            connection.send_error(
+                msg["id"], "invalid_format",
+                f"at most {MAX_COMPARE_INTERVALS} intervals per comparison",
+            )
+            return
+
+        def _prepare():
+            samples = [
+                (dt_util.as_local(ts) if ts.tzinfo else ts, kwh)
+                for ts, kwh in parse_samples(rows)
+            ]
+            plans = {name: RateHistory.from_config(cfg) for name, cfg in configs.items()}
+            return plans, decompose(samples)
+
+        try:
+            plans, data = await hass.async_add_executor_job(_prepare)
+        except Exception as err:
+            connection.send_error(msg["id"], "invalid_format", str(err))
+            return
+
+        results = await hass.async_add_executor_job(compare_plans, plans, data)
+        connection.send_result(
+            msg["id"],
+            {
+                "intervals": len(data),
+                "months": data.month_keys,
+                "plans": [r.as_dict() for r in results],
+            },
+        )
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/find_cheapest_window",
+            **CHEAPEST_WINDOW_FIELDS,
+            **ENTRY_ID_FIELD,
+        }
+    )
+    @callback
+    def ws_find_cheapest_window(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Return the cheapest contiguous window in the next 24–48 h."""
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+        try:
+            result = cheapest_window(entry_data["schedule"], msg)
+        except ValueError as err:
+            connection.send_error(msg["id"], "invalid_format", str(err))
+            return
+        connection.send_result(msg["id"], result)
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/get_rate_table",
+            vol.Optional("year"): vol.All(
+                vol.Coerce(int), vol.Range(min=MIN_TABLE_YEAR, max=MAX_TABLE_YEAR)
+            ),
+            vol.Optional("etag"): str,
+            **ENTRY_ID_FIELD,
+        }
+    )
+    @websocket_api.async_response
+    async def ws_get_rate_table(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Return a compiled year as RLE spans, or ``unchanged`` if the ETag matches.
+
+        Tables are cached per config and year; the ETag combines the config
+        digest and the year.
+        """
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+
+        year = msg.get("year") or dt_util.now().year
+        history: RateHistory = entry_data["history"]
+        tables: dict[int, tuple[str, dict[str, Any]]] = history.memo.setdefault(
+            "rate_table", {}
+        )
+        if year not in tables:
+            table = await hass.async_add_executor_job(history.rate_table, year)
+            etag = f"{entry_data['storage'].digest[:16]}-{year}"
+            tables[year] = (etag, table)
+        etag, table = tables[year]
+
+        if msg.get("etag") == etag:
+            connection.send_result(msg["id"], {"etag": etag, "unchanged": True})
+        else:
+            connection.send_result(msg["id"], {"etag": etag, "unchanged": False, **table})
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): "solarseed_tou/quote",
+            vol.Optional("intervals"): list,
+            vol.Optional("packed"): {
+                vol.Required("start"): str,
+                vol.Required("step"): vol.Coerce(int),
+                vol.Required("kwh"): list,
+            },
+            **ENTRY_ID_FIELD,
+        }
+    )
+    @websocket_api.async_response
+    async def ws_quote(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Price a batch of (start, end, kWh) blocks under the entry's rates.
+
+        Either ``intervals`` (``[start, end, kwh]`` rows) or ``packed``
+        (``start``, ``step`` seconds and a ``kwh`` list of consecutive
+        blocks).  Aware timestamps are converted to HA local time.
+        """
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+
+        if ("packed" in msg) == ("intervals" in msg):
+            connection.send_error(msg["id"], "invalid_format", "send either intervals or packed")
+            return
+        history = entry_data["history"]
+
+        def _local(ts):
+            return dt_util.as_local(ts) if ts.tzinfo else ts
+
+        def _parse_and_quote() -> dict[str, Any]:
+            if "packed" in msg:
+                packed = msg["packed"]
+                intervals = unpack_intervals(
+                    packed["start"], packed["step"], packed["kwh"], _local
+                )
+            else:
+                intervals = parse_intervals(msg["intervals"], _local)
+            return quote(history, intervals)
+
+        try:
+            result = await hass.async_add_executor_job(_parse_and_quote)
+        except ValueError as err:
+            connection.send_error(msg["id"], "invalid_format", str(err))
+            return
+        connection.send_result(msg["id"], result)
+
+    @websocket_api.websocket_command(
+        {vol.Required("type"): "solarseed_tou/stats", **ENTRY_ID_FIELD}
+    )
+    @callback
+    def ws_stats(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Return the entry's sample counters and latency histograms (see stats.py)."""
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+        hub = entry_data.get("hub")
+        connection.send_result(msg["id"], {
+            **entry_data["stats"].as_dict(),
+            "subscribers": hub.subscriber_count if hub else 0,
+        })
+
+    @websocket_api.websocket_command(
+        {vol.Required("type"): "solarseed_tou/subscribe", **ENTRY_ID_FIELD}
+    )
+    @callback
+    def ws_subscribe(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+    ) -> None:
+        """Push tier transitions, config changes and cost snapshots (see push.py)."""
+        entry_data = _ws_entry_data(hass, connection, msg)
+        if entry_data is None:
+            return
+        hub = entry_data.get("hub")
+        if hub is None:
+            hub = entry_data["hub"] = UpdateHub(hass, entry_data)
+        connection.send_result(msg["id"])
+        connection.subscriptions[msg["id"]] = hub.async_subscribe(
+            connection.send_message, msg["id"]
+        )
+
+    # Only register once
+    if not hass.data[DOMAIN].get("_ws_registered"):
+        websocket_api.async_register_command(hass, ws_get_config)
+        websocket_api.async_register_command(hass, ws_set_config)
+        websocket_api.async_register_command(hass, ws_patch_config)
+        websocket_api.async_register_command(hass, ws_compare_plans)
+        websocket_api.async_register_command(hass, ws_find_cheapest_window)
+        websocket_api.async_register_command(hass, ws_get_rate_table)
+        websocket_api.async_register_command(hass, ws_quote)
+        websocket_api.async_register_command(hass, ws_stats)
+        websocket_api.async_register_command(hass, ws_subscribe)
+        hass.data[DOMAIN]["_ws_registered"] = True
+
+
+def _ws_entry_data(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> dict[str, Any] | None:
+    """Resolve the entry a WebSocket message targets, sending an error if none."""
+    try:
+        return get_entry_data(hass, msg.get("entry_id"))
+    except HomeAssistantError as err:
+        connection.send_error(msg["id"], "not_found", str(err))
+        return None
@@ -0,0 +1,104 @@
+"""Home Assistant stubs for importing the integration outside Home Assistant.
+
+``install_stubs()`` registers lightweight ``homeassistant`` and
+``voluptuous`` modules (unless the real packages are loaded).  Used by
+conftest.py and by the benchmarks (benchmarks/_ha.py).
+"""
+from __future__ import annotations
+
+import sys
+import types
+from datetime import datetime, time
+from unittest.mock import MagicMock
+
+
+def _stub_module(name: str, **attrs) -> types.ModuleType:
+    """Create a stub module with optional attributes."""
+    mod = types.ModuleType(name)
+    for k, v in attrs.items():
+        setattr(mod, k, v)
+    sys.modules[name] = mod
+    return mod
+
+
+def _redact(data, keys):
+    """Mirror of diagnostics.async_redact_data: mask values of ``keys`` at any depth."""
+    if isinstance(data, list):
+        return [_redact(item, keys) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        k: "**REDACTED**" if k in keys else _redact(v, keys) for k, v in data.items()
+    }
+
+
+def install_stubs() -> None:
+    """Install lightweight stubs for homeassistant packages if not available."""
+    if "homeassistant" in sys.modules:
+        return  # already available (running inside HA test harness)
+
+    # voluptuous
+    vol = _stub_module("voluptuous")
+    vol.Schema = lambda *a, **kw: lambda x: x
+    vol.Optional = lambda *a, **kw: a[0] if a else None
+    vol.Required = lambda *a, **kw: a[0] if a else None
+    vol.All = lambda *a, **kw: a[0] if a else None
+    vol.Coerce = lambda t: t
+    vol.Range = lambda *a, **kw: lambda x: x
+    vol.In = lambda container: lambda x: x
+
+    # homeassistant top-level
+    ha = _stub_module("homeassistant")
+    _stub_module("homeassistant.components")
+    _stub_module("homeassistant.components.diagnostics",
+                 async_redact_data=_redact)
+    ws_mod = _stub_module("homeassistant.components.websocket_api")
+    ws_mod.websocket_command = lambda *a, **kw: lambda fn: fn
+    ws_mod.async_response = lambda fn: fn
+    ws_mod.async_register_command = lambda *a, **kw: None
+    _stub_module("homeassistant.components.sensor",
+                 SensorDeviceClass=MagicMock(),
+                 SensorEntity=type("SensorEntity", (), {
+                     "async_write_ha_state": lambda self: None,
+                 }),
+                 SensorStateClass=MagicMock())
+    _stub_module("homeassistant.config_entries",
+                 ConfigEntry=MagicMock())
+    _stub_module("homeassistant.const",
+                 EVENT_HOMEASSISTANT_STOP="homeassistant_stop",
+                 EntityCategory=MagicMock(),
+                 UnitOfEnergy=types.SimpleNamespace(
+                     KILO_WATT_HOUR="kWh", WATT_HOUR="Wh", MEGA_WATT_HOUR="MWh"),
+                 UnitOfPower=types.SimpleNamespace(WATT="W", KILO_WATT="kW"))
+    _stub_module("homeassistant.core",
+                 HomeAssistant=MagicMock(),
+                 ServiceCall=MagicMock(),
+                 ServiceResponse=dict,
+                 SupportsResponse=MagicMock(),
+                 callback=lambda fn: fn,
+                 Event=MagicMock(),
+                 State=MagicMock())
+    _stub_module("homeassistant.exceptions",
+                 HomeAssistantError=type("HomeAssistantError", (Exception,), {}))
+    _stub_module("homeassistant.helpers")
+    _stub_module("homeassistant.helpers.config_validation",
+                 datetime=lambda v: v)
+    _stub_module("homeassistant.helpers.entity_platform",
+                 AddEntitiesCallback=MagicMock())
+    _stub_module("homeassistant.helpers.dispatcher",
+                 async_dispatcher_connect=MagicMock(),
+                 async_dispatcher_send=MagicMock())
+    _stub_module("homeassistant.helpers.event",
+                 async_call_later=MagicMock(),
+                 async_track_point_in_time=MagicMock(),
+                 async_track_state_change_event=MagicMock(),
+                 async_track_time_interval=MagicMock())
+    _stub_module("homeassistant.helpers.restore_state",
+                 RestoreEntity=type("RestoreEntity", (), {}))
+    _stub_module("homeassistant.helpers.storage",
+                 Store=MagicMock())
+    _stub_module("homeassistant.util")
+    _stub_module("homeassistant.util.dt",
+                 now=lambda: datetime.now(),
+                 as_local=lambda d: d.astimezone(),
+                 start_of_local_day=lambda d: datetime.combine(d, time()))
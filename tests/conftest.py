@@ -1,79 +1,21 @@
 """Shared fixtures for Solarseed TOU tests.
 
-Stubs out Home Assistant and voluptuous so that pure-logic modules
-(schedule, holiday, const, storage helpers) can be imported without
-the full HA runtime.
+Stubs out Home Assistant and voluptuous (_ha_stubs.py, also used by the
+benchmarks) so that pure-logic modules (schedule, holiday, const,
+storage helpers) can be imported without the full HA runtime.
 """
 from __future__ import annotations
 
-import sys
-import types
+import copy
 from datetime import datetime
-from unittest.mock import MagicMock
 
 import pytest
 
 # ── Stub external dependencies before any custom_components import ──
 
-def _stub_module(name: str, **attrs) -> types.ModuleType:
-    """Create a stub module with optional attributes."""
-    mod = types.ModuleType(name)
-    for k, v in attrs.items():
-        setattr(mod, k, v)
-    sys.modules[name] = mod
-    return mod
-
-
-def _ensure_stubs():
-    """Install lightweight stubs for homeassistant packages if not available."""
-    if "homeassistant" in sys.modules:
-        return  # already available (running inside HA test harness)
-
-    # voluptuous
-    vol = _stub_module("voluptuous")
-    vol.Schema = lambda *a, **kw: lambda x: x
-    vol.Optional = lambda *a, **kw: a[0] if a else None
-    vol.Required = lambda *a, **kw: a[0] if a else None
-
-    # homeassistant top-level
-    ha = _stub_module("homeassistant")
-    _stub_module("homeassistant.components")
-    ws_mod = _stub_module("homeassistant.components.websocket_api")
-    ws_mod.websocket_command = lambda *a, **kw: lambda fn: fn
-    ws_mod.async_response = lambda fn: fn
-    ws_mod.async_register_command = lambda *a, **kw: None
-    _stub_module("homeassistant.components.sensor",
-                 SensorDeviceClass=MagicMock(),
-                 SensorEntity=type("SensorEntity", (), {}),
-                 SensorStateClass=MagicMock())
-    _stub_module("homeassistant.config_entries",
-                 ConfigEntry=MagicMock())
-    _stub_module("homeassistant.const",
-                 UnitOfEnergy=MagicMock(),
-                 UnitOfPower=MagicMock())
-    _stub_module("homeassistant.core",
-                 HomeAssistant=MagicMock(),
-                 callback=lambda fn: fn,
-                 Event=MagicMock(),
-                 State=MagicMock())
-    _stub_module("homeassistant.helpers")
-    _stub_module("homeassistant.helpers.entity_platform",
-                 AddEntitiesCallback=MagicMock())
-    _stub_module("homeassistant.helpers.dispatcher",
-                 async_dispatcher_connect=MagicMock(),
-                 async_dispatcher_send=MagicMock())
-    _stub_module("homeassistant.helpers.event",
-                 async_track_state_change_event=MagicMock())
-    _stub_module("homeassistant.helpers.restore_state",
-                 RestoreEntity=type("RestoreEntity", (), {}))
-    _stub_module("homeassistant.helpers.storage",
-                 Store=MagicMock())
-    _stub_module("homeassistant.util")
-    _stub_module("homeassistant.util.dt",
-                 now=lambda: datetime.now())
-
-
-_ensure_stubs()
+from tests._ha_stubs import install_stubs
+
+install_stubs()
 
 # Now safe to import custom_components
 from custom_components.solarseed_tou.schedule import TOUSchedule
@@ -175,6 +117,44 @@ def pge_schedule(pge_config) -> TOUSchedule:
     return TOUSchedule.from_dict(pge_config)
 
 
+class FakeStore:
+    """Minimal stand-in for homeassistant.helpers.storage.Store.
+
+    A delayed save stays pending until ``fire_delayed()``; like the real
+    Store, ``async_save`` and ``async_remove`` cancel it.
+    """
+
+    def __init__(self, data=None):
+        self.data = data
+        self.saves = 0
+        self.delayed_saves = 0
+        self.last_delay = None
+        self.pending = None  # data function of the pending delayed save
+
+    async def async_load(self):
+        return copy.deepcopy(self.data)
+
+    async def async_save(self, data):
+        self.saves += 1
+        self.pending = None
+        self.data = copy.deepcopy(data)
+
+    def async_delay_save(self, data_func, delay=0):
+        self.delayed_saves += 1
+        self.last_delay = delay
+        self.pending = data_func
+
+    def fire_delayed(self):
+        """Run the pending delayed save, as the Store's timer would."""
+        if self.pending is not None:
+            self.data = copy.deepcopy(self.pending())
+            self.pending = None
+
+    async def async_remove(self):
+        self.pending = None
+        self.data = None
+
+
 def make_dt(year: int, month: int, day: int, hour: int = 12) -> datetime:
     """Shorthand for creating a test datetime."""
     return datetime(year, month, day, hour, 0, 0)
@@ -0,0 +1,30 @@
+"""Tests for the benchmark suite — every case runs and regressions are flagged."""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from benchmarks.cases import BENCHMARKS
+from benchmarks.run import compare, main, measure
+
+
+@pytest.mark.parametrize("bench", BENCHMARKS, ids=lambda b: b.name)
+def test_case_runs(bench):
+    assert measure(bench, scale=1e-5, repeat=1) > 0
+
+
+def test_compare_flags_only_regressions():
+    baseline = {"a": 100.0, "b": 100.0}
+    regressions = compare({"a": 130.0, "b": 110.0, "new": 5.0}, baseline, 0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("a:")
+
+
+def test_save_then_compare(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    assert main(["resolve_holidays_for_year", "--repeat", "1", "--save", str(path)]) == 0
+    saved = json.loads(path.read_text())
+    assert set(saved["results"]) == {"resolve_holidays_for_year"}
+    saved["results"]["resolve_holidays_for_year"] /= 100
+    path.write_text(json.dumps(saved))
+    assert main(["resolve_holidays_for_year", "--repeat", "1", "--compare", str(path)]) == 1
@@ -0,0 +1,113 @@
+"""Tests for billing.py — billing-cycle boundaries and fixed-charge proration."""
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from custom_components.solarseed_tou.billing import (
+    AVERAGE_CYCLE_DAYS,
+    BillingCalendar,
+    cycle_boundaries,
+    prorated_fixed,
+    read_date,
+)
+from custom_components.solarseed_tou.schedule import BillingCycleConfig, TOUSchedule
+from tests.conftest import _make_config
+
+
+class TestReadDate:
+    """Read-day clamping."""
+
+    def test_normal_day(self):
+        assert read_date(2025, 3, 15) == date(2025, 3, 15)
+
+    def test_clamps_to_short_month(self):
+        assert read_date(2025, 2, 31) == date(2025, 2, 28)
+        assert read_date(2024, 2, 31) == date(2024, 2, 29)
+
+
+class TestCycleBoundaries:
+    """Boundary precomputation."""
+
+    def test_read_day_covers_a_year(self):
+        bounds = cycle_boundaries(BillingCycleConfig(read_day=15), date(2025, 3, 20))
+        assert bounds[0] == date(2025, 3, 15)
+        assert bounds[1] == date(2025, 4, 15)
+        assert bounds[-1] > date(2026, 3, 20)
+        assert bounds == sorted(bounds)
+
+    def test_start_on_read_day_begins_cycle(self):
+        bounds = cycle_boundaries(BillingCycleConfig(read_day=15), date(2025, 3, 15))
+        assert bounds[0] == date(2025, 3, 15)
+
+    def test_explicit_dates_override_rule(self):
+        config = BillingCycleConfig(
+            read_day=1,
+            read_dates=[date(2025, 3, 12), date(2025, 4, 10), date(2025, 5, 13)],
+        )
+        bounds = cycle_boundaries(config, date(2025, 4, 1))
+        assert bounds[:3] == [date(2025, 3, 12), date(2025, 4, 10), date(2025, 5, 13)]
+        # After the explicit list the read-day rule takes over again
+        assert bounds[3] == date(2025, 6, 1)
+
+    def test_explicit_dates_before_first_use_rule(self):
+        config = BillingCycleConfig(read_day=1, read_dates=[date(2025, 5, 13)])
+        bounds = cycle_boundaries(config, date(2025, 4, 20))
+        assert bounds[:3] == [date(2025, 4, 1), date(2025, 5, 1), date(2025, 5, 13)]
+
+
+class TestBillingCalendar:
+    """Cycle lookup."""
+
+    def test_cycle_for_mid_cycle(self):
+        cal = BillingCalendar(BillingCycleConfig(read_day=20), date(2025, 1, 5))
+        assert cal.cycle_for(date(2025, 1, 5)) == (date(2024, 12, 20), date(2025, 1, 20))
+
+    def test_cycle_for_boundary_day_starts_new_cycle(self):
+        cal = BillingCalendar(BillingCycleConfig(read_day=20), date(2025, 1, 5))
+        assert cal.cycle_for(date(2025, 1, 20)) == (date(2025, 1, 20), date(2025, 2, 20))
+
+    def test_cycle_for_beyond_horizon_recomputes(self):
+        cal = BillingCalendar(BillingCycleConfig(read_day=1), date(2025, 1, 5))
+        assert cal.cycle_for(date(2027, 6, 3)) == (date(2027, 6, 1), date(2027, 7, 1))
+
+
+class TestProration:
+    """Fixed-charge proration by cycle length."""
+
+    def test_average_cycle_is_full_charge(self):
+        assert prorated_fixed(12.0, date(2025, 1, 1), date(2025, 1, 1)) == 0.0
+        assert AVERAGE_CYCLE_DAYS == pytest.approx(30.4375)
+
+    def test_year_of_cycles_sums_to_twelve_charges(self):
+        cal = BillingCalendar(BillingCycleConfig(read_day=7), date(2025, 1, 7))
+        total = 0.0
+        start = date(2025, 1, 7)
+        for _ in range(12):
+            start, end = cal.cycle_for(start)
+            total += prorated_fixed(11.51, start, end)
+            start = end
+        assert total == pytest.approx(11.51 * 12, rel=0.01)
+
+
+class TestBillingCycleConfigParsing:
+    """billing_cycle section of the YAML config."""
+
+    def test_defaults_to_calendar_month(self, base_schedule):
+        assert base_schedule.billing_cycle.read_day == 1
+        assert base_schedule.billing_cycle.read_dates == []
+
+    def test_parses_and_round_trips(self, base_config):
+        base_config["billing_cycle"] = {"read_day": 17, "read_dates": ["2025-02-14"]}
+        sched = TOUSchedule.from_dict(base_config)
+        assert sched.billing_cycle.read_day == 17
+        assert sched.billing_cycle.read_dates == [date(2025, 2, 14)]
+        restored = TOUSchedule.from_dict(sched.to_dict())
+        assert restored.billing_cycle == sched.billing_cycle
+
+    def test_rejects_bad_read_day(self):
+        config = _make_config()
+        config["billing_cycle"] = {"read_day": 0}
+        with pytest.raises(ValueError, match="read_day"):
+            TOUSchedule.from_dict(config)
@@ -0,0 +1,96 @@
+"""Tests for checkpoint.py — accumulator checkpoint store."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from custom_components.solarseed_tou.checkpoint import (
+    MAX_READING_AGE,
+    AccumulatorCheckpoint,
+    reading_is_fresh,
+)
+from tests.conftest import FakeStore
+
+
+def _checkpoint(data=None) -> tuple[AccumulatorCheckpoint, FakeStore]:
+    checkpoint = AccumulatorCheckpoint(None, "entry")
+    store = FakeStore(data)
+    checkpoint._store = store
+    return checkpoint, store
+
+
+class TestReadingIsFresh:
+    """Stale meter readings must not be resumed from."""
+
+    def test_recent_reading(self):
+        now = datetime(2025, 3, 1, 12, 0)
+        assert reading_is_fresh((now - timedelta(minutes=5)).isoformat(), now)
+
+    def test_old_reading(self):
+        now = datetime(2025, 3, 1, 12, 0)
+        assert not reading_is_fresh((now - MAX_READING_AGE * 2).isoformat(), now)
+
+    def test_datetime_and_missing(self):
+        now = datetime(2025, 3, 1, 12, 0)
+        assert reading_is_fresh(now, now)
+        assert not reading_is_fresh(None, now)
+        assert not reading_is_fresh("garbage", now)
+
+    def test_future_reading_is_not_trusted(self):
+        now = datetime(2025, 3, 1, 12, 0)
+        assert not reading_is_fresh((now + timedelta(hours=2)).isoformat(), now)
+
+
+class TestAccumulatorCheckpoint:
+    """One read for all sensors, one atomic write per change."""
+
+    def test_save_and_restore_round_trip(self):
+        checkpoint, store = _checkpoint()
+        asyncio.run(checkpoint.async_load())
+        state = {"cost": 1.25, "last_energy": 100.0}
+        checkpoint.register("e_cost_today", lambda: dict(state))
+        asyncio.run(checkpoint.async_save())
+        assert store.saves == 1
+
+        restored, _ = _checkpoint(store.data)
+        asyncio.run(restored.async_load())
+        assert restored.restore("e_cost_today") == state
+        assert restored.restore("e_cost_today") is None  # handed out once
+
+    def test_unchanged_state_is_not_rewritten(self):
+        checkpoint, store = _checkpoint()
+        asyncio.run(checkpoint.async_load())
+        checkpoint.register("a", lambda: {"cost": 1.0})
+        asyncio.run(checkpoint.async_save())
+        asyncio.run(checkpoint.async_save())
+        assert store.saves == 1
+
+    def test_unrestored_sensors_are_kept(self):
+        checkpoint, store = _checkpoint({"sensors": {"a": {"cost": 1.0}, "b": {"cost": 2.0}}})
+        asyncio.run(checkpoint.async_load())
+        checkpoint.restore("a")
+        checkpoint.register("a", lambda: {"cost": 1.5})
+        asyncio.run(checkpoint.async_save())
+        assert store.data["sensors"] == {"a": {"cost": 1.5}, "b": {"cost": 2.0}}
+
+    def test_unregister(self):
+        checkpoint, _ = _checkpoint()
+        unregister = checkpoint.register("a", lambda: {"cost": 1.0})
+        unregister()
+        assert checkpoint.snapshot() == {}
+
+    def test_costs_read_without_a_snapshot(self):
+        checkpoint, _ = _checkpoint()
+        provider = MagicMock(return_value={"cost": 1.0})
+        unregister = checkpoint.register("a", provider, lambda: 1.0)
+        checkpoint.register("b", lambda: {"cost": 2.0})  # no cost reader
+        assert checkpoint.costs() == {"a": 1.0}
+        provider.assert_not_called()
+        unregister()
+        assert checkpoint.costs() == {}
+
+    def test_corrupt_checkpoint_is_ignored(self):
+        checkpoint, _ = _checkpoint({"sensors": "nope"})
+        asyncio.run(checkpoint.async_load())
+        assert checkpoint.restore("a") is None
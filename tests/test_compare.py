@@ -0,0 +1,145 @@
+"""Tests for compare.py and simulator.py — multi-plan cost comparison."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.solarseed_tou.compare import (
+    compare_plans,
+    decompose,
+    parse_samples,
+    price_plan,
+)
+from custom_components.solarseed_tou.schedule import TOUSchedule
+from custom_components.solarseed_tou.simulator import (
+    compare_plans_parallel,
+    format_report,
+    load_intervals_csv,
+    main,
+)
+from tests.conftest import _make_config
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _flat_config(rate: float, fixed: float = 0.0) -> dict:
+    return _make_config(
+        tiers={"flat": {"name": "Flat", "rate": rate}},
+        seasons={"all": {"name": "All", "months": list(range(1, 13)),
+                         "grid": {d: ["flat"] * 24 for d in DAYS}}},
+        holidays={"rate_tier": "flat", "standard": [], "custom": []},
+        fixed_monthly=fixed,
+    )
+
+
+def _hourly(start: datetime, hours: int, kwh: float = 1.0):
+    return [(start + timedelta(hours=h), kwh) for h in range(hours)]
+
+
+class TestDecompose:
+    """Shared timestamp decomposition."""
+
+    def test_month_keys_in_order(self):
+        data = decompose([(datetime(2025, 1, 31, 23), 1.0), (datetime(2025, 2, 1, 0), 2.0)])
+        assert data.month_keys == ["2025-01", "2025-02"]
+        assert data.months == [0, 1]
+        assert len(data) == 2
+
+    def test_parse_samples_accepts_iso_strings(self):
+        samples = parse_samples([["2025-01-08T10:00:00", "1.5"]])
+        assert samples == [(datetime(2025, 1, 8, 10), 1.5)]
+
+
+class TestPricePlan:
+    """Single-plan pricing matches the per-sample resolver."""
+
+    def test_matches_get_rate(self, pge_schedule):
+        samples = _hourly(datetime(2025, 1, 1), 24 * 60, kwh=0.7)
+        result = price_plan("pge", pge_schedule, decompose(samples))
+        expected = sum(kwh * pge_schedule.get_rate(ts) for ts, kwh in samples)
+        assert result.energy_cost == pytest.approx(expected)
+        assert result.energy_kwh == pytest.approx(0.7 * 24 * 60)
+
+    def test_fixed_charge_per_month(self):
+        samples = _hourly(datetime(2025, 1, 1), 24 * 59)  # Jan + Feb
+        result = price_plan("flat", _flat_config(0.10, fixed=10.0), decompose(samples))
+        assert result.fixed_cost == pytest.approx(20.0)
+        assert result.monthly["2025-01"] == pytest.approx(31 * 24 * 0.10 + 10.0)
+        assert result.annual[2025] == pytest.approx(result.total)
+
+    def test_spans_year_boundary(self):
+        samples = _hourly(datetime(2025, 12, 31, 22), 4)
+        result = price_plan("flat", _flat_config(0.10), decompose(samples))
+        assert set(result.annual) == {2025, 2026}
+        assert result.energy_cost == pytest.approx(0.40)
+
+    def test_rate_history_priced_by_version(self):
+        config = _flat_config(0.10, fixed=10.0)
+        config["rate_history"] = [{
+            "effective_from": "2025-01-15T12:00:00",
+            "tiers": {"flat": {"name": "Flat", "rate": 0.20}},
+            "fixed_monthly": 12.0,
+        }]
+        samples = _hourly(datetime(2025, 1, 1), 24 * 59)
+        result = price_plan("dated", config, decompose(samples))
+        before = 14 * 24 + 12
+        jan_energy = before * 0.10 + (31 * 24 - before) * 0.20
+        assert result.monthly["2025-01"] == pytest.approx(jan_energy + 10.0)
+        assert result.monthly["2025-02"] == pytest.approx(28 * 24 * 0.20 + 12.0)
+        assert result.fixed_cost == pytest.approx(22.0)
+
+
+class TestComparePlans:
+    """Multi-plan fan-out."""
+
+    def test_sorted_cheapest_first(self, base_config):
+        data = decompose(_hourly(datetime(2025, 1, 6), 24 * 7))
+        results = compare_plans(
+            {"tou": base_config, "flat": _flat_config(0.50), "cheap": _flat_config(0.01)},
+            data,
+        )
+        assert [r.name for r in results][0] == "cheap"
+        assert results[-1].name == "flat"
+
+    def test_accepts_schedule_objects(self, base_schedule):
+        data = decompose(_hourly(datetime(2025, 1, 6), 24))
+        results = compare_plans({"tou": base_schedule}, data)
+        assert results[0].energy_kwh == pytest.approx(24.0)
+
+
+class TestSimulator:
+    """Offline simulator CLI."""
+
+    def test_process_pool_matches_serial(self, base_config):
+        data = decompose(_hourly(datetime(2025, 6, 1), 24 * 10))
+        plans = {f"p{i}": _flat_config(0.05 + i / 100) for i in range(3)}
+        plans["tou"] = base_config
+        serial = compare_plans(plans, data)
+        pooled = compare_plans_parallel(plans, data, parallel_threshold=2, max_workers=2)
+        assert [r.as_dict() for r in serial] == [r.as_dict() for r in pooled]
+
+    def test_load_csv_skips_header(self, tmp_path):
+        path = tmp_path / "load.csv"
+        path.write_text("timestamp,kwh\n2025-01-08T10:00:00,1.25\n")
+        assert load_intervals_csv(path) == [(datetime(2025, 1, 8, 10), 1.25)]
+
+    def test_main_prints_report(self, tmp_path, capsys):
+        import yaml
+
+        load = tmp_path / "load.csv"
+        load.write_text("\n".join(
+            f"{ts.isoformat()},{kwh}" for ts, kwh in _hourly(datetime(2025, 1, 6), 48)
+        ))
+        cheap = tmp_path / "cheap.yaml"
+        cheap.write_text(yaml.safe_dump({"tou_metering": _flat_config(0.05)}))
+        dear = tmp_path / "dear.yaml"
+        dear.write_text(yaml.safe_dump(_flat_config(0.20)))
+
+        assert main(["--load", str(load), "--plan", str(cheap), "--plan", f"pricey={dear}"]) == 0
+        out = capsys.readouterr().out
+        assert "Cheapest: cheap" in out
+        assert "pricey" in out
+
+    def test_empty_report(self):
+        assert format_report([]) == "No plans to compare."
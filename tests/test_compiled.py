@@ -0,0 +1,162 @@
+"""Tests for compiled.py — per-year tier tables vs. the schedule resolver."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.solarseed_tou.compiled import SLOTS_PER_DAY, slot_of, slot_start
+from custom_components.solarseed_tou.schedule import ScheduleValidationError, TOUSchedule
+from tests.conftest import _make_config, make_dt
+
+
+def _every_hour(year: int):
+    dt = datetime(year, 1, 1)
+    while dt.year == year:
+        yield dt
+        dt += timedelta(hours=1)
+
+
+class TestSlots:
+    """Slot decomposition helpers."""
+
+    def test_first_slot_of_year(self):
+        assert slot_of(datetime(2025, 1, 1, 0)) == (2025, 0)
+
+    def test_slot_counts_days_and_hours(self):
+        assert slot_of(datetime(2025, 1, 2, 5)) == (2025, SLOTS_PER_DAY + 5)
+
+    def test_slot_start_round_trip(self):
+        dt = datetime(2024, 12, 31, 23)  # leap year, last slot
+        year, slot = slot_of(dt)
+        assert slot == 366 * 24 - 1
+        assert slot_start(year, slot) == dt
+
+    def test_slot_start_rolls_into_next_year(self):
+        assert slot_start(2025, 365 * 24) == datetime(2026, 1, 1, 0)
+
+
+class TestCompiledSchedule:
+    """The compiled table must agree with get_tier_id / get_rate."""
+
+    def test_table_length(self, base_schedule):
+        assert len(base_schedule.compiled.year_table(2025)) == 365 * 24
+        assert len(base_schedule.compiled.year_table(2024)) == 366 * 24
+
+    def test_compiled_is_cached(self, base_schedule):
+        assert base_schedule.compiled is base_schedule.compiled
+
+    def test_matches_resolver_for_full_year(self, pge_schedule):
+        compiled = pge_schedule.compiled
+        for dt in _every_hour(2026):
+            assert compiled.tier_id(dt) == pge_schedule.get_tier_id(dt)
+            assert compiled.rate(dt) == pge_schedule.get_rate(dt)
+
+    def test_holiday_override(self, base_schedule):
+        # Christmas 2025 is a Thursday; hour 10 is normally on-peak
+        assert base_schedule.compiled.tier_id(make_dt(2025, 12, 25, 10)) == "off-peak"
+
+    def test_short_row_and_uncovered_month_fallbacks(self):
+        config = _make_config(seasons={
+            "summer": {
+                "name": "Summer",
+                "months": [6, 7, 8],
+                "grid": {"mon": ["on-peak"] * 12},  # short row, other days missing
+            },
+        })
+        sched = TOUSchedule.from_dict(config)
+        for dt in _every_hour(2025):
+            assert sched.compiled.tier_id(dt) == sched.get_tier_id(dt)
+
+    def test_unknown_tier_id_is_rejected(self):
+        config = _make_config(seasons={
+            "all": {
+                "name": "All",
+                "months": list(range(1, 13)),
+                "grid": {d: ["bogus"] * 24 for d in
+                         ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]},
+            },
+        }, holidays={"rate_tier": "off-peak", "standard": [], "custom": []})
+        with pytest.raises(ScheduleValidationError, match="bogus"):
+            TOUSchedule.from_dict(config)
+
+    def test_no_seasons_uses_first_tier(self):
+        sched = TOUSchedule.from_dict(_make_config(seasons={}))
+        assert sched.compiled.tier_id(make_dt(2025, 3, 4, 12)) == "off-peak"
+
+    def test_no_tiers_compiles_to_zero_rate(self):
+        sched = TOUSchedule.from_dict({"energy_sensor": "sensor.test", "tiers": {}})
+        dt = make_dt(2025, 3, 4, 12)
+        assert sched.compiled.tier_id(dt) == sched.get_tier_id(dt)
+        assert sched.compiled.rate(dt) == 0.0
+
+    def test_detached_builds_do_not_touch_the_original(self):
+        compiled = TOUSchedule.from_dict(_make_config()).compiled
+        compiled.year_table(2025)
+        private = compiled.detached()
+        fresh = TOUSchedule.from_dict(_make_config()).compiled
+        assert private.year_table(2026) == fresh.year_table(2026)
+        assert private.year_table(2025) is compiled.year_table(2025)  # shared
+        assert compiled.cached_years() == [2025]
+
+    def test_rates_use_formula(self, pge_schedule):
+        compiled = pge_schedule.compiled
+        for tid in pge_schedule.tiers:
+            assert compiled.rates[compiled.index[tid]] == pytest.approx(
+                pge_schedule.compute_effective_rate(tid)
+            )
+
+
+class TestTransitionIndex:
+    """next_transition must match get_next_rate_change."""
+
+    def test_matches_reference_for_a_year(self, base_schedule):
+        compiled = base_schedule.compiled
+        for dt in _every_hour(2025):
+            expected = base_schedule.get_next_rate_change(dt)
+            actual = compiled.next_transition(dt)
+            if expected is None:
+                # Reference only looks at today + tomorrow
+                assert actual is None or actual[0] >= dt.replace(hour=0) + timedelta(days=2)
+            else:
+                assert actual is not None
+                assert actual[0] == expected[0]
+                assert compiled.tier_ids[actual[1]] == expected[1]
+
+    def test_crosses_year_boundary(self):
+        config = _make_config(seasons={
+            "winter": {"name": "Winter", "months": [1],
+                       "grid": {d: ["on-peak"] * 24 for d in
+                                ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]}},
+            "rest": {"name": "Rest", "months": list(range(2, 13)),
+                     "grid": {d: ["off-peak"] * 24 for d in
+                              ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]}},
+        }, holidays={"rate_tier": "off-peak", "standard": [], "custom": []})
+        sched = TOUSchedule.from_dict(config)
+        start, idx = sched.compiled.next_transition(datetime(2025, 12, 31, 20))
+        assert start == datetime(2026, 1, 1, 0)
+        assert sched.compiled.tier_ids[idx] == "on-peak"
+
+    def test_flat_schedule_has_no_transition(self):
+        config = _make_config(
+            seasons={"all": {"name": "All", "months": list(range(1, 13)),
+                             "grid": {d: ["off-peak"] * 24 for d in
+                                      ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]}}},
+        )
+        sched = TOUSchedule.from_dict(config)
+        assert sched.compiled.next_transition(datetime(2025, 3, 1, 12)) is None
+
+    def test_transitions_are_compact(self, pge_schedule):
+        trans = pge_schedule.compiled.transitions(2025)
+        assert trans.typecode == "H" and trans.itemsize == 2
+
+    def test_slot_rates_cross_year(self, base_schedule):
+        rates = base_schedule.compiled.slot_rates(2025, 365 * 24 - 2, 4)
+        assert len(rates) == 4
+
+    def test_rle_year_expands_to_table(self, pge_schedule):
+        compiled = pge_schedule.compiled
+        spans = compiled.rle_year(2025)
+        expanded = b"".join(bytes([idx]) * length for _, length, idx in spans)
+        assert expanded == compiled.year_table(2025)
+        assert all(a[2] != b[2] for a, b in zip(spans, spans[1:]))
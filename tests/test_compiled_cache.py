@@ -0,0 +1,100 @@
+"""Tests for compiled_cache.py — binary round trip of compiled tables."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.solarseed_tou.compiled_cache import (
+    CompiledCache,
+    decode_cache,
+    encode_cache,
+)
+from custom_components.solarseed_tou.schedule import TOUSchedule
+from tests.conftest import _make_config
+
+DIGEST = "ab" * 32
+OTHER = "cd" * 32
+
+
+def _fresh(config=None) -> TOUSchedule:
+    return TOUSchedule.from_dict(config or _make_config())
+
+
+class TestCacheFormat:
+    """encode_cache / decode_cache."""
+
+    def test_round_trip(self):
+        compiled = _fresh().compiled
+        blob = encode_cache(compiled, DIGEST, range(2025, 2027))
+        years = decode_cache(blob, DIGEST, len(compiled.tier_ids))
+        assert set(years) == {2025, 2026}
+        for year, (table, trans, holidays) in years.items():
+            assert table == compiled.year_table(year)
+            assert trans == compiled.transitions(year)
+            assert holidays == compiled.holidays(year)
+
+    def test_compact(self):
+        compiled = _fresh().compiled
+        blob = encode_cache(compiled, DIGEST, range(2025, 2026))
+        assert len(blob) < 365 * 24 + 2 * len(compiled.transitions(2025)) + 200
+
+    def test_digest_mismatch_is_a_miss(self):
+        compiled = _fresh().compiled
+        blob = encode_cache(compiled, DIGEST, range(2025, 2026))
+        assert decode_cache(blob, OTHER, len(compiled.tier_ids)) is None
+
+    def test_tier_count_mismatch_is_a_miss(self):
+        compiled = _fresh().compiled
+        blob = encode_cache(compiled, DIGEST, range(2025, 2026))
+        assert decode_cache(blob, DIGEST, len(compiled.tier_ids) + 1) is None
+
+    def test_truncated_blob_is_a_miss(self):
+        compiled = _fresh().compiled
+        blob = encode_cache(compiled, DIGEST, range(2025, 2026))
+        assert decode_cache(blob[:-10], DIGEST, len(compiled.tier_ids)) is None
+        assert decode_cache(b"junk", DIGEST, len(compiled.tier_ids)) is None
+
+
+class TestPrimeYear:
+    """A primed CompiledSchedule must behave like a freshly built one."""
+
+    def test_primed_lookups_match(self):
+        built = _fresh().compiled
+        blob = encode_cache(built, DIGEST, range(2025, 2027))
+        primed = _fresh().compiled
+        for year, parts in decode_cache(blob, DIGEST, len(primed.tier_ids)).items():
+            primed.prime_year(year, *parts)
+        assert primed._tables.keys() == {2025, 2026}
+        assert primed.year_table(2025) == built.year_table(2025)
+        assert primed.transitions(2026) == built.transitions(2026)
+
+    def test_wrong_length_rejected(self):
+        compiled = _fresh().compiled
+        with pytest.raises(ValueError):
+            compiled.prime_year(2024, bytes(365 * 24), [], frozenset())  # leap year
+
+
+class TestRebuild:
+    """CompiledCache rebuilds off the live compile."""
+
+    def test_executor_builds_a_private_copy(self, tmp_path):
+        hass = MagicMock()
+        hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+        (tmp_path / ".storage").mkdir()
+        compiled = _fresh().compiled
+        seen_in_executor = []
+
+        async def executor(fn, *args):
+            seen_in_executor.append(compiled.cached_years())
+            return fn(*args)
+
+        hass.async_add_executor_job = executor
+        cache = CompiledCache(hass, "abc")
+        cache._latest = DIGEST
+        asyncio.run(cache._async_rebuild(compiled, DIGEST))
+        assert seen_in_executor[0] == []  # nothing built into the live compile there
+        assert compiled.cached_years() == list(cache._years())  # primed on the loop
+        assert any((tmp_path / ".storage").iterdir())  # and written
+
@@ -0,0 +1,76 @@
+"""Tests for diagnostics.py — the config-entry diagnostics dump."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from custom_components.solarseed_tou.const import DOMAIN
+from custom_components.solarseed_tou.diagnostics import (
+    async_get_config_entry_diagnostics,
+    build_diagnostics,
+)
+from custom_components.solarseed_tou.history import RateHistory
+from custom_components.solarseed_tou.stats import EntityStats, EntryStats
+
+
+def _entry_data(config):
+    history = RateHistory.from_config(config)
+    schedule = history.schedules[0]
+    checkpoint = MagicMock()
+    checkpoint.snapshot.return_value = {
+        "abc_cost_today": {"cost": 1.25, "sensor_mode": "power", "unit_multiplier": 0.001},
+    }
+    stats = EntryStats()
+    stats.add("abc_cost_today", EntityStats())
+    return {
+        "storage": MagicMock(digest="f" * 64),
+        "history": history,
+        "schedule": schedule,
+        "checkpoint": checkpoint,
+        "stats": stats,
+    }
+
+
+def _entry():
+    entry = MagicMock(entry_id="abc", title="TOU Metering (sensor.house_power)")
+    entry.data = {"energy_sensor": "sensor.house_power"}
+    entry.options = {"checkpoint_interval": 60}
+    return entry
+
+
+class TestDiagnostics:
+    """Contents and redaction."""
+
+    def test_dump(self, pge_config):
+        data = build_diagnostics(_entry(), _entry_data(pge_config))
+        json.dumps(data)  # serializable as downloaded
+        assert data["config_digest"] == "f" * 64
+        assert {t["id"] for t in data["tiers"]} >= {"off-peak", "mid-peak", "on-peak"}
+        assert data["transitions"] and "at" in data["transitions"][0]
+        assert data["compiled_years"]
+        assert set(data["holidays"]) == {str(y) for y in data["compiled_years"]}
+        assert data["accumulators"]["abc_cost_today"]["unit_multiplier"] == 0.001
+        assert data["stats"]["entities"]["abc_cost_today"]["samples"] == 0
+
+    def test_source_entity_redacted(self, pge_config):
+        data = build_diagnostics(_entry(), _entry_data(pge_config))
+        text = json.dumps(data)
+        assert "sensor.house_power" not in text and pge_config["energy_sensor"] not in text
+        assert data["entry"]["data"]["energy_sensor"] == "**REDACTED**"
+
+    def test_title_redacted(self, pge_config):
+        # config_flow titles entries "TOU Metering (<source entity>)"
+        data = build_diagnostics(_entry(), _entry_data(pge_config))
+        assert data["entry"]["title"] == "**REDACTED**"
+        assert "house_power" not in json.dumps(data)
+
+    def test_unredacted_on_request(self, pge_config):
+        data = build_diagnostics(_entry(), _entry_data(pge_config), redact=False)
+        assert data["entry"]["data"]["energy_sensor"] == "sensor.house_power"
+
+    def test_platform_entry_point(self, pge_config):
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"abc": _entry_data(pge_config), "_entry_ids": {"abc"}}}
+        data = asyncio.run(async_get_config_entry_diagnostics(hass, _entry()))
+        assert data["entry"]["title"] == "**REDACTED**"
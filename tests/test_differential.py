@@ -0,0 +1,294 @@
+"""Differential tests — compiled fast paths vs the reference resolvers.
+
+``TOUSchedule.get_tier_id`` / ``get_rate`` / ``get_next_rate_change`` and
+``resolve_holidays_for_year`` are the reference semantics; CompiledSchedule
+(tables, transition index, runs, partial rebuilds) must agree with them
+exactly.  Each seed generates a random config — tiers, seasons with
+partial month coverage, short and missing grid rows, standard and custom
+holidays of every rule type with global or per-rule observe policies —
+and random timestamps from 1990 to 2100, with extra weight on DST changes
+and year ends.  The holiday resolver is itself checked against a
+brute-force day scan and an independent Easter algorithm.
+
+Everything is seeded, so a failure names the seed that reproduces it:
+
+    pytest tests/test_differential.py -k "seed_17"
+"""
+from __future__ import annotations
+
+import calendar
+import os
+import random
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.solarseed_tou.compiled import SLOTS_PER_DAY
+from custom_components.solarseed_tou.const import STANDARD_HOLIDAYS
+from custom_components.solarseed_tou.holiday import OBSERVE_POLICIES, resolve_holidays_for_year
+from custom_components.solarseed_tou.schedule import DAY_KEYS, TOUSchedule
+
+# More seeds for a longer local run: SOLARSEED_FUZZ_SEEDS=2000 pytest tests/test_differential.py
+SEEDS = range(int(os.environ.get("SOLARSEED_FUZZ_SEEDS", 40)))
+TIMESTAMPS_PER_SEED = 300
+YEARS_PER_SEED = 4
+FIRST_YEAR, LAST_YEAR = 1990, 2100
+
+ZONES = [None, ZoneInfo("America/Los_Angeles"), ZoneInfo("America/New_York"),
+         ZoneInfo("Europe/London"), ZoneInfo("Australia/Sydney")]
+
+
+# ── Generators ─────────────────────────────────────────────
+
+
+def _random_row(rng: random.Random, tier_ids: list[str]) -> list[str]:
+    """A 24-hour row of a few runs (sometimes short, to exercise padding)."""
+    row: list[str] = []
+    while len(row) < SLOTS_PER_DAY:
+        row.extend([rng.choice(tier_ids)] * rng.randint(1, 8))
+    return row[:rng.choice([SLOTS_PER_DAY] * 5 + [rng.randint(0, SLOTS_PER_DAY - 1)])]
+
+
+def _random_rule(rng: random.Random, kinds=("fixed", "nth", "last", "offset", "easter")) -> dict:
+    """A custom holiday rule valid in every year, sometimes with its own observe policy."""
+    month = rng.randint(1, 12)
+    kind = rng.choice(kinds)
+    if kind == "fixed":
+        rule = {"rule": "fixed", "month": month,
+                "day": rng.randint(1, calendar.monthrange(2001, month)[1])}
+    elif kind == "nth":
+        rule = {"rule": "nth", "month": month, "weekday": rng.randint(0, 6),
+                "n": rng.randint(1, 4)}
+    elif kind == "last":
+        rule = {"rule": "last", "month": month, "weekday": rng.randint(0, 6)}
+    elif kind == "offset":
+        base = rng.choice([rng.choice(list(STANDARD_HOLIDAYS)),
+                           _random_rule(rng, ("fixed", "nth", "last", "easter"))])
+        if isinstance(base, dict):
+            base.pop("observe", None)
+        rule = {"rule": "offset", "base": base, "days": rng.randint(-40, 40)}
+    else:
+        rule = {"rule": "easter", "days": rng.randint(-60, 60)}
+    if rng.random() < 0.3:
+        rule["observe"] = rng.choice(list(OBSERVE_POLICIES))
+    return rule
+
+
+def random_config(rng: random.Random) -> dict:
+    """A random valid config (warnings — padded rows, uncovered months — allowed)."""
+    tier_ids = [f"t{i}" for i in range(rng.randint(1, 5))]
+    tiers = {tid: {"name": tid.upper(), "rate": round(rng.uniform(0, 0.5), 5)}
+             for tid in tier_ids}
+
+    months = list(range(1, 13))
+    rng.shuffle(months)
+    months = months[:rng.randint(0, 12)]  # the rest fall back to the first season
+    count = rng.randint(0, 4) if months else 0
+    cuts = sorted(rng.sample(range(1, len(months)), min(count - 1, len(months) - 1))) \
+        if count > 1 else []
+    seasons = {}
+    for i, (lo, hi) in enumerate(zip([0, *cuts], [*cuts, len(months)])):
+        grid = {day: _random_row(rng, tier_ids) for day in DAY_KEYS if rng.random() > 0.1}
+        seasons[f"s{i}"] = {"name": f"S{i}", "months": months[lo:hi], "grid": grid}
+
+    return {
+        "energy_sensor": "sensor.energy",
+        "tiers": tiers,
+        "seasons": seasons,
+        "holidays": {
+            "rate_tier": rng.choice(tier_ids),
+            "observe_nearest_weekday": rng.random() < 0.7,
+            "standard": rng.sample(list(STANDARD_HOLIDAYS),
+                                   rng.randint(0, len(STANDARD_HOLIDAYS))),
+            "custom": [_random_rule(rng) for _ in range(rng.randint(0, 4))],
+        },
+        "regulatory_per_kwh": round(rng.uniform(0, 0.02), 5),
+        "state_passthrough_per_kwh": round(rng.uniform(0, 0.01), 5),
+        "programs_per_kwh": round(rng.uniform(0, 0.01), 5),
+        "tax_rate_pct": round(rng.uniform(0, 10), 2),
+    }
+
+
+def _dst_edges(year: int, tz: ZoneInfo) -> list[datetime]:
+    """Local wall-clock hours around the zone's UTC-offset changes in a year."""
+    edges = []
+    probe = datetime(year, 1, 1, tzinfo=tz)
+    offset = probe.utcoffset()
+    end = datetime(year + 1, 1, 1, tzinfo=tz)
+    while probe < end:
+        nxt = probe + timedelta(days=1)
+        if nxt.utcoffset() != offset:
+            offset = nxt.utcoffset()
+            midnight = probe.replace(hour=0)
+            edges.extend(midnight + timedelta(hours=h, minutes=30) for h in range(48))
+            edges.append(midnight.replace(hour=1, minute=30, fold=1))
+        probe = nxt
+    return edges
+
+
+def random_timestamps(rng: random.Random, count: int) -> list[datetime]:
+    """Random times in a few random years 1990–2100 and a random zone, plus edges.
+
+    Drawing from a few years per seed keeps the year tables built per seed
+    small; the seeds between them cover the whole range.
+    """
+    tz = rng.choice(ZONES)
+    years = rng.sample(range(FIRST_YEAR, LAST_YEAR), YEARS_PER_SEED)
+    stamps = []
+    for _ in range(count):
+        start = datetime(rng.choice(years), 1, 1)
+        seconds = rng.randrange(int((start.replace(year=start.year + 1) - start).total_seconds()))
+        stamps.append((start + timedelta(seconds=seconds)).replace(tzinfo=tz))
+    year = years[0]
+    stamps.extend(datetime(year, 12, 31, 20, tzinfo=tz) + timedelta(hours=h) for h in range(8))
+    if tz is not None:
+        stamps.extend(rng.sample(_dst_edges(year, tz), 12))
+    return stamps
+
+
+# ── Oracle for the holiday rules ───────────────────────────
+
+
+def gauss_easter(year: int) -> date:
+    """Gregorian Easter by Gauss's algorithm (a different method from holiday.py's)."""
+    a, b, c = year % 19, year % 4, year % 7
+    k = year // 100
+    p, q = (13 + 8 * k) // 25, k // 4
+    m = (15 - p + k - q) % 30
+    n = (4 + k - q) % 7
+    d = (19 * a + m) % 30
+    e = (2 * b + 4 * c + 6 * d + n) % 7
+    if d == 29 and e == 6:
+        return date(year, 4, 19)
+    if d == 28 and e == 6 and (11 * m + 11) % 30 < 19:
+        return date(year, 4, 18)
+    return date(year, 3, 22) + timedelta(days=d + e)
+
+
+def brute_holiday(rule: dict, year: int) -> date:
+    """Resolve a rule by scanning the month's days (before observing)."""
+    if rule["rule"] == "offset":
+        base = rule["base"]
+        base = STANDARD_HOLIDAYS[base] if isinstance(base, str) else base
+        return brute_holiday(base, year) + timedelta(days=rule["days"])
+    if rule["rule"] == "easter":
+        return gauss_easter(year) + timedelta(days=rule["days"])
+    if rule["rule"] == "fixed":
+        return date(year, rule["month"], rule["day"])
+    days = [date(year, rule["month"], d)
+            for d in range(1, calendar.monthrange(year, rule["month"])[1] + 1)]
+    matches = [d for d in days if d.weekday() == rule["weekday"]]
+    return matches[rule["n"] - 1] if rule["rule"] == "nth" else matches[-1]
+
+
+def brute_observe(d: date, policy: str) -> date:
+    """Shift a weekend date per an observe policy."""
+    sat, sun = d.weekday() == 5, d.weekday() == 6
+    if policy == "nearest":
+        return d - timedelta(days=1) if sat else d + timedelta(days=1) if sun else d
+    if policy == "sat_to_fri":
+        return d - timedelta(days=1) if sat else d
+    if policy == "sun_to_mon":
+        return d + timedelta(days=1) if sun else d
+    if policy == "next_monday":
+        return d + timedelta(days=2) if sat else d + timedelta(days=1) if sun else d
+    return d
+
+
+def brute_holidays(cfg, year: int) -> set[date]:
+    """All holiday dates of a year, each shifted per its own or the default policy."""
+    default = "nearest" if cfg.observe_nearest_weekday else "none"
+    rules = [STANDARD_HOLIDAYS[hid] for hid in cfg.standard] + list(cfg.custom)
+    return {brute_observe(brute_holiday(rule, year), rule.get("observe", default))
+            for rule in rules}
+
+
+# ── Properties ─────────────────────────────────────────────
+
+
+def _case(seed: int) -> tuple[random.Random, TOUSchedule, list[datetime]]:
+    rng = random.Random(seed)
+    schedule = TOUSchedule.from_dict(random_config(rng))
+    return rng, schedule, random_timestamps(rng, TIMESTAMPS_PER_SEED)
+
+
+@pytest.mark.parametrize("seed", SEEDS, ids=lambda s: f"seed_{s}")
+class TestCompiledAgreesWithReference:
+    """Every compiled lookup equals the reference resolver."""
+
+    def test_tier_and_rate(self, seed):
+        _, schedule, stamps = _case(seed)
+        compiled = schedule.compiled
+        for ts in stamps:
+            assert compiled.tier_id(ts) == schedule.get_tier_id(ts), ts
+            assert compiled.rate(ts) == schedule.get_rate(ts), ts
+
+    def test_holidays(self, seed):
+        _, schedule, stamps = _case(seed)
+        cfg = schedule.holidays
+        compiled = schedule.compiled
+        for year in {ts.year for ts in stamps}:
+            expected = brute_holidays(cfg, year)
+            assert resolve_holidays_for_year(
+                cfg.standard, cfg.custom, year, cfg.observe_nearest_weekday
+            ) == expected, year
+            # Observed dates shifted out of their rule's year never match
+            in_year = {d for d in expected if d.year == year}
+            assert compiled.holidays(year) == in_year, year
+            jan1 = date(year, 1, 1)
+            for d in (jan1, jan1 + timedelta(days=1), date(year, 12, 31), *expected):
+                assert compiled.is_holiday(d) == schedule.is_holiday(d), d
+
+    def test_next_transition(self, seed):
+        _, schedule, stamps = _case(seed)
+        compiled = schedule.compiled
+        for ts in stamps[:TIMESTAMPS_PER_SEED // 3]:
+            expected = schedule.get_next_rate_change(ts)
+            actual = compiled.next_transition(ts)
+            if expected is not None:
+                assert actual is not None, ts
+                assert (actual[0], compiled.tier_ids[actual[1]]) == expected, ts
+                continue
+            # The reference only searches today and tomorrow
+            if actual is not None:
+                start, idx = actual
+                assert start.replace(tzinfo=None) >= datetime.combine(
+                    ts.date() + timedelta(days=2), datetime.min.time()), ts
+                assert schedule.get_tier_id(start) == compiled.tier_ids[idx], ts
+                assert compiled.tier_ids[idx] != schedule.get_tier_id(ts), ts
+
+    def test_runs_match_hourly_walk(self, seed):
+        rng, schedule, stamps = _case(seed)
+        compiled = schedule.compiled
+        for ts in rng.sample(stamps, 5):
+            start = ts.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+            hours = [start + timedelta(hours=h) for h in range(72)]
+            walk = [(h, schedule.get_tier_id(h)) for i, h in enumerate(hours)
+                    if i == 0 or schedule.get_tier_id(h) != schedule.get_tier_id(hours[i - 1])]
+            runs = compiled.runs(start, hours[-1] + timedelta(hours=1))
+            assert [(at, compiled.tier_ids[idx]) for at, idx in runs] == walk, start
+
+    def test_rebase_matches_fresh_compile(self, seed):
+        rng, schedule, stamps = _case(seed)
+        years = sorted({ts.year for ts in stamps})[:3]
+        for year in years:
+            schedule.compiled.year_table(year)
+
+        # The edits patch.classify_changes rebases: holidays, or one season's grid
+        data = schedule.to_dict()
+        tier_ids = list(data["tiers"])
+        if data["seasons"] and rng.random() < 0.5:
+            index = rng.randrange(len(data["seasons"]))
+            season = list(data["seasons"].values())[index]
+            season["grid"] = {day: _random_row(rng, tier_ids) for day in DAY_KEYS}
+            changes = {f"season:{index}"}
+        else:
+            data["holidays"] = random_config(rng)["holidays"]
+            data["holidays"]["rate_tier"] = rng.choice(tier_ids)
+            changes = {"holidays"}
+
+        rebased = schedule.compiled.rebase(TOUSchedule.from_dict(data), changes)
+        fresh = TOUSchedule.from_dict(data).compiled
+        for year in years:
+            assert rebased.year_table(year) == fresh.year_table(year), year
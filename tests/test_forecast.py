@@ -0,0 +1,117 @@
+"""Tests for forecast.py — learned load profile and incremental cost projection."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from custom_components.solarseed_tou.forecast import CostForecaster, LoadProfile
+from tests.conftest import make_dt
+
+
+def _feed_day(forecaster: CostForecaster, day: datetime, kwh_per_hour: float) -> None:
+    """Feed one sample per minute for a whole day."""
+    per_minute = kwh_per_hour / 60
+    t = day.replace(hour=0, minute=0)
+    for _ in range(24 * 60):
+        forecaster.add(t, per_minute)
+        t += timedelta(minutes=1)
+
+
+class TestLoadProfile:
+    """Exponentially weighted (weekday, slot) cells."""
+
+    def test_first_observation_is_taken_as_is(self):
+        profile = LoadProfile(alpha=0.5)
+        profile.update(2, 10, 1.2)
+        assert profile.expected(2, 10) == pytest.approx(1.2)
+
+    def test_ewma_update(self):
+        profile = LoadProfile(alpha=0.5)
+        profile.update(0, 0, 1.0)
+        profile.update(0, 0, 3.0)
+        assert profile.expected(0, 0) == pytest.approx(2.0)
+
+    def test_cells_are_independent(self):
+        profile = LoadProfile()
+        profile.update(0, 5, 1.0)
+        assert profile.expected(1, 5) == 0.0
+        assert profile.expected(0, 6) == 0.0
+
+
+class TestCostForecaster:
+    """Incremental projection from the compiled table."""
+
+    def test_unlearned_profile_projects_nothing(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        assert forecaster.remaining_today(make_dt(2025, 1, 8, 12)) == 0.0
+
+    def test_learns_slot_totals(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        _feed_day(forecaster, datetime(2025, 1, 1), kwh_per_hour=2.0)  # Wednesday
+        forecaster.add(datetime(2025, 1, 2, 0), 0.0)  # roll the last slot
+        assert forecaster.profile.expected(2, 13) == pytest.approx(2.0)
+        assert forecaster.profile.expected(2, 23) == pytest.approx(2.0)
+
+    def test_remaining_today_uses_rates_per_slot(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        _feed_day(forecaster, datetime(2025, 1, 1), kwh_per_hour=1.0)
+        forecaster.add(datetime(2025, 1, 2, 0), 0.0)
+        # Next Wednesday (non-holiday) at the start of hour 18
+        now = datetime(2025, 1, 8, 18)
+        expected = sum(pge_schedule.get_rate(now.replace(hour=h)) for h in range(18, 24))
+        assert forecaster.remaining_today(now) == pytest.approx(expected)
+
+    def test_current_slot_usage_is_subtracted(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        _feed_day(forecaster, datetime(2025, 1, 1), kwh_per_hour=1.0)
+        now = datetime(2025, 1, 8, 23, 30)
+        forecaster.add(now, 0.4)
+        rate = pge_schedule.get_rate(now)
+        assert forecaster.remaining_today(now) == pytest.approx(0.6 * rate)
+
+    def test_short_idle_gap_learned_as_zero(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        forecaster.profile.update(2, 11, 5.0)
+        forecaster.add(datetime(2025, 1, 1, 10), 1.0)
+        forecaster.add(datetime(2025, 1, 1, 12), 1.0)  # hour 11 had no samples
+        assert forecaster.profile.expected(2, 11) < 5.0
+
+    def test_remaining_until_covers_whole_days(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        for wd in range(7):
+            for h in range(24):
+                forecaster.profile.update(wd, h, 1.0)
+        now = datetime(2025, 1, 8, 0)
+        end = date(2025, 1, 11)
+        expected = sum(
+            pge_schedule.get_rate(datetime(2025, 1, d, h))
+            for d in (8, 9, 10) for h in range(24)
+        )
+        assert forecaster.remaining_until(now, end) == pytest.approx(expected)
+
+    def test_remaining_until_past_end_is_zero(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        assert forecaster.remaining_until(make_dt(2025, 1, 8), date(2025, 1, 8)) == 0.0
+
+    def test_set_schedule_reprices(self, base_schedule, pge_schedule):
+        forecaster = CostForecaster(base_schedule.compiled)
+        forecaster.profile.update(5, 23, 1.0)  # Saturday 23:00
+        now = datetime(2025, 1, 11, 23)
+        assert forecaster.remaining_today(now) == pytest.approx(0.08)
+        forecaster.set_schedule(pge_schedule.compiled)
+        assert forecaster.remaining_today(now) == pytest.approx(pge_schedule.get_rate(now))
+
+    def test_export_import_round_trip(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        _feed_day(forecaster, datetime(2025, 1, 1), kwh_per_hour=1.5)
+        now = datetime(2025, 1, 8, 18)
+        resumed = CostForecaster(pge_schedule.compiled)
+        resumed.import_state(forecaster.export_state())
+        assert resumed.profile.values == forecaster.profile.values
+        assert resumed.remaining_today(now) == pytest.approx(forecaster.remaining_today(now))
+
+    def test_import_ignores_malformed_state(self, pge_schedule):
+        forecaster = CostForecaster(pge_schedule.compiled)
+        forecaster.import_state({"values": [1.0], "seen": "zz", "slot": "x"})
+        assert forecaster.profile.expected(0, 0) == 0.0
@@ -0,0 +1,170 @@
+"""Tests for history.py — dated rate versions."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from custom_components.solarseed_tou.history import (
+    HISTORY_KEY,
+    RateHistory,
+    parse_effective_from,
+)
+from custom_components.solarseed_tou.schedule import ScheduleValidationError, TOUSchedule
+from tests.conftest import _make_config
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def _flat_config(rate: float, **history) -> dict:
+    config = _make_config(
+        tiers={"flat": {"name": "Flat", "rate": rate}},
+        seasons={"all": {"name": "All", "months": list(range(1, 13)),
+                         "grid": {d: ["flat"] * 24 for d in DAYS}}},
+        holidays={"rate_tier": "flat", "standard": [], "custom": []},
+    )
+    config.update(history)
+    return config
+
+
+def _versions(*versions) -> dict:
+    return _flat_config(0.10, rate_history=[
+        {"effective_from": start, "tiers": {"flat": {"name": "Flat", "rate": rate}}}
+        for start, rate in versions
+    ])
+
+
+class TestParseEffectiveFrom:
+    """Version start parsing."""
+
+    def test_date_string_is_midnight(self):
+        assert parse_effective_from("2026-03-15") == datetime(2026, 3, 15)
+
+    def test_date_and_datetime(self):
+        assert parse_effective_from(date(2026, 3, 15)) == datetime(2026, 3, 15)
+        assert parse_effective_from("2026-03-15T06:00:00") == datetime(2026, 3, 15, 6)
+
+    def test_rejects_partial_hours(self):
+        with pytest.raises(ValueError, match="whole hour"):
+            parse_effective_from("2026-03-15T06:30:00")
+
+
+class TestFromConfig:
+    """Parsing a config with a rate_history list."""
+
+    def test_no_history_is_one_version(self):
+        history = RateHistory.from_config(_flat_config(0.10))
+        assert len(history) == 1
+        assert history.starts == []
+        assert history.config_at(datetime(2030, 1, 1)) == _flat_config(0.10)
+
+    def test_versions_are_sorted_and_cumulative(self):
+        config = _flat_config(0.10, rate_history=[
+            {"effective_from": "2026-07-01", "tax_rate_pct": 5.0},
+            {"effective_from": "2026-03-15",
+             "tiers": {"flat": {"name": "Flat", "rate": 0.20}}},
+        ])
+        history = RateHistory.from_config(config)
+        assert history.starts == [datetime(2026, 3, 15), datetime(2026, 7, 1)]
+        last = history.schedules[-1]
+        assert last.tiers["flat"].rate == 0.20  # inherited from the March version
+        assert last.tax_rate_pct == 5.0
+        assert HISTORY_KEY not in history.configs[0]
+
+    def test_version_errors_are_prefixed(self):
+        config = _flat_config(0.10, rate_history=[
+            {"effective_from": "2026-03-15", "holidays": {"rate_tier": "bogus"}},
+        ])
+        with pytest.raises(ScheduleValidationError) as err:
+            RateHistory.from_config(config)
+        assert [d.path for d in err.value.diagnostics] == ["rate_history.0.holidays.rate_tier"]
+
+    def test_duplicate_and_bad_starts(self):
+        config = _flat_config(0.10, rate_history=[
+            {"effective_from": "2026-03-15", "tax_rate_pct": 1.0},
+            {"effective_from": "2026-03-15", "tax_rate_pct": 2.0},
+            {"effective_from": "someday"},
+        ])
+        with pytest.raises(ScheduleValidationError) as err:
+            RateHistory.from_config(config)
+        paths = {d.path for d in err.value.diagnostics}
+        assert paths == {"rate_history.1.effective_from", "rate_history.2.effective_from"}
+
+
+class TestLookup:
+    """Bisect lookup by timestamp."""
+
+    def test_schedule_at_boundaries(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20), ("2026-07-01", 0.30)))
+        rate = lambda dt: history.schedule_at(dt).compiled.rate(dt)  # noqa: E731
+        assert rate(datetime(2026, 3, 14, 23)) == pytest.approx(0.10)
+        assert rate(datetime(2026, 3, 15, 0)) == pytest.approx(0.20)
+        assert rate(datetime(2026, 6, 30, 23, 59)) == pytest.approx(0.20)
+        assert rate(datetime(2026, 7, 1)) == pytest.approx(0.30)
+
+    def test_next_change(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        assert history.next_change(datetime(2026, 1, 1)) == datetime(2026, 3, 15)
+        assert history.next_change(datetime(2026, 3, 15)) is None
+
+
+class TestSplitting:
+    """Intervals split at version boundaries."""
+
+    def test_split_at_boundary(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        pieces = history.split(datetime(2026, 3, 14, 22), datetime(2026, 3, 15, 2))
+        assert [(a, b) for a, b, _ in pieces] == [
+            (datetime(2026, 3, 14, 22), datetime(2026, 3, 15)),
+            (datetime(2026, 3, 15), datetime(2026, 3, 15, 2)),
+        ]
+        assert pieces[1][2] is history.schedules[1]
+
+    def test_cost_spreads_across_versions(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        cost = history.cost(datetime(2026, 3, 14, 23), datetime(2026, 3, 15, 1), 2.0)
+        assert cost == pytest.approx(1.0 * 0.10 + 1.0 * 0.20)
+
+    def test_cost_splits_at_tier_transitions(self):
+        schedule = TOUSchedule.from_dict(_make_config())
+        history = RateHistory.single(schedule)
+        start = datetime(2025, 1, 8, 8, 30)  # mid-peak until 9, then on-peak
+        cost = history.cost(start, start + timedelta(hours=1), 1.0)
+        mid = schedule.compute_effective_rate("mid-peak")
+        on = schedule.compute_effective_rate("on-peak")
+        assert cost == pytest.approx(0.5 * mid + 0.5 * on)
+
+    def test_empty_interval_priced_at_start(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        at = datetime(2026, 3, 15, 5)
+        assert history.cost(at, at, 1.0) == pytest.approx(0.20)
+
+
+class TestRateTable:
+    """RLE export of a year across versions."""
+
+    def test_single_version_matches_table(self, base_schedule):
+        history = RateHistory.single(base_schedule)
+        table = history.rate_table(2025)
+        compiled = base_schedule.compiled
+        expanded = []
+        for start, length, ti in table["spans"]:
+            assert start == len(expanded)
+            expanded.extend([table["tiers"][ti]["id"]] * length)
+        assert expanded == [compiled.tier_ids[i] for i in compiled.year_table(2025)]
+
+    def test_versions_split_the_year(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        table = history.rate_table(2026)
+        boundary = (31 + 28 + 14) * 24
+        assert [t["effective_rate"] for t in table["tiers"]] == [0.10, 0.20]
+        assert table["spans"] == [[0, boundary, 0], [boundary, 365 * 24 - boundary, 1]]
+
+    def test_outside_versions_is_one_span(self):
+        history = RateHistory.from_config(_versions(("2026-03-15", 0.20)))
+        assert history.rate_table(2027)["spans"] == [[0, 365 * 24, 0]]
+
+    def test_tables_built_off_the_live_compile(self, base_schedule):
+        # rate_table runs in the executor; the event loop owns schedule.compiled
+        RateHistory.single(base_schedule).rate_table(2025)
+        assert base_schedule.compiled.cached_years() == []
@@ -5,6 +5,11 @@ import pytest
 from datetime import date
 
 from custom_components.solarseed_tou.holiday import (
+    HolidayCalendar,
+    easter_sunday,
+    observe_next_monday,
+    observe_saturday_to_friday,
+    observe_sunday_to_monday,
     resolve_fixed,
     resolve_nth_weekday,
     resolve_last_weekday,
@@ -111,6 +116,43 @@ class TestObserveNearestWeekday:
         assert observe_nearest_weekday(d) == d
 
 
+class TestObservePolicies:
+    """Single-direction and next-Monday weekend shifting."""
+
+    def test_saturday_to_friday_only(self):
+        assert observe_saturday_to_friday(date(2026, 7, 4)) == date(2026, 7, 3)
+        assert observe_saturday_to_friday(date(2027, 7, 4)) == date(2027, 7, 4)  # Sunday
+
+    def test_sunday_to_monday_only(self):
+        assert observe_sunday_to_monday(date(2027, 7, 4)) == date(2027, 7, 5)
+        assert observe_sunday_to_monday(date(2026, 7, 4)) == date(2026, 7, 4)  # Saturday
+
+    def test_next_monday(self):
+        assert observe_next_monday(date(2026, 7, 4)) == date(2026, 7, 6)
+        assert observe_next_monday(date(2027, 7, 4)) == date(2027, 7, 5)
+        assert observe_next_monday(date(2025, 7, 4)) == date(2025, 7, 4)  # Friday
+
+
+# ── Easter ─────────────────────────────────────────────────────
+
+
+class TestEaster:
+    """Western Easter Sunday."""
+
+    @pytest.mark.parametrize("year,expected", [
+        (2000, date(2000, 4, 23)),
+        (2008, date(2008, 3, 23)),   # early
+        (2019, date(2019, 4, 21)),
+        (2024, date(2024, 3, 31)),
+        (2025, date(2025, 4, 20)),
+        (2026, date(2026, 4, 5)),
+        (2038, date(2038, 4, 25)),   # latest possible
+        (2285, date(2285, 3, 22)),   # earliest possible
+    ])
+    def test_known_dates(self, year, expected):
+        assert easter_sunday(year) == expected
+
+
 # ── resolve_holiday dispatcher ─────────────────────────────────
 
 
@@ -129,6 +171,20 @@ class TestResolveHoliday:
         rule = {"rule": "last", "month": 5, "weekday": 0}
         assert resolve_holiday(rule, 2025) == date(2025, 5, 26)
 
+    def test_offset_from_standard_holiday(self):
+        """Day after Thanksgiving."""
+        rule = {"rule": "offset", "base": "thanksgiving", "days": 1}
+        assert resolve_holiday(rule, 2025) == date(2025, 11, 28)
+
+    def test_offset_from_rule(self):
+        rule = {"rule": "offset", "base": {"rule": "fixed", "month": 12, "day": 25}, "days": -1}
+        assert resolve_holiday(rule, 2025) == date(2025, 12, 24)
+
+    def test_easter_rule(self):
+        """Good Friday."""
+        assert resolve_holiday({"rule": "easter", "days": -2}, 2025) == date(2025, 4, 18)
+        assert resolve_holiday({"rule": "easter"}, 2025) == date(2025, 4, 20)
+
     def test_unknown_rule_raises(self):
         with pytest.raises(ValueError, match="Unknown holiday rule"):
             resolve_holiday({"rule": "random"}, 2025)
@@ -185,6 +241,15 @@ class TestResolveHolidaysForYear:
         assert len(holidays) == 1
         assert date(2025, 12, 25) in holidays
 
+    def test_per_rule_observe_overrides_default(self):
+        # July 4, 2026 is Saturday; Christmas 2027 is Saturday
+        custom = [{"rule": "fixed", "month": 7, "day": 4, "observe": "none"}]
+        holidays = resolve_holidays_for_year(["christmas"], custom, 2026, shift_observed=True)
+        assert date(2026, 7, 4) in holidays
+        custom = [{"rule": "fixed", "month": 12, "day": 25, "observe": "next_monday"}]
+        holidays = resolve_holidays_for_year([], custom, 2027, shift_observed=False)
+        assert holidays == {date(2027, 12, 27)}
+
     def test_empty_inputs(self):
         """No standard and no custom → empty set."""
         holidays = resolve_holidays_for_year([], [], 2025)
@@ -216,3 +281,36 @@ class TestCrossYear:
         from datetime import timedelta
         next_monday = d + timedelta(days=7)
         assert next_monday.month != 5
+
+
+# ── Range calendar ────────────────────────────────────────────
+
+
+class TestHolidayCalendar:
+    """Range precompute with bisect membership."""
+
+    def test_matches_per_year_resolution(self):
+        custom = [{"rule": "offset", "base": "thanksgiving", "days": 1},
+                  {"rule": "easter", "days": -2, "observe": "none"}]
+        cal = HolidayCalendar(list(STANDARD_HOLIDAYS), custom, 1990, 2100)
+        for year in range(1990, 2101):
+            expected = resolve_holidays_for_year(list(STANDARD_HOLIDAYS), custom, year)
+            assert cal.dates(year) == sorted(d for d in expected if d.year == year)
+
+    def test_membership(self):
+        cal = HolidayCalendar(["christmas", "thanksgiving"], [], 2025, 2026)
+        assert date(2025, 12, 25) in cal
+        assert date(2026, 11, 26) in cal
+        assert date(2025, 12, 26) not in cal
+        assert len(cal) == 4
+
+    def test_observed_date_in_previous_year_is_left_out(self):
+        # New Year's Day 2022 is a Saturday, observed Friday Dec 31, 2021
+        cal = HolidayCalendar(["new_years"], [], 2021, 2022)
+        assert date(2021, 12, 31) not in cal
+        assert cal.dates(2022) == []
+
+    def test_covers(self):
+        cal = HolidayCalendar([], [], 2024, 2026)
+        assert cal.covers(2024) and cal.covers(2026)
+        assert not cal.covers(2027)
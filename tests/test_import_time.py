@@ -0,0 +1,87 @@
+"""Import-time budget for the integration (``python -X importtime``).
+
+Home Assistant imports the package and the sensor platform on the event
+loop's critical path at startup, which is slow on Pi-class hardware.
+Heavy, rarely used modules (YAML parsing, WebSocket commands, plan
+comparison, patching) must stay off that path, and the measured import
+time must stay under a fixed budget.
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.solarseed_tou"
+
+# Cumulative import time of the package + sensor platform, in microseconds.
+# About 10x what a desktop measures, so it holds on a Raspberry Pi.
+IMPORT_BUDGET_US = 100_000
+
+# Modules that must only be imported on first use
+LAZY_MODULES = (
+    "yaml",
+    f"{PACKAGE}.rate_yaml",
+    f"{PACKAGE}.websocket",
+    f"{PACKAGE}.services",
+    f"{PACKAGE}.compare",
+    f"{PACKAGE}.patch",
+    f"{PACKAGE}.planner",
+    f"{PACKAGE}.push",
+    f"{PACKAGE}.quote",
+    f"{PACKAGE}.diagnostics",
+    f"{PACKAGE}.profiler",
+)
+
+# Home Assistant modules only those lazy modules (or the config flow) need.
+# The stubs register every HA module up front, so the check drops these
+# first: an eager import then fails instead of passing under the stubs.
+LAZY_HA_MODULES = (
+    "homeassistant.components.diagnostics",
+    "homeassistant.components.websocket_api",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.selector",
+)
+
+_STUBS = "from tests._ha_stubs import install_stubs; install_stubs(); import sys"
+_SCRIPT = f"{_STUBS}; import {PACKAGE}.sensor"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+
+def _cumulative_us(stderr: str) -> int:
+    """Sum the cumulative import time of the package and its sensor platform."""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name in (PACKAGE, f"{PACKAGE}.sensor"):
+            total += int(cumulative)
+    return total
+
+
+class TestImportTime:
+    """Startup import cost."""
+
+    def test_heavy_modules_are_lazy(self):
+        check = f"{_SCRIPT}; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+        assert _run("-c", check).stdout.strip() == "[]"
+
+    def test_home_assistant_helpers_are_lazy(self):
+        check = (
+            f"{_STUBS}; [sys.modules.pop(m, None) for m in {LAZY_HA_MODULES!r}]; "
+            f"import {PACKAGE}.sensor; "
+            f"print([m for m in {LAZY_HA_MODULES!r} if m in sys.modules])"
+        )
+        assert _run("-c", check).stdout.strip() == "[]"
+
+    def test_import_time_budget(self):
+        # Best of three runs to keep a busy machine from failing the test
+        best = min(_cumulative_us(_run("-X", "importtime", "-c", _SCRIPT).stderr) for _ in range(3))
+        assert 0 < best < IMPORT_BUDGET_US, f"integration import took {best / 1000:.1f} ms"
@@ -0,0 +1,26 @@
+"""Tests for benchmarks/memory.py — per-entry footprint stays within budget."""
+from __future__ import annotations
+
+import json
+
+from benchmarks.memory import COMPONENTS, PER_ENTRY_BUDGET, main, measure, over_budget
+
+
+def test_components_are_measured():
+    result = measure(2)
+    assert list(result.components) == list(COMPONENTS)
+    assert all(size > 0 for size in result.components.values())
+
+
+def test_within_budget_and_linear():
+    one, ten = measure(1), measure(10)
+    assert not over_budget([one, ten], PER_ENTRY_BUDGET)
+    # No per-entry cost that grows with the number of entries
+    assert ten.per_entry < one.per_entry * 1.1
+
+
+def test_over_budget_fails(capsys):
+    assert main(["--counts", "1", "--budget", "1000"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["results"][0]["entries"] == 1
+    assert main(["--counts", "1,2"]) == 0
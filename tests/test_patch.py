@@ -0,0 +1,182 @@
+"""Tests for patch.py — path operations and incremental recompiles."""
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from custom_components.solarseed_tou.patch import (
+    PatchError,
+    apply_patch,
+    classify_changes,
+    parse_pointer,
+    patch_schedule,
+)
+from custom_components.solarseed_tou.schedule import TOUSchedule
+from tests.conftest import _make_config
+
+YEARS = (2025, 2026)
+
+
+def _two_season_config() -> dict:
+    day = ["off-peak"] * 17 + ["on-peak"] * 4 + ["off-peak"] * 3
+    flat = ["off-peak"] * 24
+    return _make_config(seasons={
+        "summer": {"name": "Summer", "months": [6, 7, 8, 9],
+                   "grid": {d: day for d in ["mon", "tue", "wed", "thu", "fri"]}
+                   | {"sat": flat, "sun": flat}},
+        "winter": {"name": "Winter", "months": [1, 2, 3, 4, 5, 10, 11, 12],
+                   "grid": {d: flat for d in ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]}},
+    })
+
+
+def _warm(schedule: TOUSchedule) -> TOUSchedule:
+    for year in YEARS:
+        schedule.compiled.year_table(year)
+    return schedule
+
+
+def _assert_matches_full_parse(config: dict, schedule: TOUSchedule) -> None:
+    reference = TOUSchedule.from_dict(config).compiled
+    compiled = schedule.compiled
+    assert compiled.tier_ids == reference.tier_ids
+    assert compiled.rates == pytest.approx(reference.rates)
+    for year in YEARS:
+        assert compiled.year_table(year) == reference.year_table(year)
+        assert compiled.transitions(year) == reference.transitions(year)
+
+
+class TestApplyPatch:
+    """JSON-pointer operations, copy-on-write."""
+
+    def test_pointer_unescaping(self):
+        assert parse_pointer("/tiers/a~1b/c~0d") == ["tiers", "a/b", "c~d"]
+        with pytest.raises(PatchError):
+            parse_pointer("tiers/x")
+
+    def test_replace_does_not_touch_original(self):
+        config = _make_config()
+        original = copy.deepcopy(config)
+        new, paths = apply_patch(config, [
+            {"op": "replace", "path": "/tiers/on-peak/rate", "value": 0.3},
+        ])
+        assert new["tiers"]["on-peak"]["rate"] == 0.3
+        assert config == original
+        assert new["seasons"] is config["seasons"]  # untouched branch shared
+        assert paths == [["tiers", "on-peak", "rate"]]
+
+    def test_add_remove_list_items(self):
+        config = _make_config()
+        new, _ = apply_patch(config, [
+            {"op": "add", "path": "/holidays/standard/-", "value": "thanksgiving"},
+            {"op": "remove", "path": "/holidays/standard/0"},
+        ])
+        assert new["holidays"]["standard"] == ["new_years", "independence", "thanksgiving"]
+        assert config["holidays"]["standard"][0] == "christmas"
+
+    def test_test_op(self):
+        config = _make_config()
+        apply_patch(config, [{"op": "test", "path": "/tiers/on-peak/rate", "value": 0.25}])
+        with pytest.raises(PatchError):
+            apply_patch(config, [{"op": "test", "path": "/tiers/on-peak/rate", "value": 1}])
+
+    @pytest.mark.parametrize("op", [
+        {"op": "replace", "path": "/tiers/nope/rate", "value": 1},
+        {"op": "remove", "path": "/holidays/standard/9"},
+        {"op": "move", "path": "/tiers"},
+        {"op": "add", "path": "/tiers/x"},
+    ])
+    def test_bad_operations(self, op):
+        with pytest.raises(PatchError):
+            apply_patch(_make_config(), [op])
+
+
+class TestClassifyChanges:
+    """Touched paths → what has to be rebuilt."""
+
+    def test_rate_edits(self):
+        config = _make_config()
+        sections, changes = classify_changes(
+            [["tiers", "on-peak", "rate"], ["tax_rate_pct"]], config, config
+        )
+        assert sections == {"tiers", "tax_rate_pct"}
+        assert changes == {"rates"}
+
+    def test_season_grid_edit(self):
+        config = _two_season_config()
+        _, changes = classify_changes([["seasons", "winter", "grid", "mon", "3"]], config, config)
+        assert changes == {"season:1"}
+
+    def test_season_months_edit_is_structural(self):
+        config = _two_season_config()
+        _, changes = classify_changes([["seasons", "winter", "months"]], config, config)
+        assert changes == {"structure"}
+
+    def test_uncompiled_keys(self):
+        config = _make_config()
+        _, changes = classify_changes([["fixed_monthly"], ["billing_cycle"]], config, config)
+        assert changes == set()
+
+
+class TestPatchSchedule:
+    """Incremental rebuilds must equal a full parse of the patched config."""
+
+    def test_rate_change_shares_tables(self):
+        config = _two_season_config()
+        schedule = _warm(TOUSchedule.from_dict(config))
+        new_config, new_schedule, changes = patch_schedule(schedule, config, [
+            {"op": "replace", "path": "/tiers/on-peak/rate", "value": 0.31},
+        ])
+        assert changes == {"rates"}
+        assert new_schedule.compiled.year_table(2025) is schedule.compiled.year_table(2025)
+        assert new_schedule.seasons is schedule.seasons
+        _assert_matches_full_parse(new_config, new_schedule)
+
+    def test_holiday_change(self):
+        config = _two_season_config()
+        schedule = _warm(TOUSchedule.from_dict(config))
+        new_config, new_schedule, changes = patch_schedule(schedule, config, [
+            {"op": "add", "path": "/holidays/standard/-", "value": "labor"},
+            {"op": "remove", "path": "/holidays/standard/0"},
+        ])
+        assert changes == {"holidays"}
+        _assert_matches_full_parse(new_config, new_schedule)
+
+    def test_holiday_tier_change(self):
+        config = _two_season_config()
+        schedule = _warm(TOUSchedule.from_dict(config))
+        new_config, new_schedule, _ = patch_schedule(schedule, config, [
+            {"op": "replace", "path": "/holidays/rate_tier", "value": "mid-peak"},
+        ])
+        _assert_matches_full_parse(new_config, new_schedule)
+
+    def test_season_grid_change(self):
+        config = _two_season_config()
+        schedule = _warm(TOUSchedule.from_dict(config))
+        new_config, new_schedule, changes = patch_schedule(schedule, config, [
+            {"op": "replace", "path": "/seasons/winter/grid/mon/18", "value": "mid-peak"},
+        ])
+        assert changes == {"season:1"}
+        _assert_matches_full_parse(new_config, new_schedule)
+
+    def test_new_tier_id_forces_rebuild(self):
+        config = _two_season_config()
+        schedule = _warm(TOUSchedule.from_dict(config))
+        new_config, new_schedule, _ = patch_schedule(schedule, config, [
+            {"op": "add", "path": "/tiers/super-peak",
+             "value": {"name": "Super", "rate": 0.5}},
+            {"op": "replace", "path": "/seasons/summer/grid/mon/18", "value": "super-peak"},
+        ])
+        _assert_matches_full_parse(new_config, new_schedule)
+
+    def test_invalid_touched_section_rejected(self):
+        config = _make_config()
+        schedule = TOUSchedule.from_dict(config)
+        with pytest.raises(ValueError):
+            patch_schedule(schedule, config, [
+                {"op": "replace", "path": "/tiers/on-peak/rate", "value": "cheap"},
+            ])
+        with pytest.raises(ValueError):
+            patch_schedule(schedule, config, [
+                {"op": "add", "path": "/billing_cycle", "value": {"read_day": 40}},
+            ])
@@ -0,0 +1,142 @@
+"""Tests for planner.py — cheapest-window search over the compiled table."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.solarseed_tou.planner import find_cheapest_window, price_horizon
+from custom_components.solarseed_tou.schedule import TOUSchedule
+from tests.conftest import _make_config
+
+
+class TestFindCheapestWindow:
+    """Sliding-window search."""
+
+    def test_finds_overnight_off_peak(self, base_schedule):
+        # Wednesday 10:00 (on-peak); off-peak runs 18:00→06:00
+        now = datetime(2025, 1, 8, 10)
+        window = find_cheapest_window(base_schedule.compiled, now, 3)
+        assert window.start == datetime(2025, 1, 8, 18)
+        assert window.end == datetime(2025, 1, 8, 21)
+        assert window.average_rate == pytest.approx(0.08)
+        assert window.cost == pytest.approx(0.24)
+
+    def test_matches_brute_force(self, pge_schedule):
+        now = datetime(2025, 3, 5, 7, 30)
+        window = find_cheapest_window(pge_schedule.compiled, now, 4, horizon=48)
+        origin = now.replace(minute=0)
+        costs = [
+            sum(pge_schedule.get_rate(origin + timedelta(hours=i + j)) for j in range(4))
+            for i in range(48 - 4 + 1)
+        ]
+        assert window.cost == pytest.approx(min(costs))
+
+    def test_current_slot_starts_now(self, base_schedule):
+        now = datetime(2025, 1, 8, 2, 15)  # off-peak already
+        window = find_cheapest_window(base_schedule.compiled, now, 2)
+        assert window.start == now
+        assert window.end == datetime(2025, 1, 8, 4)
+
+    def test_earliest_start_constraint(self, base_schedule):
+        now = datetime(2025, 1, 8, 2)
+        window = find_cheapest_window(
+            base_schedule.compiled, now, 2, earliest_start=datetime(2025, 1, 8, 19, 30)
+        )
+        assert window.start == datetime(2025, 1, 8, 20)
+
+    def test_latest_end_constraint_can_force_peak(self, base_schedule):
+        now = datetime(2025, 1, 8, 9)
+        window = find_cheapest_window(
+            base_schedule.compiled, now, 2, latest_end=datetime(2025, 1, 8, 17)
+        )
+        # Only on-peak / mid-peak slots fit; mid-peak 15:00–17:00 is cheapest
+        assert window.start == datetime(2025, 1, 8, 15)
+        assert window.end == datetime(2025, 1, 8, 17)
+
+    def test_impossible_constraints_return_none(self, base_schedule):
+        now = datetime(2025, 1, 8, 9)
+        assert find_cheapest_window(
+            base_schedule.compiled, now, 4, latest_end=datetime(2025, 1, 8, 11)
+        ) is None
+
+    def test_kwh_profile_weights_slots(self, base_schedule):
+        now = datetime(2025, 1, 8, 12)
+        window = find_cheapest_window(base_schedule.compiled, now, kwh_profile=[7.2, 3.6])
+        assert window.cost == pytest.approx(10.8 * 0.08)
+        assert window.average_rate == pytest.approx(0.08)
+
+    def test_profile_length_mismatch_raises(self, base_schedule):
+        with pytest.raises(ValueError):
+            find_cheapest_window(base_schedule.compiled, datetime(2025, 1, 8), 3,
+                                 kwh_profile=[1.0])
+
+    def test_result_is_cached_within_slot(self, base_schedule):
+        compiled = base_schedule.compiled
+        find_cheapest_window(compiled, datetime(2025, 1, 8, 10, 0), 3)
+        cache = compiled.memo["cheapest_window"]
+        entries = len(cache)
+        again = find_cheapest_window(compiled, datetime(2025, 1, 8, 10, 40), 3)
+        assert len(cache) == entries
+        assert again.start == datetime(2025, 1, 8, 18)
+
+    def test_cache_cleared_on_new_slot(self, base_schedule):
+        compiled = base_schedule.compiled
+        find_cheapest_window(compiled, datetime(2025, 1, 8, 10), 3)
+        find_cheapest_window(compiled, datetime(2025, 1, 8, 11), 5)
+        cache = compiled.memo["cheapest_window"]
+        assert cache["_slot"] == (2025, 7 * 24 + 11)
+        assert sum(1 for k in cache if not isinstance(k, str)) == 1
+
+
+class TestPriceHorizon:
+    """Compact rate-curve runs from the transition index."""
+
+    def test_runs_follow_transitions(self, base_schedule):
+        now = datetime(2025, 1, 8, 10, 20)  # Wednesday on-peak
+        runs = price_horizon(base_schedule.compiled, now)
+        assert runs[0] == {"start": "2025-01-08T10:00:00", "tier_id": "on-peak",
+                           "effective_rate": 0.25}
+        assert runs[1]["start"] == "2025-01-08T15:00:00"
+        assert runs[1]["tier_id"] == "mid-peak"
+        # No two consecutive runs share a tier
+        assert all(a["tier_id"] != b["tier_id"] for a, b in zip(runs, runs[1:]))
+
+    def test_covers_hours_past_next_transition(self, base_schedule):
+        now = datetime(2025, 1, 8, 10)
+        runs = price_horizon(base_schedule.compiled, now, hours=48)
+        last_start = datetime.fromisoformat(runs[-1]["start"])
+        assert last_start > now + timedelta(hours=24)
+        assert last_start < datetime(2025, 1, 8, 15) + timedelta(hours=48)
+
+    def test_reused_until_next_transition(self, base_schedule):
+        compiled = base_schedule.compiled
+        first = price_horizon(compiled, datetime(2025, 1, 8, 10, 0))
+        assert price_horizon(compiled, datetime(2025, 1, 8, 14, 59)) is first
+        after = price_horizon(compiled, datetime(2025, 1, 8, 15, 0))
+        assert after is not first
+        assert after[0]["tier_id"] == "mid-peak"
+
+    def test_flat_schedule_rolls_forward(self):
+        days = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+        compiled = TOUSchedule.from_dict(_make_config(
+            tiers={"flat": {"name": "Flat", "rate": 0.2}},
+            seasons={"all": {"name": "All", "months": list(range(1, 13)),
+                             "grid": {d: ["flat"] * 24 for d in days}}},
+            holidays={"rate_tier": "flat", "standard": [], "custom": []},
+        )).compiled
+        now = datetime(2025, 1, 8, 10)
+        first = price_horizon(compiled, now, hours=24)
+        assert price_horizon(compiled, now + timedelta(hours=23), hours=24) is first
+        later = price_horizon(compiled, now + timedelta(hours=30), hours=24)
+        assert later is not first
+        assert later[0]["start"] == (now + timedelta(hours=30)).isoformat()
+
+    def test_matches_per_hour_resolution(self, pge_schedule):
+        now = datetime(2025, 7, 3, 0)
+        runs = price_horizon(pge_schedule.compiled, now)
+        starts = [datetime.fromisoformat(r["start"]) for r in runs]
+        for h in range(48):
+            dt = now + timedelta(hours=h)
+            i = max(i for i, s in enumerate(starts) if s <= dt)
+            assert runs[i]["tier_id"] == pge_schedule.get_tier_id(dt)
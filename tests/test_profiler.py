@@ -0,0 +1,139 @@
+"""Tests for profiler.py — on-demand event-loop captures."""
+from __future__ import annotations
+
+import asyncio
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.solarseed_tou import profiler
+from custom_components.solarseed_tou.const import DOMAIN
+from custom_components.solarseed_tou.profiler import (
+    IDLE,
+    OTHER,
+    PACKAGE_DIR,
+    ProfileSession,
+    StackSampler,
+    async_start_profile,
+    package_share,
+)
+
+
+def _frame_in(filename: str):
+    """A live frame whose code claims to come from ``filename``."""
+    namespace = {"sys": sys}
+    exec(compile("def grab():\n    return sys._getframe()\n", filename, "exec"), namespace)
+    return namespace["grab"]()
+
+
+def _busy(schedule, seconds: float) -> None:
+    """Run compiled-table builds (integration code) for a while."""
+    end = time.perf_counter() + seconds
+    year = 2000
+    while time.perf_counter() < end:
+        schedule.compiled._build_year(year)
+        year += 1
+
+
+class TestStackSampler:
+    """Stack classification and collapsed output."""
+
+    def test_integration_stack_is_kept_whole(self):
+        sampler = StackSampler(0)
+        sampler.sample(_frame_in(os.path.join(PACKAGE_DIR, "sensor.py")))
+        (stack,) = sampler.stacks
+        assert stack.endswith("grab (sensor.py:1)")
+        assert "test_profiler.py" in stack  # callers are kept, root first
+
+    def test_other_and_idle_are_folded(self):
+        sampler = StackSampler(0)
+        sampler.sample(_frame_in("/usr/lib/python3/asyncio/events.py"))
+        sampler.sample(_frame_in("/usr/lib/python3/selectors.py"))
+        sampler.sample(_frame_in(os.path.join(PACKAGE_DIR, "sensor.py")))
+        assert sampler.stacks[OTHER] == 1
+        assert sampler.stacks[IDLE] == 1
+        assert sampler.samples == 3
+        assert sampler.share == pytest.approx(0.5)  # idle time is not counted
+
+    def test_share_without_samples(self):
+        assert StackSampler(0).share == 0.0
+
+    def test_write_collapsed(self, tmp_path):
+        sampler = StackSampler(0)
+        for _ in range(3):
+            sampler.sample(_frame_in("/usr/lib/python3/asyncio/events.py"))
+        sampler.sample(_frame_in(os.path.join(PACKAGE_DIR, "sensor.py")))
+        path = tmp_path / "out.collapsed"
+        sampler.write(str(path))
+        lines = path.read_text().splitlines()
+        assert lines[0] == f"{OTHER} 3"
+        assert lines[1].endswith("grab (sensor.py:1) 1")
+
+    def test_samples_a_running_thread(self, base_schedule):
+        sampler = StackSampler(threading.get_ident(), 0.001)
+        sampler.start()
+        _busy(base_schedule, 0.2)
+        sampler.stop()
+        assert sampler.samples > 0
+        assert any("compiled.py" in stack for stack in sampler.stacks)
+
+
+class TestProfileSession:
+    """cProfile captures."""
+
+    def test_cprofile_writes_pstats(self, base_schedule, tmp_path):
+        path = str(tmp_path / "out.pstats")
+        session = ProfileSession("cprofile", path, datetime(2026, 1, 1), 1)
+        session.start(0.005)
+        _busy(base_schedule, 0.05)
+        session.stop()
+        share = session.write()
+        assert sys.getprofile() is None
+        stats = pstats.Stats(path)
+        assert any(filename.startswith(PACKAGE_DIR) for filename, _, _ in stats.stats)
+        assert 0 < share <= 1
+        assert package_share(stats) == pytest.approx(share)
+
+
+class TestAsyncStartProfile:
+    """The service entry point."""
+
+    @pytest.fixture
+    def hass(self, tmp_path):
+        hass = MagicMock()
+        hass.data = {}
+        hass.config.path = lambda name: str(tmp_path / name)
+
+        async def executor(fn, *args):
+            return fn(*args)
+
+        hass.async_add_executor_job = executor
+        return hass
+
+    def test_stops_itself_and_writes(self, hass):
+        with patch.object(profiler, "async_call_later") as call_later:
+            session = async_start_profile(hass, "sample", 5, 0.001)
+        (_, delay, finish), _ = call_later.call_args
+        assert delay == 5
+        assert hass.data[DOMAIN]["_profile"] is session
+        assert session.path.endswith(".collapsed")
+
+        asyncio.run(finish(datetime.now()))
+        assert "_profile" not in hass.data[DOMAIN]
+        assert os.path.exists(session.path)
+        assert not any(t.name == "solarseed_tou_profiler" for t in threading.enumerate())
+
+    def test_one_capture_at_a_time(self, hass):
+        with patch.object(profiler, "async_call_later") as call_later:
+            async_start_profile(hass, "cprofile", 5)
+            with pytest.raises(ValueError):
+                async_start_profile(hass, "sample", 5)
+        finish = call_later.call_args[0][2]
+        asyncio.run(finish(datetime.now()))
+        assert sys.getprofile() is None
@@ -0,0 +1,129 @@
+"""Tests for push.py — subscription fan-out."""
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.solarseed_tou import push
+from custom_components.solarseed_tou.push import Subscriber, UpdateHub
+
+
+def _events(sent: list[str]) -> list[dict]:
+    return [json.loads(m)["event"] for m in sent]
+
+
+async def _drain() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class _FakeCheckpoint:
+    def __init__(self, costs: dict[str, float]):
+        self._costs = costs
+
+    def costs(self):
+        return dict(self._costs)
+
+    def snapshot(self):
+        raise AssertionError("cost events must not build a full snapshot")
+
+
+def _hub(base_schedule, costs=None) -> UpdateHub:
+    entry_data = {
+        "schedule": base_schedule,
+        "checkpoint": _FakeCheckpoint(costs or {}),
+        "entry": MagicMock(entry_id="abc"),
+    }
+    return UpdateHub(MagicMock(), entry_data)
+
+
+class TestSubscriber:
+    """Per-subscriber framing."""
+
+    def test_messages_carry_subscription_id(self):
+        sent = []
+        Subscriber(sent.append, 7).offer('{"type":"tier"}')
+        assert json.loads(sent[0]) == {"id": 7, "type": "event", "event": {"type": "tier"}}
+
+
+class TestUpdateHub:
+    """Shared fan-out."""
+
+    def test_subscribe_sends_current_state(self, base_schedule):
+        async def run():
+            hub = _hub(base_schedule, {"abc_cost_today": 1.23456})
+            sent = []
+            unsub = hub.async_subscribe(sent.append, 3)
+            await _drain()
+            unsub()
+            return hub, sent
+
+        hub, sent = asyncio.run(run())
+        events = _events(sent)
+        assert [e["type"] for e in events] == ["tier", "cost"]
+        assert events[0]["tier_id"] in base_schedule.tiers
+        assert events[1]["costs"] == {"abc_cost_today": 1.2346}
+        assert hub.subscriber_count == 0
+
+    def test_one_serialization_per_event(self, base_schedule, monkeypatch):
+        calls = []
+        real = push.serialize_event
+        monkeypatch.setattr(push, "serialize_event", lambda e: calls.append(e) or real(e))
+
+        async def run():
+            hub = _hub(base_schedule)
+            inboxes = [[] for _ in range(5)]
+            for i, inbox in enumerate(inboxes):
+                hub.async_subscribe(inbox.append, i)
+            await _drain()
+            calls.clear()
+            hub.publish({"type": "config", "rates": {}})
+            await _drain()
+            hub.async_stop()
+            return inboxes
+
+        inboxes = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(_events(inbox)[-1]["type"] == "config" for inbox in inboxes)
+
+    def test_cost_tick_publishes_only_changes(self, base_schedule):
+        async def run():
+            hub = _hub(base_schedule, {"a": 1.0})
+            sent = []
+            hub.async_subscribe(sent.append, 1)
+            await _drain()
+            sent.clear()
+            now = push.dt_util.now()
+            hub._handle_cost_tick(now)
+            await _drain()
+            hub._handle_cost_tick(now)  # unchanged
+            await _drain()
+            hub._entry_data["checkpoint"]._costs["a"] = 2.0
+            hub._handle_cost_tick(now)
+            await _drain()
+            hub.async_stop()
+            return sent
+
+        costs = [e["costs"]["a"] for e in _events(asyncio.run(run()))]
+        assert costs == [1.0, 2.0]
+
+    def test_config_update_publishes_rates_and_tier(self, base_schedule):
+        async def run():
+            hub = _hub(base_schedule)
+            sent = []
+            hub.async_subscribe(sent.append, 1)
+            await _drain()
+            sent.clear()
+            hub._handle_config_update(base_schedule)
+            await _drain()
+            hub.async_stop()
+            return sent
+
+        events = _events(asyncio.run(run()))
+        assert [e["type"] for e in events] == ["config", "tier"]
+        assert events[0]["rates"]["on-peak"] == pytest.approx(
+            base_schedule.compute_effective_rate("on-peak")
+        )
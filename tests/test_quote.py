@@ -0,0 +1,144 @@
+"""Tests for quote.py — batch pricing with boundary splitting."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.solarseed_tou.history import RateHistory
+from custom_components.solarseed_tou.quote import (
+    MAX_QUOTE_INTERVALS,
+    QuoteInterval,
+    parse_intervals,
+    quote,
+    quote_costs,
+    unpack_intervals,
+)
+
+from tests.conftest import _make_config
+
+
+def _peak_config(**history) -> dict:
+    """Off-peak all day except on-peak 17:00–21:00 every day."""
+    row = ["off-peak"] * 17 + ["on-peak"] * 4 + ["off-peak"] * 3
+    config = _make_config(
+        tiers={
+            "off-peak": {"name": "Off-Peak", "rate": 0.10},
+            "on-peak": {"name": "On-Peak", "rate": 0.30},
+        },
+        seasons={"all": {"name": "All", "months": list(range(1, 13)), "grid": {
+            d: row for d in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+        }}},
+        holidays={"rate_tier": "off-peak", "standard": [], "custom": []},
+    )
+    config.update(history)
+    return config
+
+
+@pytest.fixture
+def history() -> RateHistory:
+    return RateHistory.from_config(_peak_config(rate_history=[
+        {"effective_from": "2026-03-15", "tiers": {
+            "off-peak": {"name": "Off-Peak", "rate": 0.20},
+            "on-peak": {"name": "On-Peak", "rate": 0.40},
+        }},
+    ]))
+
+
+class TestQuoteCosts:
+    """Agreement with RateHistory.cost."""
+
+    @pytest.mark.parametrize(("start", "end"), [
+        (datetime(2026, 1, 5, 16, 30), datetime(2026, 1, 5, 17, 30)),  # tier boundary
+        (datetime(2026, 1, 5, 16, 15), datetime(2026, 1, 5, 16, 45)),  # within a slot
+        (datetime(2026, 3, 14, 20), datetime(2026, 3, 15, 2)),        # version boundary
+        (datetime(2025, 12, 31, 22), datetime(2026, 1, 1, 3)),        # year boundary
+        (datetime(2026, 2, 1), datetime(2026, 5, 1)),                  # months long
+    ])
+    def test_matches_history_cost(self, history, start, end):
+        [cost] = quote_costs(history, [QuoteInterval(start, end, 2.5)])
+        assert cost == pytest.approx(history.cost(start, end, 2.5), rel=1e-9)
+
+    def test_zero_length_priced_at_start(self, history):
+        at = datetime(2026, 4, 1, 18)
+        assert quote_costs(history, [QuoteInterval(at, at, 1.0)]) == [pytest.approx(0.40)]
+
+    def test_prefix_sums_memoized(self, history):
+        quote_costs(history, [QuoteInterval(datetime(2026, 1, 1), datetime(2026, 1, 2), 1.0)])
+        assert (0, 2026) in history.memo["rate_prefix"]
+
+    def test_tables_built_off_the_live_compile(self, history):
+        # quote runs in the executor; the event loop owns schedule.compiled
+        at = datetime(2026, 6, 1, 12)
+        quote_costs(history, [
+            QuoteInterval(datetime(2026, 1, 1), datetime(2026, 1, 2), 1.0),
+            QuoteInterval(at, at, 1.0),  # zero length: priced from the prefix sums too
+        ])
+        assert history.schedules[0].compiled.cached_years() == []
+        assert history.schedules[1].compiled.cached_years() == []
+
+    def test_totals_and_timing(self, history):
+        intervals = unpack_intervals("2026-01-05T16:00:00", 3600, [1.0, 1.0])
+        result = quote(history, intervals)
+        assert result["costs"] == [pytest.approx(0.10), pytest.approx(0.30)]
+        assert result["total_cost"] == pytest.approx(0.40)
+        assert result["total_kwh"] == 2.0
+        assert result["intervals"] == 2
+        assert result["elapsed_ms"] >= 0
+
+
+class TestParsing:
+    """Request shapes and limits."""
+
+    def test_rows_and_mappings(self):
+        rows = [
+            ["2026-01-01T00:00:00", "2026-01-01T01:00:00", 1],
+            {"start": "2026-01-01T01:00:00", "end": "2026-01-01T02:00:00", "kwh": "0.5"},
+        ]
+        intervals = parse_intervals(rows)
+        assert intervals[1] == QuoteInterval(datetime(2026, 1, 1, 1), datetime(2026, 1, 1, 2), 0.5)
+
+    def test_packed_is_contiguous(self):
+        intervals = unpack_intervals("2026-01-01T00:00:00", 900, [0.1] * 8)
+        assert intervals[-1].end == datetime(2026, 1, 1, 2)
+        assert all(a.end == b.start for a, b in zip(intervals, intervals[1:]))
+
+    @pytest.mark.parametrize("row", [
+        ["2026-01-01T02:00:00", "2026-01-01T01:00:00", 1],   # backwards
+        ["2026-01-01T00:00:00", "2027-06-01T00:00:00", 1],   # too long
+        ["1990-01-01T00:00:00", "1990-01-01T01:00:00", 1],   # outside table years
+        ["2026-01-01T00:00:00", "2026-01-01T01:00:00"],      # missing kWh
+        {"start": "2026-01-01T00:00:00", "kwh": 1},          # missing end
+    ])
+    def test_bad_rows_rejected(self, row):
+        with pytest.raises(ValueError, match="interval 0"):
+            parse_intervals([row])
+
+    def test_mixed_naive_and_aware_is_a_value_error(self):
+        row = ["2026-01-01T00:00:00+00:00", "2026-01-01T01:00:00", 1.0]
+        with pytest.raises(ValueError, match="interval 0"):
+            parse_intervals([row])
+
+    def test_null_kwh_is_a_value_error(self):
+        with pytest.raises(ValueError, match="interval 1"):
+            unpack_intervals("2026-01-01T00:00:00", 3600, [1.0, None])
+
+    def test_year_checked_after_localizing(self):
+        # 2100-12-31 23:00 UTC is already 2101 in UTC+2
+        row = ["2100-12-31T23:00:00+00:00", "2100-12-31T23:30:00+00:00", 1.0]
+        assert parse_intervals([row])
+        plus_two = timezone(timedelta(hours=2))
+        with pytest.raises(ValueError, match="outside"):
+            parse_intervals([row], lambda ts: ts.astimezone(plus_two))
+
+    def test_batch_limit(self):
+        start = datetime(2026, 1, 1)
+        row = [start, start + timedelta(hours=1), 1.0]
+        with pytest.raises(ValueError, match="at most"):
+            parse_intervals([row] * (MAX_QUOTE_INTERVALS + 1))
+        with pytest.raises(ValueError, match="at most"):
+            unpack_intervals(start, 60, [1.0] * (MAX_QUOTE_INTERVALS + 1))
+
+    def test_bad_step(self):
+        with pytest.raises(ValueError, match="step"):
+            unpack_intervals("2026-01-01T00:00:00", 0, [1.0])
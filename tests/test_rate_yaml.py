@@ -0,0 +1,94 @@
+"""Tests for rate_yaml.py — pasted config import and memoization."""
+from __future__ import annotations
+
+import pytest
+import yaml
+
+from custom_components.solarseed_tou import rate_yaml
+from custom_components.solarseed_tou.rate_yaml import (
+    RateConfigError,
+    load_yaml,
+    parse_rate_yaml,
+)
+from tests.conftest import _make_config
+
+
+YEAR = 2026
+
+
+def _yaml_text(**kwargs) -> str:
+    return yaml.safe_dump({"tou_metering": _make_config(**kwargs)})
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    rate_yaml._cache.clear()
+    yield
+    rate_yaml._cache.clear()
+
+
+class TestParseRateYaml:
+    """Parse + validate + compile, memoized by text hash."""
+
+    def test_parses_wrapped_export(self):
+        config, history = parse_rate_yaml(_yaml_text(), "sensor.meter", YEAR)
+        assert config["energy_sensor"] == "sensor.meter"
+        schedule = history.schedules[0]
+        assert "on-peak" in schedule.tiers
+        assert schedule.compiled._tables  # compiled off the loop
+
+    def test_rate_history_versions_are_compiled(self):
+        config = _make_config()
+        config["rate_history"] = [{"effective_from": "2026-03-15", "tax_rate_pct": 5.0}]
+        text = yaml.safe_dump({"tou_metering": config})
+        _, history = parse_rate_yaml(text, "sensor.meter", YEAR)
+        assert len(history) == 2
+        assert all(s.compiled._tables for s in history.schedules)
+
+    def test_same_text_is_memoized(self):
+        text = _yaml_text()
+        first = parse_rate_yaml(text, "sensor.meter", YEAR)
+        second = parse_rate_yaml(text, "sensor.meter", YEAR)
+        assert len(rate_yaml._cache) == 1
+        assert second[0] == first[0]
+        # Entries own what they get: no shared history, memo or nested config
+        assert second[1] is not first[1]
+        assert second[1].schedules[0].compiled is not first[1].schedules[0].compiled
+        assert second[0]["tiers"] is not first[0]["tiers"]
+        first[0]["tiers"]["on-peak"]["rate"] = 9.99
+        assert parse_rate_yaml(text, "sensor.meter", YEAR)[0]["tiers"]["on-peak"]["rate"] != 9.99
+
+    def test_builds_the_given_year(self):
+        _, history = parse_rate_yaml(_yaml_text(), "sensor.meter", 2031)
+        assert history.schedules[0].compiled.cached_years() == [2031]
+
+    def test_sensor_is_part_of_the_key(self):
+        text = _yaml_text()
+        config, _ = parse_rate_yaml(text, "sensor.a", YEAR)
+        other, _ = parse_rate_yaml(text, "sensor.b", YEAR)
+        assert config["energy_sensor"] == "sensor.a"
+        assert other["energy_sensor"] == "sensor.b"
+
+    def test_cache_is_bounded(self):
+        for i in range(rate_yaml.PARSE_CACHE_SIZE + 3):
+            parse_rate_yaml(_yaml_text(fixed_monthly=float(i)), "sensor.meter", YEAR)
+        assert len(rate_yaml._cache) == rate_yaml.PARSE_CACHE_SIZE
+
+    def test_invalid_yaml(self):
+        with pytest.raises(RateConfigError) as err:
+            parse_rate_yaml("tiers: [unclosed", "sensor.meter", YEAR)
+        assert err.value.reason == "invalid_yaml"
+
+    def test_not_a_mapping(self):
+        with pytest.raises(RateConfigError) as err:
+            parse_rate_yaml("- just\n- a list\n", "sensor.meter", YEAR)
+        assert err.value.reason == "invalid_yaml"
+
+    def test_invalid_config(self):
+        with pytest.raises(RateConfigError) as err:
+            parse_rate_yaml("tiers:\n  peak:\n    rate: expensive\n", "sensor.meter", YEAR)
+        assert err.value.reason == "invalid_config"
+
+    def test_load_yaml_is_safe(self):
+        with pytest.raises(yaml.YAMLError):
+            load_yaml("!!python/object/apply:os.system ['true']")
@@ -0,0 +1,120 @@
+"""Tests for the replay harness and the sensors' injectable clock."""
+from __future__ import annotations
+
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from benchmarks.replay import (
+    StateSample,
+    main,
+    read_csv,
+    read_jsonl,
+    replay,
+)
+from custom_components.solarseed_tou.sensor import TOUCostTodaySensor
+from tests.conftest import make_dt
+
+
+def _power(start: datetime, minutes: int, watts: float = 1000.0) -> list[StateSample]:
+    """One reading per minute at constant power."""
+    return [StateSample(start + timedelta(minutes=i), str(watts)) for i in range(minutes + 1)]
+
+
+class TestClock:
+    """Sensors read time through _now()."""
+
+    def test_injected_clock(self, base_schedule):
+        acc = TOUCostTodaySensor(object.__new__(type("Entry", (), {"entry_id": "x"})),
+                                 base_schedule, "sensor.power")
+        acc._clock = lambda: datetime(2030, 5, 6, 7)
+        acc._check_reset()
+        assert acc._last_reset == datetime(2030, 5, 6).date()
+
+
+class TestReplay:
+    """Totals from replayed streams."""
+
+    def test_constant_power(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)  # a Tuesday, off-peak
+        result = replay(base_schedule, _power(start, 120), ["today"])
+        rate = base_schedule.get_rate(start)
+        assert result.samples == 121
+        assert result.costs["today"] == pytest.approx(2.0 * rate)
+        assert result.events_per_second > 0
+
+    def test_energy_meter(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)
+        samples = [StateSample(start + timedelta(minutes=10 * i), str(100 + i), "kWh")
+                   for i in range(4)]
+        result = replay(base_schedule, samples, ["today"])
+        assert result.costs["today"] == pytest.approx(3 * base_schedule.get_rate(start))
+
+    def test_outage_gap_not_charged(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)
+        samples = _power(start, 30)
+        samples.append(StateSample(start + timedelta(minutes=31), "unavailable"))
+        samples += _power(start + timedelta(minutes=50), 30)
+        result = replay(base_schedule, samples, ["today"])
+        rate = base_schedule.get_rate(start)
+        assert result.costs["today"] == pytest.approx(1.0 * rate)
+
+    def test_daily_reset(self, base_schedule):
+        start = make_dt(2025, 6, 3, 23)
+        result = replay(base_schedule, _power(start, 120), ["today", "week"])
+        # The reading at midnight is priced into the new day
+        assert result.costs["today"] == pytest.approx(result.costs["week"] * 61 / 120)
+
+    def test_billing_cycle_rolls_over(self, base_schedule):
+        start = datetime(2025, 6, 30, 23)  # read day 1
+        result = replay(base_schedule, _power(start, 120), ["billing_cycle", "month"])
+        assert result.costs["billing_cycle"] == pytest.approx(result.costs["month"])
+        rate = base_schedule.get_rate(start + timedelta(hours=1))
+        assert result.costs["month"] == pytest.approx(61 / 60 * rate)
+
+    def test_empty(self, base_schedule):
+        assert replay(base_schedule, []).samples == 0
+
+
+class TestInput:
+    """Recording formats."""
+
+    def test_csv(self):
+        text = (
+            "timestamp,state,unit\n2025-06-03T02:00:00,1200,W\n"
+            "# note\n2025-06-03T02:01:00,1100\n"
+        )
+        samples = list(read_csv(io.StringIO(text)))
+        assert samples == [
+            StateSample(datetime(2025, 6, 3, 2), "1200", "W"),
+            StateSample(datetime(2025, 6, 3, 2, 1), "1100", None),
+        ]
+
+    def test_jsonl_history_shape_and_tz(self):
+        line = json.dumps({
+            "last_changed": "2025-06-03T09:00:00Z",
+            "state": "3.5",
+            "attributes": {"unit_of_measurement": "kW"},
+        })
+        [sample] = read_jsonl([line], ZoneInfo("America/Los_Angeles"))
+        assert sample.when.utcoffset() == timedelta(hours=-7)
+        assert sample.when.hour == 2 and sample.unit == "kW"
+        assert sample.when.astimezone(timezone.utc).hour == 9
+
+    def test_jsonl_error_has_line(self):
+        with pytest.raises(ValueError, match="line 2"):
+            list(read_jsonl(['{"timestamp": "2025-01-01T00:00:00", "state": 1}', "{}"]))
+
+    def test_cli(self, tmp_path, capsys, base_config):
+        import yaml
+
+        plan = tmp_path / "plan.yaml"
+        plan.write_text(yaml.safe_dump(base_config))
+        states = tmp_path / "states.csv"
+        states.write_text("2025-06-03T02:00:00,1000\n2025-06-03T03:00:00,1000\n")
+        assert main(["--states", str(states), "--plan", str(plan), "--sensors", "today"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["samples"] == 2 and report["costs"]["today"] > 0
@@ -6,6 +6,7 @@ import pytest
 from datetime import datetime, date
 
 from custom_components.solarseed_tou.schedule import (
+    ScheduleValidationError,
     TOUSchedule,
     RateTier,
     Season,
@@ -136,6 +137,8 @@ class TestComputeEffectiveRate:
         """tax_rate_pct = 0 should produce a 1.0 multiplier."""
         config = _make_config(
             tiers={"flat": {"name": "Flat", "rate": 0.10}},
+            seasons={},
+            holidays={"rate_tier": "flat"},
             regulatory_per_kwh=0.01,
             tax_rate_pct=0.0,
         )
@@ -146,6 +149,8 @@ class TestComputeEffectiveRate:
         """Edge case: very high tax rate (like 10%)."""
         config = _make_config(
             tiers={"flat": {"name": "Flat", "rate": 0.10}},
+            seasons={},
+            holidays={"rate_tier": "flat"},
             tax_rate_pct=10.0,
         )
         sched = TOUSchedule.from_dict(config)
@@ -384,6 +389,7 @@ class TestSingleTierFlatRate:
                              ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]},
                 }
             },
+            holidays={"rate_tier": "flat"},
             regulatory_per_kwh=0.02,
             tax_rate_pct=5.0,
         )
@@ -392,3 +398,118 @@ class TestSingleTierFlatRate:
         assert sched.compute_effective_rate("flat") == pytest.approx(0.126)
         # Any datetime should resolve to 'flat'
         assert sched.get_tier_id(make_dt(2025, 3, 15, 14)) == "flat"
+
+
+# ── Validation ─────────────────────────────────────────────────
+
+
+def _grid(row):
+    return {d: list(row) for d in ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]}
+
+
+class TestValidation:
+    """Contract violations are rejected; recoverable gaps are normalized."""
+
+    def test_valid_config_has_no_diagnostics(self, base_schedule):
+        assert base_schedule.diagnostics == []
+
+    def test_errors_are_all_reported(self):
+        config = _make_config(
+            seasons={
+                "a": {"name": "A", "months": [1, 2, 13], "grid": _grid(["bogus"] * 24)},
+                "b": {"name": "B", "months": list(range(2, 13)), "grid": _grid(["off-peak"] * 24)},
+            },
+            holidays={"rate_tier": "nope", "custom": [{"rule": "fixed", "month": 2, "day": 30}]},
+        )
+        with pytest.raises(ScheduleValidationError) as exc:
+            TOUSchedule.from_dict(config)
+        paths = {d.path for d in exc.value.diagnostics if d.severity == "error"}
+        assert {"seasons.a.months", "seasons.a.grid", "holidays.rate_tier"} <= paths
+        assert any(p.startswith("holidays.custom") for p in paths)
+        assert "month 2" in str(exc.value) or "overlap" in str(exc.value)
+
+    def test_extended_holiday_rules(self):
+        custom = [
+            {"rule": "offset", "base": "thanksgiving", "days": 1},
+            {"rule": "offset", "base": {"rule": "easter"}, "days": 1},
+            {"rule": "easter", "days": -2, "observe": "none"},
+            {"rule": "fixed", "month": 7, "day": 4, "observe": "sat_to_fri"},
+        ]
+        sched = TOUSchedule.from_dict(_make_config(
+            holidays={"rate_tier": "off-peak", "custom": custom}
+        ))
+        assert sched.is_holiday(date(2025, 11, 28))
+        assert sched.is_holiday(date(2025, 4, 18))
+        assert sched.is_holiday(date(2025, 4, 21))
+
+    @pytest.mark.parametrize("rule", [
+        {"rule": "offset", "base": "bogus", "days": 1},
+        {"rule": "offset", "base": "thanksgiving"},
+        {"rule": "offset", "base": {"rule": "offset", "base": "labor", "days": 1}, "days": 1},
+        {"rule": "easter", "days": 400},
+        {"rule": "fixed", "month": 1, "day": 1, "observe": "sometimes"},
+        {"rule": "fixed", "month": 2, "day": 29},
+        {"rule": "offset", "base": {"rule": "fixed", "month": 2, "day": 29}, "days": 1},
+    ])
+    def test_bad_extended_holiday_rules(self, rule):
+        config = _make_config(holidays={"rate_tier": "off-peak", "custom": [rule]})
+        with pytest.raises(ScheduleValidationError, match="holidays.custom.0"):
+            TOUSchedule.from_dict(config)
+
+    def test_feb_29_is_rejected(self):
+        # Would raise at lookup time in three years out of four
+        config = _make_config(holidays={
+            "rate_tier": "off-peak", "custom": [{"rule": "fixed", "month": 2, "day": 29}],
+        })
+        with pytest.raises(ScheduleValidationError, match="does not exist every year"):
+            TOUSchedule.from_dict(config)
+
+    def test_bad_read_day_is_a_validation_error(self):
+        config = _make_config()
+        config["billing_cycle"] = {"read_day": 40}
+        with pytest.raises(ScheduleValidationError, match="read_day"):
+            TOUSchedule.from_dict(config)
+
+    def test_short_row_padded_with_warning(self):
+        config = _make_config(seasons={
+            "all": {"name": "All", "months": list(range(1, 13)),
+                    "grid": _grid(["off-peak"] * 20 + ["on-peak"])},
+        })
+        sched = TOUSchedule.from_dict(config)
+        assert all(len(row) == 24 for row in sched.seasons[0].grid.values())
+        assert sched.get_tier_id(make_dt(2025, 3, 4, 20)) == "on-peak"
+        # Padded hours take the first tier, as the old runtime fallback did
+        assert sched.get_tier_id(make_dt(2025, 3, 4, 23)) == "off-peak"
+        assert {d.severity for d in sched.diagnostics} == {"warning"}
+        assert len(sched.diagnostics) == 7
+
+    def test_uncovered_month_uses_first_season_with_warning(self):
+        config = _make_config(seasons={
+            "summer": {"name": "Summer", "months": [6, 7, 8], "grid": _grid(["on-peak"] * 24)},
+            "winter": {"name": "Winter", "months": [12, 1, 2], "grid": _grid(["off-peak"] * 24)},
+        })
+        sched = TOUSchedule.from_dict(config)
+        assert sched.get_season(4).name == "Summer"
+        assert any("in no season" in d.message for d in sched.diagnostics)
+
+    def test_unknown_standard_holiday_dropped_with_warning(self):
+        config = _make_config(
+            holidays={"rate_tier": "off-peak", "standard": ["new_years", "made_up"]}
+        )
+        sched = TOUSchedule.from_dict(config)
+        assert sched.holidays.standard == ["new_years"]
+        assert [d.severity for d in sched.diagnostics] == ["warning"]
+
+    def test_patched_keeps_untouched_warnings(self):
+        config = _make_config(holidays={"rate_tier": "off-peak", "standard": ["made_up"]})
+        sched = TOUSchedule.from_dict(config)
+        config = dict(config, tax_rate_pct=5.0)
+        patched = sched.patched(config, {"tax_rate_pct"})
+        assert patched.diagnostics == sched.diagnostics
+
+    def test_patched_rejects_dangling_tier(self, base_config):
+        sched = TOUSchedule.from_dict(base_config)
+        tiers = dict(base_config["tiers"])
+        del tiers["on-peak"]
+        with pytest.raises(ScheduleValidationError, match="on-peak"):
+            sched.patched(dict(base_config, tiers=tiers), {"tiers"})
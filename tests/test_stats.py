@@ -0,0 +1,104 @@
+"""Tests for stats.py — counters, histograms and their sensors."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from benchmarks.replay import StateSample, replay
+from custom_components.solarseed_tou.sensor import (
+    TOUIngestLatencySensor,
+    TOUSourceSamplesSensor,
+)
+from custom_components.solarseed_tou.stats import (
+    LATENCY_SAMPLE_EVERY,
+    EntityStats,
+    EntryStats,
+    LatencyHistogram,
+)
+from tests.conftest import make_dt
+
+
+class TestLatencyHistogram:
+    """Fixed buckets in microseconds."""
+
+    def test_buckets_and_percentiles(self):
+        hist = LatencyHistogram()
+        for ns in [500] * 90 + [3_000] * 9 + [50_000_000]:
+            hist.record(ns)
+        assert hist.count == 100
+        assert hist.percentile(50) == 1.0
+        assert hist.percentile(95) == 5.0
+        assert hist.percentile(100) == 50_000.0  # overflow reports the maximum
+        data = hist.as_dict()
+        assert data["counts"][0] == 90 and data["counts"][-1] == 1
+        assert len(data["counts"]) == len(data["buckets_us"])
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(95) is None
+        assert LatencyHistogram().as_dict()["mean_us"] is None
+
+
+class TestEntryStats:
+    """Per-entry aggregation."""
+
+    def test_source_is_largest_count_and_writes_sum(self):
+        stats = EntryStats()
+        a, b = EntityStats(), EntityStats()
+        a.samples, a.writes, b.samples, b.writes, b.gap = 10, 10, 8, 8, 1
+        stats.add("a", a)
+        stats.add("b", b)
+        assert stats.source() == {
+            "samples": 10, "unavailable": 0, "unparseable": 0,
+            "negative_delta": 0, "gap": 1, "writes": 18,
+        }
+
+
+class TestSensorCounters:
+    """Accumulators count what they drop."""
+
+    def test_power_drops(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)
+        states = ["1000", "unavailable", "1000", "n/a", "1000"]
+        samples = [StateSample(start + timedelta(minutes=i), s) for i, s in enumerate(states)]
+        samples.append(StateSample(start + timedelta(hours=3), "1000"))
+        counts = replay(base_schedule, samples, ["today"]).stats.entities["today"]
+        assert (counts.samples, counts.unavailable, counts.unparseable, counts.gap) == (6, 1, 1, 1)
+        assert counts.writes == 4
+
+    def test_meter_reset(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)
+        samples = [StateSample(start + timedelta(minutes=i), v, "kWh")
+                   for i, v in enumerate(["10", "11", "0.5", "1"])]
+        counts = replay(base_schedule, samples, ["today"]).stats.entities["today"]
+        assert counts.negative_delta == 1
+
+    def test_latency_is_sampled(self, base_schedule):
+        start = make_dt(2025, 6, 3, 2)
+        samples = [StateSample(start + timedelta(seconds=i), "1000")
+                   for i in range(4 * LATENCY_SAMPLE_EVERY)]
+        stats = replay(base_schedule, samples, ["today"]).stats
+        assert stats.ingest.count == stats.publish.count == 4
+        assert stats.price.count == 4
+
+
+class TestDiagnosticSensors:
+    """Disabled-by-default diagnostic sensors read the entry stats."""
+
+    def test_update(self, base_schedule):
+        entry = type("Entry", (), {"entry_id": "x"})()
+        stats = EntryStats()
+        counts = EntityStats()
+        counts.samples, counts.unavailable = 5, 2
+        stats.add("x_cost_today", counts)
+        stats.ingest.record(4_000)
+
+        samples = TOUSourceSamplesSensor(entry, base_schedule)
+        latency = TOUIngestLatencySensor(entry, base_schedule)
+        for sensor in (samples, latency):
+            sensor._entry_stats = stats
+            sensor.update()
+        assert samples._attr_native_value == 5
+        assert samples._attr_extra_state_attributes["unavailable"] == 2
+        assert latency._attr_native_value == pytest.approx(5.0)
+        assert not samples._attr_entity_registry_enabled_default
@@ -1,10 +1,28 @@
-"""Tests for storage.py — migration and default config generation."""
+"""Tests for storage.py — migration, default config generation and write skipping."""
 from __future__ import annotations
 
+import asyncio
+import copy
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
-from custom_components.solarseed_tou.storage import _default_config, _migrate_v1_to_v2
-from custom_components.solarseed_tou.const import STORAGE_VERSION
+from custom_components.solarseed_tou import storage as storage_module
+from custom_components.solarseed_tou.storage import (
+    TOUStorage,
+    _config_digest,
+    _default_config,
+    _migrate_v1_to_v2,
+    async_migrate_shared_store,
+    storage_key,
+)
+from custom_components.solarseed_tou.const import (
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from tests.conftest import FakeStore
 
 
 class TestDefaultConfig:
@@ -90,3 +108,164 @@ class TestMigrateV1ToV2:
         v2a = _migrate_v1_to_v2(v1.copy())
         v2b = _migrate_v1_to_v2(v2a.copy())
         assert v2a == v2b
+
+
+def _storage(data=None) -> tuple[TOUStorage, FakeStore]:
+    storage = TOUStorage(None)
+    store = FakeStore(data)
+    storage._store = store
+    return storage, store
+
+
+class TestConfigDigest:
+    """Canonical hashing of configs."""
+
+    def test_key_order_does_not_matter(self):
+        assert _config_digest({"a": 1, "b": {"x": 1, "y": 2}}) == _config_digest(
+            {"b": {"y": 2, "x": 1}, "a": 1}
+        )
+
+    def test_value_change_changes_digest(self):
+        assert _config_digest({"a": 1}) != _config_digest({"a": 2})
+
+
+class TestDiffAwareWrites:
+    """TOUStorage only writes real changes, through the delayed save."""
+
+    def test_unchanged_save_is_skipped(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        config = asyncio.run(storage.async_load())
+        asyncio.run(storage.async_save(copy.deepcopy(config)))
+        assert store.delayed_saves == 0
+
+    def test_real_change_uses_delayed_save(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        config = asyncio.run(storage.async_load())
+        config["energy_sensor"] = "sensor.other"
+        asyncio.run(storage.async_save(config))
+        assert store.delayed_saves == 1
+        assert store.last_delay == STORAGE_SAVE_DELAY
+        store.fire_delayed()
+        assert store.data["energy_sensor"] == "sensor.other"
+
+    def test_repeated_identical_saves_write_once(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        config = asyncio.run(storage.async_load())
+        config["tax_rate_pct"] = 5.0
+        for _ in range(3):
+            asyncio.run(storage.async_save(copy.deepcopy(config)))
+        assert store.delayed_saves == 1
+
+    def test_first_save_without_stored_data_writes(self):
+        storage, store = _storage(None)
+        config = asyncio.run(storage.async_load())
+        asyncio.run(storage.async_save(config))
+        assert store.delayed_saves == 1
+
+    def test_update_config_noop_when_values_match(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        asyncio.run(storage.async_load())
+        asyncio.run(storage.async_update_config({"energy_sensor": "sensor.energy"}))
+        assert store.delayed_saves == 0
+
+    def test_update_config_writes_changed_keys(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        asyncio.run(storage.async_load())
+        config = asyncio.run(storage.async_update_config(
+            {"energy_sensor": "sensor.energy", "fixed_monthly": 12.5}
+        ))
+        assert config["fixed_monthly"] == 12.5
+        assert store.delayed_saves == 1
+
+    def test_migration_is_saved(self):
+        v1 = _default_config("sensor.energy")
+        v1.pop("_schema_version")
+        v1.pop("regulatory_per_kwh")
+        storage, store = _storage(v1)
+        asyncio.run(storage.async_load())
+        assert store.delayed_saves == 1
+        store.fire_delayed()
+        assert store.data["_schema_version"] == STORAGE_VERSION
+
+
+class TestPendingDelayedSave:
+    """A delayed save never outlives its entry."""
+
+    def _entry(self, monkeypatch, store):
+        import custom_components.solarseed_tou as integration
+
+        storage = TOUStorage(None, "e1")
+        storage._store = store
+        checkpoint = MagicMock(async_save=AsyncMock())
+        hass = MagicMock()
+        hass.data = {DOMAIN: {"e1": {"storage": storage, "checkpoint": checkpoint}}}
+        hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+        for name in ("CompiledCache", "AccumulatorCheckpoint"):
+            monkeypatch.setattr(
+                integration, name, MagicMock(return_value=MagicMock(async_remove=AsyncMock()))
+            )
+        return integration, hass, storage, MagicMock(entry_id="e1")
+
+    def test_reload_inside_the_delay(self, monkeypatch):
+        store = FakeStore(_default_config("sensor.energy"))
+        integration, hass, storage, entry = self._entry(monkeypatch, store)
+        config = asyncio.run(storage.async_load())
+        asyncio.run(storage.async_save({**config, "energy_sensor": "sensor.other"}))
+        assert store.pending is not None
+
+        assert asyncio.run(integration.async_unload_entry(hass, entry))
+        assert store.pending is None  # flushed, not left to land later
+        reloaded = TOUStorage(None, "e1")
+        reloaded._store = store
+        assert asyncio.run(reloaded.async_load())["energy_sensor"] == "sensor.other"
+
+    def test_remove_inside_the_delay(self, monkeypatch):
+        store = FakeStore(_default_config("sensor.energy"))
+        integration, hass, storage, entry = self._entry(monkeypatch, store)
+        config = asyncio.run(storage.async_load())
+        asyncio.run(storage.async_save({**config, "energy_sensor": "sensor.other"}))
+
+        asyncio.run(integration.async_remove_entry(hass, entry))
+        store.fire_delayed()
+        assert store.data is None  # the pending write did not recreate the store
+
+    def test_flush_without_pending_save_writes_nothing(self):
+        storage, store = _storage(_default_config("sensor.energy"))
+        asyncio.run(storage.async_load())
+        asyncio.run(storage.async_flush())
+        assert store.saves == 0
+
+
+class TestPerEntryStorage:
+    """Entry-scoped store keys and migration from the shared key."""
+
+    def test_storage_key_per_entry(self):
+        assert storage_key("abc") == f"{STORAGE_KEY}.abc"
+        assert storage_key(None) == STORAGE_KEY
+
+    def test_migrate_copies_shared_config(self, monkeypatch):
+        stores: dict[str, FakeStore] = {STORAGE_KEY: FakeStore({"energy_sensor": "sensor.a"})}
+
+        def fake_store(hass, version, key):
+            return stores.setdefault(key, FakeStore())
+
+        monkeypatch.setattr(storage_module, "Store", fake_store)
+        assert asyncio.run(async_migrate_shared_store(None, "e1"))
+        assert asyncio.run(async_migrate_shared_store(None, "e2"))
+        assert stores[storage_key("e1")].data == {"energy_sensor": "sensor.a"}
+        assert stores[storage_key("e2")].data == {"energy_sensor": "sensor.a"}
+
+    def test_migrate_keeps_existing_entry_config(self, monkeypatch):
+        stores = {
+            STORAGE_KEY: FakeStore({"energy_sensor": "sensor.a"}),
+            storage_key("e1"): FakeStore({"energy_sensor": "sensor.b"}),
+        }
+        monkeypatch.setattr(
+            storage_module, "Store", lambda hass, version, key: stores.setdefault(key, FakeStore())
+        )
+        asyncio.run(async_migrate_shared_store(None, "e1"))
+        assert stores[storage_key("e1")].data == {"energy_sensor": "sensor.b"}
+
+    def test_migrate_without_shared_config(self, monkeypatch):
+        monkeypatch.setattr(storage_module, "Store", lambda hass, version, key: FakeStore())
+        assert not asyncio.run(async_migrate_shared_store(None, "e1"))
@@ -0,0 +1,253 @@
+"""Tests for websocket.py — command registration and handlers."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.solarseed_tou import websocket
+from custom_components.solarseed_tou.const import DOMAIN
+
+
+def _register(monkeypatch) -> tuple[MagicMock, dict]:
+    commands = {}
+    monkeypatch.setattr(
+        websocket.websocket_api, "async_register_command",
+        lambda hass, fn: commands.setdefault(fn.__name__, fn),
+        raising=False,
+    )
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    websocket.async_register_websocket(hass)
+    return hass, commands
+
+
+class TestRegistration:
+    """Commands are registered once."""
+
+    def test_all_commands_registered(self, monkeypatch):
+        hass, commands = _register(monkeypatch)
+        assert set(commands) == {
+            "ws_get_config", "ws_set_config", "ws_patch_config",
+            "ws_compare_plans", "ws_find_cheapest_window", "ws_get_rate_table",
+            "ws_quote", "ws_stats", "ws_subscribe",
+        }
+        assert hass.data[DOMAIN]["_ws_registered"]
+
+
+class TestSubscribe:
+    """solarseed_tou/subscribe creates the entry's hub lazily."""
+
+    def test_subscribe_and_unsubscribe(self, monkeypatch, base_schedule):
+        hass, commands = _register(monkeypatch)
+        entry_data = {
+            "storage": object(),
+            "schedule": base_schedule,
+            "entry": MagicMock(entry_id="abc"),
+        }
+        hass.data[DOMAIN].update({"abc": entry_data, "_entry_ids": {"abc"}})
+        connection = MagicMock()
+        connection.subscriptions = {}
+
+        async def run():
+            commands["ws_subscribe"](hass, connection, {"id": 5, "type": "solarseed_tou/subscribe"})
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert entry_data["hub"].subscriber_count == 1
+            connection.subscriptions[5]()
+
+        asyncio.run(run())
+        connection.send_result.assert_called_once_with(5)
+        assert connection.send_message.called
+        assert entry_data["hub"].subscriber_count == 0
+
+
+class TestGetRateTable:
+    """solarseed_tou/get_rate_table with ETag."""
+
+    def test_etag_round_trip(self, monkeypatch, base_schedule):
+        from custom_components.solarseed_tou.history import RateHistory
+
+        hass, commands = _register(monkeypatch)
+
+        async def _executor(fn, *args):
+            return fn(*args)
+
+        hass.async_add_executor_job = _executor
+        entry_data = {
+            "storage": MagicMock(digest="ab" * 32),
+            "history": RateHistory.single(base_schedule),
+            "schedule": base_schedule,
+        }
+        hass.data[DOMAIN].update({"abc": entry_data, "_entry_ids": {"abc"}})
+        connection = MagicMock()
+
+        async def run():
+            handler = commands["ws_get_rate_table"]
+            await handler(hass, connection, {"id": 1, "year": 2025})
+            first = connection.send_result.call_args[0][1]
+            await handler(hass, connection, {"id": 2, "year": 2025, "etag": first["etag"]})
+            second = connection.send_result.call_args[0][1]
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first["unchanged"] is False and first["year"] == 2025
+        assert sum(length for _, length, _ in first["spans"]) == 365 * 24
+        assert second == {"etag": first["etag"], "unchanged": True}
+
+
+class TestQuote:
+    """solarseed_tou/quote."""
+
+    def _call(self, monkeypatch, base_schedule, msg):
+        from custom_components.solarseed_tou.history import RateHistory
+
+        hass, commands = _register(monkeypatch)
+
+        async def _executor(fn, *args):
+            self.in_executor = True
+            try:
+                return fn(*args)
+            finally:
+                self.in_executor = False
+
+        hass.async_add_executor_job = _executor
+        entry_data = {
+            "storage": object(),
+            "history": RateHistory.single(base_schedule),
+            "schedule": base_schedule,
+        }
+        hass.data[DOMAIN].update({"abc": entry_data, "_entry_ids": {"abc"}})
+        connection = MagicMock()
+        asyncio.run(commands["ws_quote"](hass, connection, {"id": 1, **msg}))
+        return connection
+
+    def test_packed(self, monkeypatch, base_schedule):
+        connection = self._call(monkeypatch, base_schedule, {
+            "packed": {"start": "2025-06-02T12:00:00", "step": 3600, "kwh": [1.0, 2.0]},
+        })
+        result = connection.send_result.call_args[0][1]
+        assert result["intervals"] == 2
+        assert result["total_cost"] == pytest.approx(sum(result["costs"]), abs=1e-6)
+
+    @pytest.mark.parametrize("msg", [
+        {"intervals": [["2026-01-01T00:00:00+00:00", "2026-01-01T01:00:00", 1.0]]},
+        {"packed": {"start": "2026-01-01T00:00:00", "step": 3600, "kwh": [None]}},
+    ])
+    def test_bad_values_are_invalid_format(self, monkeypatch, base_schedule, msg):
+        connection = self._call(monkeypatch, base_schedule, msg)
+        assert connection.send_error.call_args[0][1] == "invalid_format"
+
+    def test_rows_parsed_in_executor(self, monkeypatch, base_schedule):
+        parsed_in_executor = []
+        parse = websocket.parse_intervals
+
+        def _parse(*args):
+            parsed_in_executor.append(self.in_executor)
+            return parse(*args)
+
+        monkeypatch.setattr(websocket, "parse_intervals", _parse)
+        connection = self._call(monkeypatch, base_schedule, {
+            "intervals": [["2026-01-01T00:00:00", "2026-01-01T01:00:00", 1.0]],
+        })
+        assert connection.send_result.called
+        assert parsed_in_executor == [True]
+
+    def test_needs_exactly_one_batch(self, monkeypatch, base_schedule):
+        connection = self._call(monkeypatch, base_schedule, {})
+        assert connection.send_error.call_args[0][1] == "invalid_format"
+
+
+class TestPatchConfig:
+    """solarseed_tou/patch_config."""
+
+    def _call(self, monkeypatch, base_schedule, base_config, ops):
+        from unittest.mock import AsyncMock
+
+        hass, commands = _register(monkeypatch)
+        # A dated rate history is re-parsed in full, outside patch_schedule
+        config = {**base_config, "rate_history": []}
+        storage = MagicMock(async_get_config=AsyncMock(return_value=config))
+        storage.async_save = AsyncMock()
+        hass.data[DOMAIN].update({
+            "abc": {"storage": storage, "schedule": base_schedule},
+            "_entry_ids": {"abc"},
+        })
+        connection = MagicMock()
+        asyncio.run(commands["ws_patch_config"](hass, connection, {"id": 1, "ops": ops}))
+        return connection, storage
+
+    @pytest.mark.parametrize("ops", [
+        [{"op": "replace", "path": "/tiers/on-peak", "value": ["not", "a", "tier"]}],
+        [{"op": "replace", "path": "/seasons", "value": ["summer"]}],
+    ])
+    def test_type_breaking_patch_is_invalid_config(
+        self, monkeypatch, base_schedule, base_config, ops
+    ):
+        connection, storage = self._call(monkeypatch, base_schedule, base_config, ops)
+        assert connection.send_error.call_args[0][1] == "invalid_config"
+        storage.async_save.assert_not_called()
+
+
+class TestComparePlans:
+    """solarseed_tou/compare_plans."""
+
+    def _call(self, monkeypatch, msg):
+        hass, commands = _register(monkeypatch)
+        jobs = []
+
+        async def _executor(fn, *args):
+            jobs.append(fn)
+            return fn(*args)
+
+        hass.async_add_executor_job = _executor
+        connection = MagicMock()
+        asyncio.run(commands["ws_compare_plans"](hass, connection, {"id": 1, **msg}))
+        return connection, jobs
+
+    def test_parses_and_prices_in_executor(self, monkeypatch, base_config):
+        connection, jobs = self._call(monkeypatch, {
+            "plans": {"tou": base_config},
+            "intervals": [["2025-06-02T12:00:00", 1.0], ["2025-06-02T13:00:00", 2.0]],
+        })
+        result = connection.send_result.call_args[0][1]
+        assert result["intervals"] == 2
+        assert len(jobs) == 2  # parse + decompose, then pricing
+
+    def test_malformed_rows(self, monkeypatch, base_config):
+        connection, _ = self._call(monkeypatch, {
+            "plans": {"tou": base_config}, "intervals": [["not a time", 1.0]],
+        })
+        assert connection.send_error.call_args[0][1] == "invalid_format"
+
+    @pytest.mark.parametrize("plans, rows", [
+        (websocket.MAX_COMPARE_PLANS + 1, 1),
+        (1, websocket.MAX_COMPARE_INTERVALS + 1),
+    ])
+    def test_caps(self, monkeypatch, base_config, plans, rows):
+        connection, jobs = self._call(monkeypatch, {
+            "plans": {f"p{i}": base_config for i in range(plans)},
+            "intervals": [["2025-06-02T12:00:00", 1.0]] * rows,
+        })
+        assert connection.send_error.call_args[0][1] == "invalid_format"
+        assert "at most" in connection.send_error.call_args[0][2]
+        assert not jobs
+
+
+class TestStats:
+    """solarseed_tou/stats."""
+
+    def test_stats(self, monkeypatch):
+        from custom_components.solarseed_tou.stats import EntryStats
+
+        hass, commands = _register(monkeypatch)
+        hass.data[DOMAIN].update({
+            "abc": {"storage": object(), "stats": EntryStats()},
+            "_entry_ids": {"abc"},
+        })
+        connection = MagicMock()
+        commands["ws_stats"](hass, connection, {"id": 3})
+        result = connection.send_result.call_args[0][1]
+        assert result["subscribers"] == 0
+        assert set(result["latency"]) == {"ingest", "price", "publish"}